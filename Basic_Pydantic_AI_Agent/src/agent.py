@@ -13,7 +13,7 @@ from dataclasses import dataclass
 from dotenv import load_dotenv
 # from openai import AsyncOpenAI  # Unused import
 from httpx import AsyncClient
-from typing import Optional
+from typing import Any, Dict, MutableMapping, Optional
 import sys
 import os
 from utils.manifests import get_all_functions
@@ -35,10 +35,14 @@ class AgentDeps:
         http_client: The HTTP client for making requests.
         brave_api_key: The Brave Search API key.
         searxng_base_url: The SearXNG base URL.
+        user_information: Profile of the user the run is for (name, ID Number, ...).
+        ticket_state: Mapping the ticket tools write generated-ticket details into.
     """
     http_client: AsyncClient
     brave_api_key: Optional[str] = None
     searxng_base_url: Optional[str] = None
+    user_information: Optional[Dict[str, Any]] = None
+    ticket_state: Optional[MutableMapping[str, Any]] = None
 
 
 # ========== Pydantic AI Agent ==========
@@ -0,0 +1,384 @@
+"""
+Bus 54 ticketing tools for the user-friendly response agent.
+
+Per-user state (user information, generated ticket) is read from and written to
+ctx.deps, so a single toolset is shared by every session.
+
+Every tool is a coroutine so the agent can run parallel tool calls concurrently.
+Blocking file and database work is offloaded with asyncio.to_thread; in-memory
+lookups run directly on the event loop.
+"""
+
+import asyncio
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic_ai import RunContext
+from pydantic_ai.toolsets import FunctionToolset
+
+from Basic_Pydantic_AI_Agent.src.agent import AgentDeps
+from utils.booking_journal import get_booking_journal
+from utils.schedule_store import get_schedule_store
+from utils.seat_inventory import get_seat_inventory
+from utils.tool_results import get_tool_result_store
+
+
+def _customer_id(ctx: RunContext[AgentDeps]):
+    """Return the ID Number of the user the run is for."""
+    return (ctx.deps.user_information or {}).get("ID Number")
+
+
+def _write_text(path: str, content: str) -> None:
+    """Write a text file (run in a worker thread)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+async def get_entire_bus_schedule():
+    """
+    Retrieves the complete bus schedule data from the Nigeria bus schedule CSV file.
+
+    Only use this when the user explicitly asks for the whole timetable; prefer
+    search_bus_schedule for any question about specific routes, times or operators.
+
+    This function reads all bus schedule entries from the CSV file containing Nigerian bus routes,
+    departure times, destinations, arrival times, and bus company information. It's designed
+    to provide comprehensive schedule data for LLM agents to analyze and present to users.
+
+    Returns:
+        list: A list of dictionaries, where each dictionary represents a bus schedule entry
+              with keys: 'departure_time', 'departure_location', 'destination', 
+              'arrival_time', 'bus_name'. Returns an empty list if file is not found
+              or if any error occurs during reading.
+        dict: For a long schedule, only a 'preview' of the first rows plus a 'handle';
+              use query_tool_result with the handle to read the rest.
+
+    Example return format:
+        [
+            {
+                'departure_time': '08:00',
+                'departure_location': 'Lagos',
+                'destination': 'Abuja',
+                'arrival_time': '14:30',
+                'bus_name': 'God is Good Motors'
+            },
+            ...
+        ]
+    """
+    try:
+        # Served from the process-wide store; the CSV is only re-parsed when it changes
+        rows = await asyncio.to_thread(get_schedule_store().all_rows)
+        return get_tool_result_store().wrap("get_entire_bus_schedule", rows)
+    except Exception as e:
+        # Return empty list for any errors (permissions, encoding, etc.)
+        return []
+
+
+async def search_bus_schedule(
+    origin: str = None,
+    destination: str = None,
+    earliest_departure: str = None,
+    latest_departure: str = None,
+    bus_name: str = None,
+    min_seats: int = None,
+    limit: int = 20,
+    offset: int = 0
+):
+    """
+    Searches the bus schedule and returns only the departures that match the filters.
+
+    Use this tool to answer schedule questions instead of get_entire_bus_schedule.
+    All filters are optional and combined with AND; matching is case-insensitive.
+
+    Args:
+        origin (str, optional): Departure location (e.g., "Lagos")
+        destination (str, optional): Destination location (e.g., "Abuja")
+        earliest_departure (str, optional): Earliest departure time, inclusive (e.g., "06:00")
+        latest_departure (str, optional): Latest departure time, inclusive (e.g., "12:00")
+        bus_name (str, optional): The name of the bus service (e.g., "God is Good Motors")
+        min_seats (int, optional): Only return departures with at least this many available seats
+        limit (int, optional): Maximum number of departures to return (max 200). Defaults to 20.
+        offset (int, optional): Number of matching departures to skip, for paging. Defaults to 0.
+
+    Returns:
+        dict: 'total' number of matching departures and 'items', the requested page of
+              departures ordered by departure time
+    """
+    try:
+        # The store may re-read the CSV if it changed on disk
+        return await asyncio.to_thread(
+            get_schedule_store().search,
+            origin=origin,
+            destination=destination,
+            earliest_departure=earliest_departure,
+            latest_departure=latest_departure,
+            bus_name=bus_name,
+            min_seats=min_seats,
+            limit=limit,
+            offset=offset,
+        )
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+
+
+async def download_pdf(ctx: RunContext[AgentDeps], departure_time: str, departure_location: str, arrival_time: str, destination: str, bus_name: str):
+    """
+    Generates an HTML ticket document with the provided information.
+
+    Args:
+        departure_time (str): The time of departure (e.g., "08:00")
+        departure_location (str): The location of departure (e.g., "Lagos")
+        arrival_time (str): The time of arrival (e.g., "14:30")
+        destination (str): The destination location (e.g., "Abuja")
+        bus_name (str): The name of the bus service (e.g., "God is Good Motors")
+    """
+    import base64
+    import uuid as _uuid
+    from datetime import datetime as _dt
+    brand_hex = "#0066cc"
+
+    user_information = ctx.deps.user_information
+    customer_name = None
+    try:
+        if isinstance(user_information, dict):
+            first = user_information.get("name") or ""
+            last = user_information.get("surname") or ""
+            full_name = f"{first} {last}".strip()
+            customer_name = full_name if full_name else None
+    except Exception:
+        customer_name = None
+
+    issued_at = _dt.now().strftime("%Y-%m-%d %H:%M")
+    ticket_id = str(_uuid.uuid4())[:8].upper()
+
+    html_content = f"""
+    <!doctype html>
+    <html lang=\"en\">
+      <head>
+        <meta charset=\"utf-8\"/>
+        <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\"/>
+        <title>Bus 54 Ticket</title>
+        <style>
+          body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, 'Noto Sans', 'Liberation Sans', sans-serif; background:#f5f8fa; margin:0; padding:24px; }}
+          .header {{ background:{brand_hex}; color:#fff; padding:20px 24px; display:flex; align-items:center; }}
+          .header h1 {{ margin:0 0 0 12px; font-size:22px; font-weight:700; }}
+          .ticket {{ background:#fff; border:1px solid {brand_hex}; border-radius:10px; box-shadow:0 1px 3px rgba(0,102,204,0.2); margin-top:16px; padding:20px; }}
+          .grid {{ display:grid; grid-template-columns:1fr 1fr; gap:18px; margin-top:10px; }}
+          .label {{ color:#6b7280; font-size:12px; margin-bottom:4px; }}
+          .value {{ color:#111827; font-weight:700; font-size:16px; }}
+          .foot {{ color:#6b7280; font-size:12px; margin-top:18px; }}
+          .brand {{ color:{brand_hex}; font-weight:700; }}
+        </style>
+      </head>
+      <body>
+        <div class=\"header\">
+          <div style=\"font-weight:800; letter-spacing:.5px;\">BUS 54</div>
+          <h1>Ticket</h1>
+        </div>
+        <div class=\"ticket\">
+          <div class=\"grid\">
+            <div>
+              <div class=\"label\">Passenger</div>
+              <div class=\"value\">{customer_name or 'N/A'}</div>
+            </div>
+            <div>
+              <div class=\"label\">Bus Company</div>
+              <div class=\"value\">{bus_name}</div>
+            </div>
+            <div>
+              <div class=\"label\">From</div>
+              <div class=\"value\">{departure_location}</div>
+            </div>
+            <div>
+              <div class=\"label\">To</div>
+              <div class=\"value\">{destination}</div>
+            </div>
+            <div>
+              <div class=\"label\">Departure</div>
+              <div class=\"value\">{departure_time}</div>
+            </div>
+            <div>
+              <div class=\"label\">Arrival</div>
+              <div class=\"value\">{arrival_time}</div>
+            </div>
+            <div>
+              <div class=\"label\">Issued At</div>
+              <div class=\"value\">{issued_at}</div>
+            </div>
+            <div>
+              <div class=\"label\">Ticket ID</div>
+              <div class=\"value\">{ticket_id}</div>
+            </div>
+          </div>
+          <div class=\"foot\">Please arrive 30 minutes before departure. Bring a valid ID. <span class=\"brand\">Bus 54</span></div>
+        </div>
+      </body>
+    </html>
+    """
+
+    # Save HTML content to file system
+    await asyncio.to_thread(_write_text, "ticket.html", html_content)
+
+    ticket_state = ctx.deps.ticket_state if ctx.deps.ticket_state is not None else {}
+    ticket_state["ticket_html"] = html_content
+    b64_html = base64.b64encode(html_content.encode("utf-8")).decode("utf-8")
+    data_url = f"data:text/html;base64,{b64_html}"
+
+    safe_time = (departure_time or "").replace(":", "-")
+    html_filename = f"bus54_ticket_{ticket_id}_{destination}_{safe_time}.html"
+
+    ticket_state["ticket_ready"] = True
+    ticket_state["ticket_html_data_url"] = data_url
+    ticket_state["ticket_html_filename"] = html_filename
+
+    return f"Your ticket has been generated for {departure_location} → {destination} at {departure_time}. The generated ticket can be downloaded above via the 'Generate Ticket' button."
+
+
+async def book_bus_ticket(
+    ctx: RunContext[AgentDeps],
+    departure_time: str, 
+    departure_location: str, 
+    arrival_time: str, 
+    destination: str, 
+    bus_name: str,
+    available_seats: int = 1
+):
+    """
+    Books a bus ticket with the provided information and returns a confirmation message.
+    Reserves one seat in the seat inventory; the booking fails if the bus is sold out.
+
+    Args:
+        departure_time (str): The time of departure (e.g., "08:00")
+        departure_location (str): The location of departure (e.g., "Lagos")
+        arrival_time (str): The time of arrival (e.g., "14:30")
+        destination (str): The destination location (e.g., "Abuja")
+        bus_name (str): The name of the bus service (e.g., "God is Good Motors")
+        available_seats (int, optional): Number of available seats. Defaults to 1.
+
+    Returns:
+        str: A confirmation message with the booking details
+    """
+    # Atomically take one seat; concurrent sessions cannot oversell
+    reservation = await asyncio.to_thread(
+        get_seat_inventory().reserve_seats, departure_time, departure_location, destination, bus_name
+    )
+    if reservation["status"] == "not_found":
+        return f"Booking failed: no {bus_name} departure from {departure_location} to {destination} at {departure_time} was found in the schedule."
+    if reservation["status"] != "success":
+        return f"Booking failed: the {bus_name} departure from {departure_location} to {destination} at {departure_time} is sold out."
+    available_seats = reservation["remaining_seats"]
+
+    # Create a ticket record
+    ticket = {
+        'ticket_id': str(uuid.uuid4()),
+        'customer_id': _customer_id(ctx),
+        'departure_time': departure_time,
+        'departure_location': departure_location,
+        'arrival_time': arrival_time,
+        'destination': destination,
+        'bus_name': bus_name,
+        'available_seats': available_seats,
+        'booking_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+    # Record the ticket in the append-only booking journal
+    await asyncio.to_thread(get_booking_journal().append, ticket)
+
+    # Return a detailed confirmation message
+    return f"Bus ticket booked successfully!\n\nDetails:\n- Ticket ID: {ticket['ticket_id']}\n- Departure: {departure_location} at {departure_time}\n- Arrival: {destination} at {arrival_time}\n- Bus: {bus_name}\n- Available Seats: {available_seats}\n\n⚠️ IMPORTANT: This booking is reserved for 24 hours. You must complete payment within 24 hours or your booking will be automatically cancelled and the seat will be released."
+
+
+async def get_my_bookings(ctx: RunContext[AgentDeps]):
+    """
+    Retrieves all tickets booked by the current user.
+
+    Returns:
+        list: A list of dictionaries containing ticket information
+        dict: For many bookings, only a 'preview' of the first rows plus a 'handle';
+              use query_tool_result with the handle to read the rest.
+    """
+    customer_id = _customer_id(ctx)
+    bookings = get_booking_journal().find_by_customer(customer_id)
+    return get_tool_result_store().wrap("get_my_bookings", bookings, owner=customer_id)
+
+
+async def query_tool_result(
+    ctx: RunContext[AgentDeps],
+    handle: str,
+    filters: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None,
+    sort_by: Optional[str] = None,
+    descending: bool = False,
+    group_by: Optional[str] = None,
+    aggregate: Optional[str] = None,
+    aggregate_column: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+):
+    """
+    Reads a large tool result that was returned as a preview with a 'handle'.
+    
+    Args:
+        handle (str): The handle from the earlier tool result (e.g., "res_1a2b3c4d5e6f")
+        filters (dict, optional): Column to value that rows must match, case-insensitive
+            (e.g., {"destination": "Abuja"}); a list of values matches any of them
+        columns (list, optional): Only return these columns
+        sort_by (str, optional): Column to sort by (or the aggregate column when grouping)
+        descending (bool, optional): Sort in descending order. Defaults to False.
+        group_by (str, optional): Return one row per value of this column
+        aggregate (str, optional): "count", "sum", "min", "max" or "avg"; defaults to "count" when grouping
+        aggregate_column (str, optional): Column to sum/min/max/avg (e.g., "available_seats")
+        limit (int, optional): Maximum number of rows to return (max 200). Defaults to 20.
+        offset (int, optional): Number of rows to skip, for paging. Defaults to 0.
+    
+    Returns:
+        dict: 'total' number of matching rows (or groups) and 'items', the requested page
+    """
+    try:
+        return get_tool_result_store().query(
+            handle,
+            owner=_customer_id(ctx),
+            filters=filters,
+            columns=columns,
+            sort_by=sort_by,
+            descending=descending,
+            group_by=group_by,
+            aggregate=aggregate,
+            aggregate_column=aggregate_column,
+            limit=limit,
+            offset=offset,
+        )
+    except (KeyError, ValueError) as e:
+        return {"status": "error", "message": str(e).strip("'\"")}
+
+
+async def get_user_information(ctx: RunContext[AgentDeps]):
+    """
+    Retrieves the current user's information.
+
+    Returns:
+        dict: A dictionary containing user information
+    """
+    return ctx.deps.user_information or {}
+
+
+def build_bus_toolset() -> FunctionToolset:
+    """Create the toolset with every bus ticketing tool."""
+    return FunctionToolset([search_bus_schedule, get_entire_bus_schedule, book_bus_ticket, get_my_bookings, query_tool_result, get_user_information, download_pdf])
+
+
+# Global toolset instance shared by every session in the process
+_bus_toolset = None
+_bus_toolset_lock = threading.Lock()
+
+
+def get_bus_toolset() -> FunctionToolset:
+    """Return the process-wide bus ticketing toolset, building it on first use."""
+    global _bus_toolset
+    if _bus_toolset is None:
+        with _bus_toolset_lock:
+            if _bus_toolset is None:
+                _bus_toolset = build_bus_toolset()
+    return _bus_toolset
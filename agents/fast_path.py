@@ -0,0 +1,229 @@
+"""Deterministic answers to greetings and simple schedule lookups, without a model call."""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, UserPromptPart
+
+from utils.schedule_intent import ScheduleIntent, parse_schedule_query
+from utils.schedule_store import get_schedule_store
+
+# Most departures listed in a fast-path answer
+FAST_PATH_ROWS = 15
+# model_name recorded on answers produced locally instead of by the agent
+FAST_PATH_MODEL_NAME = "fast-path"
+RESPONSE_CACHE_MODEL_NAME = "response-cache"
+LOCAL_MODEL_NAMES = (FAST_PATH_MODEL_NAME, RESPONSE_CACHE_MODEL_NAME)
+
+GREETING_RESPONSE = (
+    "Hello! I'm the Bus 54 Ticketing Assistant. I can look up departures between cities, "
+    "check available seats, book tickets and show your bookings. "
+    "Where would you like to travel?"
+)
+THANKS_RESPONSE = "You're welcome! Let me know if you need anything else for your trip."
+
+TABLE_COLUMNS = (
+    ("departure_time", "Departure"),
+    ("departure_location", "From"),
+    ("destination", "To"),
+    ("arrival_time", "Arrival"),
+    ("bus_name", "Bus"),
+    ("available_seats", "Seats"),
+)
+
+
+@dataclass
+class RouteDecision:
+    """Where a message was routed and, for the fast path, the answer."""
+    route: str
+    reason: str
+    response: Optional[str] = None
+    intent: Optional[ScheduleIntent] = None
+
+    @property
+    def handled(self) -> bool:
+        """True if the message was answered without the agent."""
+        return self.response is not None
+
+
+def _describe(intent: ScheduleIntent) -> str:
+    """Human-readable summary of the parsed filters, e.g. "from Lagos to Abuja after 08:00"."""
+    parts = []
+    if intent.origin:
+        parts.append(f"from {intent.origin}")
+    if intent.destination:
+        parts.append(f"to {intent.destination}")
+    if intent.bus_name:
+        parts.append(f"with {intent.bus_name}")
+    if intent.time_phrase:
+        parts.append(f"in the {intent.time_phrase}" if intent.time_phrase != "tonight" else "tonight")
+    elif intent.earliest_departure and intent.latest_departure:
+        parts.append(f"between {intent.earliest_departure} and {intent.latest_departure}")
+    elif intent.earliest_departure:
+        parts.append(f"after {intent.earliest_departure}")
+    elif intent.latest_departure:
+        parts.append(f"before {intent.latest_departure}")
+    if intent.min_seats:
+        parts.append(f"with at least {intent.min_seats} seats")
+    return " ".join(parts)
+
+
+def render_schedule_table(rows: List[Dict[str, Any]]) -> str:
+    """Format departures as a markdown table."""
+    lines = [
+        "| " + " | ".join(title for _, title in TABLE_COLUMNS) + " |",
+        "|" + "|".join(" --- " for _ in TABLE_COLUMNS) + "|",
+    ]
+    for row in rows:
+        cells = [str(row.get(column) or "").replace("|", "\\|") for column, _ in TABLE_COLUMNS]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def render_schedule_answer(intent: ScheduleIntent, result: Dict[str, Any]) -> str:
+    """Templated markdown answer for a schedule search result."""
+    description = _describe(intent)
+    total = result["total"]
+    if total == 0:
+        return (f"I couldn't find any departures {description}. "
+                "Would you like me to check a different time or a nearby city?")
+    shown = result["items"]
+    noun = "departure" if total == 1 else "departures"
+    lines = [f"Here {'is' if total == 1 else 'are'} the {total} {noun} {description}:", "", render_schedule_table(shown)]
+    if total > len(shown):
+        lines += ["", f"Showing the first {len(shown)} by departure time. Ask me to narrow it down by time or bus company."]
+    lines += ["", "Would you like to book this departure?" if total == 1 else "Would you like to book one of these?"]
+    return "\n".join(lines)
+
+
+def local_turn(user_input: str, response: str, model_name: str) -> List[ModelMessage]:
+    """
+    Messages recording a turn answered without the agent, for the chat history.
+
+    The turn carries no system prompt; the agent sends its prompt as
+    instructions on every run, so a history that starts with a local turn
+    still gets it.
+    """
+    return [
+        ModelRequest(parts=[UserPromptPart(content=user_input)]),
+        ModelResponse(parts=[TextPart(content=response)], model_name=model_name),
+    ]
+
+
+def awaiting_reply(history: List[ModelMessage]) -> bool:
+    """
+    True if the agent's last answer asked the user a question.
+
+    The next message is then likely an answer ("Lagos", "the 8am one") that
+    only makes sense in context. Questions closing a local answer ("Would you
+    like to book one of these?") do not count.
+    """
+    for message in reversed(history):
+        if isinstance(message, ModelResponse):
+            if message.model_name in LOCAL_MODEL_NAMES:
+                return False
+            texts = [part.content for part in message.parts if isinstance(part, TextPart)]
+            return bool(texts) and texts[-1].rstrip().endswith("?")
+    return False
+
+
+class FastPathRouter:
+    """
+    Answers greetings and self-contained schedule lookups directly from the timetable.
+
+    A message takes the fast path only if every word is accounted for by the
+    parser: a place, operator, time, day or seat filter from the timetable's
+    vocabulary, or a filler word. Anything else (bookings, the user's own
+    tickets, unparsed words or numbers, a lone city with no direction, or a reply to a
+    question the assistant just asked) goes to the agent. Every decision is
+    counted by route and reason.
+    """
+
+    def __init__(self, max_rows: int = FAST_PATH_ROWS):
+        """
+        Args:
+            max_rows (int): Most departures listed in an answer
+        """
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+
+    def _count(self, decision: RouteDecision) -> RouteDecision:
+        with self._lock:
+            for name in (decision.route, f"{decision.route}.{decision.reason}"):
+                self._counts[name] = self._counts.get(name, 0) + 1
+        return decision
+
+    def route(self, text: str, awaiting_reply: bool = False) -> RouteDecision:
+        """
+        Decide how to answer a message.
+
+        Args:
+            text (str): The user's message
+            awaiting_reply (bool): The assistant's last message asked the user something,
+                so the message must be read in context by the agent
+
+        Returns:
+            RouteDecision: route is "greeting", "schedule" or "agent"; response is set
+                           when the message was answered here
+        """
+        if awaiting_reply:
+            return self._count(RouteDecision("agent", "awaiting_reply"))
+        intent = parse_schedule_query(text)
+        if not intent.tokens:
+            return self._count(RouteDecision("agent", "empty", intent=intent))
+        if intent.greeting:
+            thanks = any(token in ("thanks", "thank", "cheers") for token in intent.tokens)
+            return self._count(RouteDecision("greeting", "thanks" if thanks else "hello",
+                                              THANKS_RESPONSE if thanks else GREETING_RESPONSE, intent))
+        if intent.user_specific:
+            return self._count(RouteDecision("agent", "user_specific", intent=intent))
+        if not intent.has_route:
+            return self._count(RouteDecision("agent", "no_route", intent=intent))
+        if any(any(char.isdigit() for char in token) for token in intent.residual):
+            # A number that did not become a filter (e.g. "before 6") would otherwise be silently ignored
+            return self._count(RouteDecision("agent", "unparsed_number", intent=intent))
+        if intent.residual:
+            return self._count(RouteDecision("agent", "unparsed_words", intent=intent))
+        if intent.city and not (intent.origin or intent.destination):
+            # "Lagos buses" could mean from or to Lagos
+            return self._count(RouteDecision("agent", "ambiguous_place", intent=intent))
+
+        try:
+            result = get_schedule_store().search(
+                origin=intent.origin,
+                destination=intent.destination,
+                earliest_departure=intent.earliest_departure,
+                latest_departure=intent.latest_departure,
+                bus_name=intent.bus_name,
+                min_seats=intent.min_seats,
+                limit=self.max_rows,
+            )
+        except ValueError:
+            return self._count(RouteDecision("agent", "search_error", intent=intent))
+        return self._count(RouteDecision("schedule", "lookup", render_schedule_answer(intent, result), intent))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return decision counts per route and per route.reason, and the fast-path share."""
+        with self._lock:
+            counts = dict(self._counts)
+        total = sum(counts.get(route, 0) for route in ("greeting", "schedule", "agent"))
+        fast = counts.get("greeting", 0) + counts.get("schedule", 0)
+        counts["fast_path_rate"] = round(fast / total, 4) if total else 0.0
+        return counts
+
+
+# Global router instance shared by every session in the process
+_fast_path_router = None
+_fast_path_router_lock = threading.Lock()
+
+
+def get_fast_path_router() -> FastPathRouter:
+    """Return the process-wide fast-path router, creating it on first use."""
+    global _fast_path_router
+    if _fast_path_router is None:
+        with _fast_path_router_lock:
+            if _fast_path_router is None:
+                _fast_path_router = FastPathRouter()
+    return _fast_path_router
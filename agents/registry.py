@@ -0,0 +1,83 @@
+"""Process-wide registry of configured agents for the Bus 54 Ticketing Assistant."""
+
+import threading
+from typing import Any, Dict
+
+from pydantic_ai import Agent
+
+from Basic_Pydantic_AI_Agent.src.agent import AgentDeps
+from agents.bus_tools import get_bus_toolset
+from utils.system_prompts import convert_to_user_friendly_response_prompt
+
+# Model settings for the user-friendly response agent
+USER_FRIENDLY_MODEL_SETTINGS = {"temperature": 0.5, "think": False}
+
+
+def build_user_friendly_agent(model) -> Agent:
+    """
+    Create the user-friendly response agent with the bus ticketing toolset.
+
+    Args:
+        model: Model name or pydantic-ai model instance
+
+    Returns:
+        Agent: Agent whose runs take AgentDeps carrying the per-user state
+    """
+    # Passed as instructions so the prompt is sent on every run. A system_prompt is only added
+    # when message_history is empty, and histories that start with a locally answered turn
+    # (fast path or response cache) have no system prompt part to carry it forward.
+    return Agent(
+        model=model,
+        deps_type=AgentDeps,
+        model_settings=USER_FRIENDLY_MODEL_SETTINGS,
+        toolsets=[get_bus_toolset()],
+        instructions=convert_to_user_friendly_response_prompt(),
+    )
+
+
+class AgentRegistry:
+    """
+    Builds each agent once and hands the same instance to every chat turn.
+
+    Agents and toolsets hold no per-user state, so sharing them avoids
+    re-generating tool schemas and re-validating the agent on every message.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._agents: Dict[Any, Agent] = {}
+
+    def user_friendly_agent(self, model) -> Agent:
+        """
+        Return the user-friendly response agent for a model, building it on first use.
+
+        Args:
+            model: Model name or pydantic-ai model instance
+
+        Returns:
+            Agent: The shared agent
+        """
+        key = ("user_friendly_response_agent", model)
+        agent = self._agents.get(key)
+        if agent is None:
+            with self._lock:
+                agent = self._agents.get(key)
+                if agent is None:
+                    agent = build_user_friendly_agent(model)
+                    self._agents[key] = agent
+        return agent
+
+
+# Global registry instance shared by every session in the process
+_agent_registry = None
+_agent_registry_lock = threading.Lock()
+
+
+def get_agent_registry() -> AgentRegistry:
+    """Return the process-wide agent registry, creating it on first use."""
+    global _agent_registry
+    if _agent_registry is None:
+        with _agent_registry_lock:
+            if _agent_registry is None:
+                _agent_registry = AgentRegistry()
+    return _agent_registry
@@ -1,28 +1,36 @@
 import datetime
 import json
-import os
 from typing import Any, Dict
 
-# Global variable to cache the static data
-_static_data = None
+from src.static_data import get_static_snapshot
+
+# Fields returned by server_detail / server_details when none are requested
+SERVER_DETAIL_FIELDS = ["server", "cpu_util_avg", "cpu_util_p95", "cpu_underutilized_flag", "cpu_overstressed_flag",
+                        "cpu_cores_inferred", "cpu_core_inference_method", "mem_util_avg", "mem_util_p95",
+                        "has_mem", "mem_source", "disk_free_pct_median", "disk_free_pct_min",
+                        "disks_overalloc_count", "disks_low_free_count", "owner", "team", "manager", "department"]
+
+def load_static_data(run_dir=None):
+    """Return the static server data of the active snapshot; it is reloaded in the background when the file changes."""
+    return get_static_snapshot(run_dir).data
+
+
+def get_server_inventory(run_dir=None):
+    """Return the columnar server inventory of the active snapshot."""
+    return get_static_snapshot(run_dir).inventory
 
-def load_static_data():
-    """Load static server data from JSON file."""
-    global _static_data
-    if _static_data is None:
-        # Get the directory of the current file and navigate to data folder
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        parent_dir = os.path.dirname(current_dir)
-        data_file = os.path.join(parent_dir, 'data', 'static_server_data.json')
-        
-        try:
-            with open(data_file, 'r') as f:
-                _static_data = json.load(f)
-        except FileNotFoundError:
-            # Fallback to empty data structure if file not found
-            _static_data = {"servers": [], "feature_coverage": {}, "memory_features_by_server": {}}
-    
-    return _static_data
+
+def get_org_index(run_dir=None):
+    """Return the org hierarchy index with per-person ownership rollups of the active snapshot."""
+    return get_static_snapshot(run_dir).org_index
+
+
+def _server_scope(inventory, servers=None, exclude_servers=None):
+    """Mask of servers limited to `servers` (if given) and without `exclude_servers`."""
+    mask = inventory.in_names(servers) if servers else inventory.all()
+    if exclude_servers:
+        mask &= ~inventory.in_names(exclude_servers)
+    return mask
 
 
 def format_json_for_display(data: Dict[str, Any]) -> str:
@@ -36,6 +44,8 @@ def get_run_info(run_dir=None):
     """
     Lightweight health & freshness. Returns shapes and provenance.
     """
+    snapshot = get_static_snapshot(run_dir)
+    
     # Use static run directory for consistent results
     run_directory = run_dir if run_dir else "run_20250911_120000"
     static_timestamp = "2025-09-11T12:00:00"
@@ -52,7 +62,8 @@ def get_run_info(run_dir=None):
         "provenance": {
             "created_at": static_timestamp,
             "data_sources": ["telemetry_metrics", "server_inventory", "anomaly_issues"],
-            "freshness_hours": 4
+            "freshness_hours": 4,
+            **snapshot.provenance()
         }
     }
 
@@ -65,20 +76,12 @@ def list_servers(run_dir=None, limit=20, offset=0, fields=None):
                  "cpu_util_avg", "cpu_util_p95", "cpu_underutilized_flag", "cpu_overstressed_flag",
                  "owner", "team", "manager", "department"]
     
-    # Load static server data
-    static_data = load_static_data()
-    all_servers = static_data.get("servers", [])
-    
-    # Apply pagination
-    paginated = all_servers[offset:offset+limit]
+    snapshot = get_static_snapshot(run_dir)
+    inventory = snapshot.inventory
     
-    # Filter fields if specified
-    if fields:
-        filtered_servers = []
-        for server in paginated:
-            filtered_server = {field: server.get(field) for field in fields if field in server}
-            filtered_servers.append(filtered_server)
-        paginated = filtered_servers
+    # Apply pagination, then build dicts for the requested fields of that page only
+    positions = inventory.positions(inventory.all())[offset:offset+limit]
+    paginated = inventory.project(positions, fields)
     
     # Use static values for consistent results
     static_timestamp = "2025-09-11T12:00:00"
@@ -86,11 +89,12 @@ def list_servers(run_dir=None, limit=20, offset=0, fields=None):
     
     return {
         "status": "success",
-        "total": len(all_servers),
+        "total": inventory.size,
         "items": paginated,
         "provenance": {
             "run_dir": static_run_dir,
-            "generated_at": static_timestamp
+            "generated_at": static_timestamp,
+            **snapshot.provenance()
         }
     }
 
@@ -99,49 +103,25 @@ def underutilized_servers(run_dir=None, limit=20, offset=0, avg_lt=10.0, p95_lt=
     """
     Find potential donors (likely over-provisioned).
     """
+    return _underutilized_servers(get_static_snapshot(run_dir), run_dir, limit, offset, avg_lt, p95_lt,
+                                  require_both, servers, exclude_servers, fields)
+
+def _underutilized_servers(snapshot, run_dir, limit, offset, avg_lt, p95_lt, require_both, servers,
+                           exclude_servers, fields):
+    """Donor search over one snapshot."""
     if fields is None:
         fields = ["server", "cpu_util_avg", "cpu_util_p95", "cpu_cores_inferred", 
                  "has_mem_bytes", "has_mem_util", "has_disk", "cpu_underutilized_flag"]
     
-    if servers is None:
-        servers = []
-    
-    if exclude_servers is None:
-        exclude_servers = []
-    
-    # Get all servers
-    all_servers_result = list_servers(run_dir, 100, 0)
-    all_servers = all_servers_result["items"]
-    
-    # Filter for underutilized
-    underutilized = []
-    for server in all_servers:
-        # Skip if in exclude list
-        if server["server"] in exclude_servers:
-            continue
-        
-        # Skip if servers list provided and not in it
-        if servers and server["server"] not in servers:
-            continue
-        
-        avg_check = server["cpu_util_avg"] < avg_lt
-        p95_check = server["cpu_util_p95"] < p95_lt
-        
-        if require_both and avg_check and p95_check:
-            underutilized.append(server)
-        elif not require_both and (avg_check or p95_check):
-            underutilized.append(server)
-    
-    # Apply pagination
-    paginated = underutilized[offset:offset+limit]
+    # Evaluate the thresholds over the whole fleet at once; missing metrics never match
+    inventory = snapshot.inventory
+    avg_check = inventory.less_than("cpu_util_avg", avg_lt)
+    p95_check = inventory.less_than("cpu_util_p95", p95_lt)
+    matches = (avg_check & p95_check) if require_both else (avg_check | p95_check)
+    underutilized = inventory.positions(matches & _server_scope(inventory, servers, exclude_servers))
     
-    # Filter fields if specified
-    if fields:
-        filtered_servers = []
-        for server in paginated:
-            filtered_server = {field: server.get(field) for field in fields if field in server}
-            filtered_servers.append(filtered_server)
-        paginated = filtered_servers
+    # Apply pagination and project the requested fields
+    paginated = inventory.project(underutilized[offset:offset+limit], fields)
     
     # Use static values for consistent results
     static_timestamp = "2025-09-11T12:00:00"
@@ -158,7 +138,8 @@ def underutilized_servers(run_dir=None, limit=20, offset=0, avg_lt=10.0, p95_lt=
         "items": paginated,
         "provenance": {
             "run_dir": static_run_dir,
-            "generated_at": static_timestamp
+            "generated_at": static_timestamp,
+            **snapshot.provenance()
         },
         "notes": [
             "These servers are candidates for resource reduction or reallocation",
@@ -171,49 +152,25 @@ def overstressed_servers(run_dir=None, limit=20, offset=0, avg_gt=70.0, p95_gt=9
     """
     Find potential receivers (likely constrained).
     """
+    return _overstressed_servers(get_static_snapshot(run_dir), run_dir, limit, offset, avg_gt, p95_gt,
+                                 require_any, servers, exclude_servers, fields)
+
+def _overstressed_servers(snapshot, run_dir, limit, offset, avg_gt, p95_gt, require_any, servers,
+                          exclude_servers, fields):
+    """Receiver search over one snapshot."""
     if fields is None:
         fields = ["server", "cpu_util_avg", "cpu_util_p95", "has_mem_bytes", 
                  "has_mem_util", "has_disk", "cpu_overstressed_flag"]
     
-    if servers is None:
-        servers = []
-    
-    if exclude_servers is None:
-        exclude_servers = []
-    
-    # Get all servers
-    all_servers_result = list_servers(run_dir, 100, 0)
-    all_servers = all_servers_result["items"]
-    
-    # Filter for overstressed
-    overstressed = []
-    for server in all_servers:
-        # Skip if in exclude list
-        if server["server"] in exclude_servers:
-            continue
-        
-        # Skip if servers list provided and not in it
-        if servers and server["server"] not in servers:
-            continue
-        
-        avg_check = server["cpu_util_avg"] > avg_gt
-        p95_check = server["cpu_util_p95"] > p95_gt
-        
-        if require_any and (avg_check or p95_check):
-            overstressed.append(server)
-        elif not require_any and avg_check and p95_check:
-            overstressed.append(server)
-    
-    # Apply pagination
-    paginated = overstressed[offset:offset+limit]
+    # Evaluate the thresholds over the whole fleet at once; missing metrics never match
+    inventory = snapshot.inventory
+    avg_check = inventory.greater_than("cpu_util_avg", avg_gt)
+    p95_check = inventory.greater_than("cpu_util_p95", p95_gt)
+    matches = (avg_check | p95_check) if require_any else (avg_check & p95_check)
+    overstressed = inventory.positions(matches & _server_scope(inventory, servers, exclude_servers))
     
-    # Filter fields if specified
-    if fields:
-        filtered_servers = []
-        for server in paginated:
-            filtered_server = {field: server.get(field) for field in fields if field in server}
-            filtered_servers.append(filtered_server)
-        paginated = filtered_servers
+    # Apply pagination and project the requested fields
+    paginated = inventory.project(overstressed[offset:offset+limit], fields)
     
     # Use static values for consistent results
     static_timestamp = "2025-09-11T12:00:00"
@@ -230,7 +187,8 @@ def overstressed_servers(run_dir=None, limit=20, offset=0, avg_gt=70.0, p95_gt=9
         "items": paginated,
         "provenance": {
             "run_dir": static_run_dir,
-            "generated_at": static_timestamp
+            "generated_at": static_timestamp,
+            **snapshot.provenance()
         },
         "notes": [
             "These servers may benefit from additional resources or workload rebalancing",
@@ -245,36 +203,21 @@ def memory_coverage(run_dir=None, limit=50, offset=0, fields=None):
     if fields is None:
         fields = ["server", "mem_byte_features_present", "has_mem_bytes", "has_mem_util"]
     
-    # Get all servers
-    all_servers_result = list_servers(run_dir, 100, 0)
-    all_servers = all_servers_result["items"]
-    
-    # Enhance with memory coverage information from static data
-    static_data = load_static_data()
-    memory_features_by_server = static_data.get("memory_features_by_server", {})
+    # mem_byte_features_present is a column of the inventory, joined from the static data once
+    snapshot = get_static_snapshot(run_dir)
+    inventory = snapshot.inventory
+    positions = inventory.positions(inventory.all())[offset:offset+limit]
+    paginated = inventory.project(positions, fields or inventory.fields + ["mem_byte_features_present"])
     
-    for server in all_servers:
-        server_id = server.get("server")
-        server["mem_byte_features_present"] = memory_features_by_server.get(server_id, [])
-    
-    # Apply pagination
-    paginated = all_servers[offset:offset+limit]
-    
-    # Filter fields if specified
-    if fields:
-        filtered_servers = []
-        for server in paginated:
-            filtered_server = {field: server.get(field) for field in fields if field in server}
-            filtered_servers.append(filtered_server)
-        paginated = filtered_servers
-    
-    # Calculate summary
+    # Calculate summary over the whole fleet
+    has_mem_bytes = inventory.truthy("has_mem_bytes")
+    has_mem_util = inventory.truthy("has_mem_util")
     summary = {
-        "total_servers": len(all_servers),
-        "has_mem_bytes": sum(1 for s in all_servers if s.get("has_mem_bytes")),
-        "has_mem_util": sum(1 for s in all_servers if s.get("has_mem_util")),
-        "has_both": sum(1 for s in all_servers if s.get("has_mem_bytes") and s.get("has_mem_util")),
-        "has_neither": sum(1 for s in all_servers if not s.get("has_mem_bytes") and not s.get("has_mem_util"))
+        "total_servers": inventory.size,
+        "has_mem_bytes": inventory.count(has_mem_bytes),
+        "has_mem_util": inventory.count(has_mem_util),
+        "has_both": inventory.count(has_mem_bytes & has_mem_util),
+        "has_neither": inventory.count(~has_mem_bytes & ~has_mem_util)
     }
     
     # Use static values for consistent results
@@ -284,14 +227,24 @@ def memory_coverage(run_dir=None, limit=50, offset=0, fields=None):
     return {
         "status": "success",
         "summary": summary,
-        "total": len(all_servers),
+        "total": inventory.size,
         "items": paginated,
         "provenance": {
             "run_dir": static_run_dir,
-            "generated_at": static_timestamp
+            "generated_at": static_timestamp,
+            **snapshot.provenance()
         }
     }
 
+def _detail_coverage(details):
+    """Metric coverage flags of a server_detail item."""
+    return {
+        "cpu": details.get("has_cpu", True),
+        "memory": details.get("has_mem", False),
+        "disk": details.get("has_disk", False),
+        "network": True  # Assume network is always available for simplicity
+    }
+
 def server_detail(run_dir=None, server=None, fields=None):
     """
     Single-server drilldown for answer citations.
@@ -300,37 +253,20 @@ def server_detail(run_dir=None, server=None, fields=None):
         return {"status": "error", "message": "Server parameter is required"}
     
     if fields is None:
-        fields = ["server", "cpu_util_avg", "cpu_util_p95", "cpu_underutilized_flag", "cpu_overstressed_flag",
-                 "cpu_cores_inferred", "cpu_core_inference_method", "mem_util_avg", "mem_util_p95", 
-                 "has_mem", "mem_source", "disk_free_pct_median", "disk_free_pct_min", 
-                 "disks_overalloc_count", "disks_low_free_count", "owner", "team", "manager", "department"]
-    
-    # Load static server data
-    static_data = load_static_data()
-    all_servers = static_data.get("servers", [])
-    
-    # Find the requested server
-    server_details = None
-    for srv in all_servers:
-        if srv.get("server") == server:
-            server_details = srv.copy()
-            break
-    
-    if server_details is None:
+        fields = SERVER_DETAIL_FIELDS
+    
+    # Find the requested server through the name index
+    snapshot = get_static_snapshot(run_dir)
+    inventory = snapshot.inventory
+    position = inventory.position_of(server)
+    
+    if position is None:
         return {"status": "error", "message": f"Server '{server}' not found"}
     
-    # Filter fields if specified
-    if fields:
-        filtered_details = {field: server_details.get(field) for field in fields if field in server_details}
-        server_details = filtered_details
+    server_details = inventory.project([position], fields)[0]
     
     # Calculate coverage based on server data
-    coverage = {
-        "cpu": server_details.get("has_cpu", True),
-        "memory": server_details.get("has_mem", False),
-        "disk": server_details.get("has_disk", False),
-        "network": True  # Assume network is always available for simplicity
-    }
+    coverage = _detail_coverage(server_details)
     
     # Use static values for consistent results
     static_timestamp = "2025-09-11T12:00:00"
@@ -342,7 +278,53 @@ def server_detail(run_dir=None, server=None, fields=None):
         "coverage": coverage,
         "provenance": {
             "run_dir": static_run_dir,
-            "generated_at": static_timestamp
+            "generated_at": static_timestamp,
+            **snapshot.provenance()
+        }
+    }
+
+def server_details(run_dir=None, servers=None, fields=None):
+    """
+    Multi-server drilldown: resolve many servers in one call.
+    """
+    if not servers:
+        return {"status": "error", "message": "Servers parameter is required"}
+    
+    if fields is None:
+        fields = SERVER_DETAIL_FIELDS
+    
+    # Resolve every name through the index, keeping the requested order
+    snapshot = get_static_snapshot(run_dir)
+    inventory = snapshot.inventory
+    found = []
+    positions = []
+    not_found = []
+    for server in servers:
+        position = inventory.position_of(server)
+        if position is None:
+            not_found.append(server)
+        else:
+            found.append(server)
+            positions.append(position)
+    
+    # One column-wise projection for all of them
+    items = inventory.project(positions, fields)
+    coverage = {server: _detail_coverage(item) for server, item in zip(found, items)}
+    
+    # Use static values for consistent results
+    static_timestamp = "2025-09-11T12:00:00"
+    static_run_dir = run_dir if run_dir else "run_20250911_120000"
+    
+    return {
+        "status": "success" if items else "error",
+        "total": len(items),
+        "items": items,
+        "coverage": coverage,
+        "not_found": not_found,
+        "provenance": {
+            "run_dir": static_run_dir,
+            "generated_at": static_timestamp,
+            **snapshot.provenance()
         }
     }
 
@@ -352,22 +334,33 @@ def reallocation_candidates(run_dir=None, donor_limit=5, receiver_limit=5,
     """
     Data-only donor/receiver lists; the model writes the recommendation.
     """
+    # Both lists come from the same snapshot, even if a reload lands in between
+    snapshot = get_static_snapshot(run_dir)
+    
     # Get donor candidates
-    donors = underutilized_servers(
-        run_dir=run_dir,
+    donors = _underutilized_servers(
+        snapshot, run_dir,
         limit=donor_limit,
+        offset=0,
         avg_lt=donor_avg_lt,
         p95_lt=donor_p95_lt,
-        require_both=donor_require_both
+        require_both=donor_require_both,
+        servers=None,
+        exclude_servers=None,
+        fields=None
     )
     
     # Get receiver candidates
-    receivers = overstressed_servers(
-        run_dir=run_dir,
+    receivers = _overstressed_servers(
+        snapshot, run_dir,
         limit=receiver_limit,
+        offset=0,
         avg_gt=receiver_avg_gt,
         p95_gt=receiver_p95_gt,
-        require_any=receiver_require_any
+        require_any=receiver_require_any,
+        servers=None,
+        exclude_servers=None,
+        fields=None
     )
     
     # Format donor and receiver information for better display
@@ -408,7 +401,8 @@ def reallocation_candidates(run_dir=None, donor_limit=5, receiver_limit=5,
         "receivers": formatted_receivers,
         "provenance": {
             "run_dir": static_run_dir,
-            "generated_at": static_timestamp
+            "generated_at": static_timestamp,
+            **snapshot.provenance()
         },
         "notes": [
             "Consider moving resources from underutilized servers to overutilized ones",
@@ -432,7 +426,8 @@ def feature_coverage(run_dir=None, server=None, feature_prefix=None, limit=100,
         return {"status": "error", "message": "Either server or feature_prefix parameter is required"}
     
     # Load static feature coverage data
-    static_data = load_static_data()
+    snapshot = get_static_snapshot(run_dir)
+    static_data = snapshot.data
     feature_coverage_data = static_data.get("feature_coverage", {})
     
     # Get all feature categories
@@ -497,7 +492,8 @@ def feature_coverage(run_dir=None, server=None, feature_prefix=None, limit=100,
         "items": paginated,
         "provenance": {
             "run_dir": static_run_dir,
-            "generated_at": static_timestamp
+            "generated_at": static_timestamp,
+            **snapshot.provenance()
         }
     }
 
@@ -515,101 +511,19 @@ def person_server_ownership(person_name=None, run_dir=None):
     if person_name is None:
         return {"status": "error", "message": "Person name parameter is required"}
     
-    # Load static server data
-    static_data = load_static_data()
-    all_servers = static_data.get("servers", [])
-    org_structure = static_data.get("organizational_structure", {})
-    
-    # Find person in organizational structure
-    person_info = None
-    person_key = None
-    
-    # Check senior manager
-    senior_mgr = org_structure.get("senior_infrastructure_manager", {})
-    if senior_mgr.get("name") == person_name:
-        person_info = senior_mgr
-        person_key = "senior_infrastructure_manager"
-    
-    # Check team leads
-    if not person_info:
-        team_leads = org_structure.get("team_leads", {})
-        for key, lead in team_leads.items():
-            if lead.get("name") == person_name:
-                person_info = lead
-                person_key = f"team_leads.{key}"
-                break
-    
-    # Check individual contributors
-    if not person_info:
-        contributors = org_structure.get("individual_contributors", {})
-        for key, contributor in contributors.items():
-            if contributor.get("name") == person_name:
-                person_info = contributor
-                person_key = f"individual_contributors.{key}"
-                break
+    # Person lookup, subordinate closure and server counts all come from the precomputed org index
+    snapshot = get_static_snapshot(run_dir)
+    org_index = snapshot.org_index
+    person_info = org_index.person(person_name)
     
     if not person_info:
         return {"status": "error", "message": f"Person '{person_name}' not found in organizational structure"}
     
-    # Count direct servers owned by this person
-    direct_servers = []
-    for server in all_servers:
-        if server.get("owner") == person_name:
-            direct_servers.append(server["server"])
-    
-    # Find all subordinates and their servers
-    subordinate_servers = {}
-    subordinate_total = 0
-    
-    def get_subordinates(person_manages):
-        """Recursively find all people managed by this person."""
-        subordinates = []
-        if not person_manages:
-            return subordinates
-            
-        for managed_person in person_manages:
-            subordinates.append(managed_person)
-            
-            # Find this person's info to see who they manage
-            managed_person_info = None
-            
-            # Check team leads
-            team_leads = org_structure.get("team_leads", {})
-            for lead in team_leads.values():
-                if lead.get("name") == managed_person:
-                    managed_person_info = lead
-                    break
-            
-            # Check individual contributors  
-            if not managed_person_info:
-                contributors = org_structure.get("individual_contributors", {})
-                for contributor in contributors.values():
-                    if contributor.get("name") == managed_person:
-                        managed_person_info = contributor
-                        break
-            
-            # Recursively get their subordinates
-            if managed_person_info and "manages" in managed_person_info:
-                subordinates.extend(get_subordinates(managed_person_info["manages"]))
-                
-        return subordinates
-    
-    # Get all subordinates
-    all_subordinates = get_subordinates(person_info.get("manages", []))
-    
-    # Count servers for each subordinate
-    for subordinate_name in all_subordinates:
-        subordinate_server_list = []
-        for server in all_servers:
-            if server.get("owner") == subordinate_name:
-                subordinate_server_list.append(server["server"])
-                subordinate_total += 1
-        
-        if subordinate_server_list:  # Only include if they have servers
-            subordinate_servers[subordinate_name] = subordinate_server_list
-    
-    # Calculate totals
-    total_servers_under_management = len(direct_servers) + subordinate_total
+    rollup = org_index.rollup(person_name)
+    direct_servers = list(org_index.servers_by_owner.get(person_name, []))
+    subordinate_servers = org_index.servers_by_subordinate(person_name)
+    subordinate_total = rollup["subordinate_servers"]
+    total_servers_under_management = rollup["total_servers"]
     
     return {
         "status": "success",
@@ -632,15 +546,16 @@ def person_server_ownership(person_name=None, run_dir=None):
             "total_servers_managed": total_servers_under_management,
             "direct_servers": len(direct_servers),
             "subordinate_servers": subordinate_total,
-            "people_managed": len(all_subordinates)
+            "people_managed": rollup["people_managed"]
         },
         "provenance": {
             "run_dir": run_dir if run_dir else f"run_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            "generated_at": datetime.datetime.now().isoformat()
+            "generated_at": datetime.datetime.now().isoformat(),
+            **snapshot.provenance()
         }
     }
 
-def list_server_owners(run_dir=None, include_details=True, sort_by="name"):
+def list_server_owners(run_dir=None, include_details=True, sort_by="name", limit=None, offset=0):
     """
     List all people who own servers, with optional detailed information.
     
@@ -648,111 +563,22 @@ def list_server_owners(run_dir=None, include_details=True, sort_by="name"):
         run_dir (str): Run directory (optional)
         include_details (bool): Include organizational details like title, team, department
         sort_by (str): Sort order - "name", "server_count", "team", or "title"
+        limit (int): Maximum number of owners to return (optional, default all)
+        offset (int): Number of owners to skip, for paging
         
     Returns:
         dict: Contains list of all server owners with their details and server counts
     """
-    # Load static server data
-    static_data = load_static_data()
-    all_servers = static_data.get("servers", [])
-    org_structure = static_data.get("organizational_structure", {})
-    
-    # Collect unique owner names and their server counts
-    owner_servers = {}
-    for server in all_servers:
-        owner = server.get("owner")
-        if owner:
-            if owner not in owner_servers:
-                owner_servers[owner] = []
-            owner_servers[owner].append(server["server"])
-    
-    # Build detailed owner information
-    owners_list = []
-    for owner_name, server_list in owner_servers.items():
-        owner_info = {
-            "name": owner_name,
-            "server_count": len(server_list),
-            "servers": server_list
-        }
-        
-        if include_details:
-            # Find organizational details for this person
-            person_details = None
-            
-            # Check senior manager
-            senior_mgr = org_structure.get("senior_infrastructure_manager", {})
-            if senior_mgr.get("name") == owner_name:
-                person_details = senior_mgr
-            
-            # Check team leads
-            if not person_details:
-                team_leads = org_structure.get("team_leads", {})
-                for lead in team_leads.values():
-                    if lead.get("name") == owner_name:
-                        person_details = lead
-                        break
-            
-            # Check individual contributors
-            if not person_details:
-                contributors = org_structure.get("individual_contributors", {})
-                for contributor in contributors.values():
-                    if contributor.get("name") == owner_name:
-                        person_details = contributor
-                        break
-            
-            # Add organizational details
-            if person_details:
-                owner_info.update({
-                    "title": person_details.get("title", "Unknown"),
-                    "team": person_details.get("team", "Unknown"), 
-                    "department": person_details.get("department", "Unknown"),
-                    "email": person_details.get("email", "Unknown"),
-                    "phone": person_details.get("phone", "Unknown"),
-                    "reports_to": person_details.get("reports_to", "Unknown"),
-                    "seniority": person_details.get("seniority", "Unknown")
-                })
-            else:
-                # Fallback for unknown person
-                owner_info.update({
-                    "title": "Unknown",
-                    "team": "Unknown",
-                    "department": "Unknown", 
-                    "email": "Unknown",
-                    "phone": "Unknown",
-                    "reports_to": "Unknown",
-                    "seniority": "Unknown"
-                })
-        
-        owners_list.append(owner_info)
-    
-    # Sort the list based on sort_by parameter
-    if sort_by == "name":
-        owners_list.sort(key=lambda x: x["name"])
-    elif sort_by == "server_count":
-        owners_list.sort(key=lambda x: x["server_count"], reverse=True)
-    elif sort_by == "team":
-        owners_list.sort(key=lambda x: x.get("team", "ZZZ"))  # ZZZ puts unknown at end
-    elif sort_by == "title":
-        owners_list.sort(key=lambda x: x.get("title", "ZZZ"))
-    else:
-        # Default to name sorting if invalid sort_by provided
-        owners_list.sort(key=lambda x: x["name"])
-    
-    # Calculate summary statistics
-    total_owners = len(owners_list)
-    total_servers = sum(owner["server_count"] for owner in owners_list)
+    # Owners are grouped, joined with the org details and sorted once; each call slices a page
+    snapshot = get_static_snapshot(run_dir)
+    owner_table = snapshot.org_index.owner_table()
+    owners_list = owner_table.page(sort_by, include_details, limit, offset)
+    
+    # Calculate summary statistics over every owner, not just the page
+    total_owners = len(owner_table)
+    total_servers = owner_table.total_servers
     avg_servers_per_owner = total_servers / total_owners if total_owners > 0 else 0
     
-    # Group by teams for summary
-    team_summary = {}
-    if include_details:
-        for owner in owners_list:
-            team = owner.get("team", "Unknown")
-            if team not in team_summary:
-                team_summary[team] = {"owners": 0, "servers": 0}
-            team_summary[team]["owners"] += 1
-            team_summary[team]["servers"] += owner["server_count"]
-    
     # Use static values for consistent results
     static_timestamp = "2025-09-11T12:00:00"
     static_run_dir = run_dir if run_dir else "run_20250911_120000"
@@ -763,12 +589,15 @@ def list_server_owners(run_dir=None, include_details=True, sort_by="name"):
             "total_owners": total_owners,
             "total_servers": total_servers,
             "average_servers_per_owner": round(avg_servers_per_owner, 2),
-            "team_breakdown": team_summary if include_details else {}
+            "team_breakdown": owner_table.team_breakdown(sort_by) if include_details else {}
         },
         "owners": owners_list,
         "metadata": {
             "include_details": include_details,
             "sort_by": sort_by,
+            "limit": limit,
+            "offset": offset,
+            "returned": len(owners_list),
             "fields_included": ["name", "server_count", "servers"] + (
                 ["title", "team", "department", "email", "phone", "reports_to", "seniority"] 
                 if include_details else []
@@ -776,6 +605,7 @@ def list_server_owners(run_dir=None, include_details=True, sort_by="name"):
         },
         "provenance": {
             "run_dir": static_run_dir,
-            "generated_at": static_timestamp
+            "generated_at": static_timestamp,
+            **snapshot.provenance()
         }
-    }
\ No newline at end of file
+    }
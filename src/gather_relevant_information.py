@@ -1,9 +1,42 @@
 import streamlit as st
-from utils.sql_utils import execute_sql_on_parquet
+from utils.sql_utils import execute_sql_on_parquet_limited
+from utils.parallel_calls import get_parallel_executor
+from utils.schema_profiler import profile_data
 import json
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from typing import Tuple, Dict, Any, Union, List
 
+# Columns longer than this are type-checked on an evenly strided sample of rows
+SCHEMA_SAMPLE_ROWS = 200_000
+# Per-call limit when several functions / SQL commands are gathered concurrently
+GATHER_CALL_TIMEOUT_SECONDS = 30.0
+# SQL in a concurrent batch gets a slightly smaller budget so DuckDB cancels it before the call times out
+GATHER_SQL_TIME_BUDGET_SECONDS = 25.0
+
+
+def _resolve_function_calls(function_calls, functions, function_list):
+    """Look up every requested function before any of them runs."""
+    calls = []
+    for func_call in function_calls:
+        function_name = func_call["function_name"]
+        function_list.append(function_name)
+        func = getattr(functions, function_name, None)
+        if not callable(func):
+            raise AttributeError(f"Function '{function_name}' not found or not callable")
+        calls.append((function_name, func, func_call["parameters"]))
+    return calls
+
+
+def _outcome_value(outcome, agent_logs):
+    """Return a call's value; a timeout becomes an error payload, other exceptions propagate."""
+    if outcome.timed_out:
+        agent_logs.setdefault("timed_out_calls", []).append(outcome.name)
+        return {"status": "error", "message": str(outcome.error)}
+    return outcome.result()
+
 
 
 def convert_da_to_ui_schema(function_name, payload):
@@ -19,6 +52,8 @@ def convert_da_to_ui_schema(function_name, payload):
         return payload["items"]
     elif function_name == "server_detail":
         return payload["item"]
+    elif function_name == "server_details":
+        return payload["items"]
     elif function_name == "reallocation_candidates":
         return payload
     elif function_name == "feature_coverage":
@@ -29,12 +64,106 @@ def convert_da_to_ui_schema(function_name, payload):
 
 
 
+def _sample_step(num_rows):
+    """Stride that keeps at most SCHEMA_SAMPLE_ROWS rows of a column."""
+    return max(1, -(-num_rows // SCHEMA_SAMPLE_ROWS))
+
+
+def _is_integer_valued(series):
+    """
+    Return True if every non-null value of a numeric pandas Series is a whole number.
+    
+    Integer and boolean dtypes are answered from the dtype alone; floating columns
+    are checked with a vectorized modulo over (a strided sample of) the values.
+    """
+    if pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return True
+    step = _sample_step(len(series))
+    if step > 1:
+        series = series.iloc[::step]
+    try:
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+    except (TypeError, ValueError):
+        return False
+    values = values[~np.isnan(values)]
+    # inf % 1 is NaN, so infinities count as non-integer like float(x).is_integer()
+    return not np.any(np.mod(values, 1.0) != 0)
+
+
+def _arrow_column_type(arrow_type, column=None):
+    """
+    Map an Arrow type to the simplified type names used by extract_data_schema.
+    
+    When the column values are available, floating columns whose values are all
+    whole numbers are reported as "integer", matching the pandas path.
+    """
+    if pa.types.is_integer(arrow_type):
+        return "integer"
+    if pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        if column is None:
+            return "float"
+        step = _sample_step(len(column))
+        if step > 1:
+            column = column.take(pa.array(np.arange(0, len(column), step)))
+        if pa.types.is_decimal(arrow_type):
+            column = pc.cast(column, pa.float64())
+        # Integer-valued if every non-null, non-NaN value has no fractional part
+        whole = pc.or_(pc.equal(pc.floor(column), column), pc.is_nan(column))
+        return "float" if pc.all(whole).as_py() is False else "integer"
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return "string"
+    if pa.types.is_timestamp(arrow_type) or pa.types.is_date(arrow_type):
+        return "datetime"
+    if pa.types.is_boolean(arrow_type):
+        return "boolean"
+    return str(arrow_type)
+
+
+def extract_arrow_schema(data):
+    """
+    Extract a simplified schema from an Arrow Table or RecordBatchReader without a pandas copy.
+    
+    Types come from the Arrow schema; integer-vs-float detection uses Arrow compute
+    kernels on the columns. A RecordBatchReader is never consumed, so only its
+    schema is described and total_rows is None.
+    
+    Args:
+        data: pa.Table, pa.RecordBatch or pa.RecordBatchReader
+        
+    Returns:
+        dict: A simplified dictionary describing the data structure format
+    """
+    try:
+        if isinstance(data, pa.RecordBatchReader):
+            schema = data.schema
+            return {
+                "retrieved_data_structure": "Arrow RecordBatchReader (streamed)",
+                "total_rows": None,
+                "total_columns": len(schema),
+                "column_structure": {field.name: _arrow_column_type(field.type) for field in schema}
+            }
+
+        if data.num_rows == 0:
+            return {"error": "Empty data or unsupported format"}
+
+        return {
+            "retrieved_data_structure": "Arrow Table" if isinstance(data, pa.Table) else "Arrow RecordBatch",
+            "total_rows": int(data.num_rows),
+            "total_columns": int(data.num_columns),
+            "column_structure": {
+                field.name: _arrow_column_type(field.type, data.column(field.name)) for field in data.schema
+            }
+        }
+    except Exception as e:
+        return {"error": f"Failed to extract schema: {str(e)}"}
+
+
 def extract_data_schema(data):
     """
     Extract a simplified schema structure from data without exposing actual values.
     
     Args:
-        data: Input data in various formats (DataFrame, dict, list of dicts, JSON string)
+        data: Input data in various formats (DataFrame, Arrow table/reader, dict, list of dicts, JSON string)
         
     Returns:
         dict: A simplified dictionary describing the data structure format
@@ -44,6 +173,10 @@ def extract_data_schema(data):
     import ast
     import numpy as np
     
+    # Arrow results are described from their schema directly, without converting to pandas
+    if isinstance(data, (pa.Table, pa.RecordBatch, pa.RecordBatchReader)):
+        return extract_arrow_schema(data)
+    
     # Convert input to DataFrame for consistent processing
     df = None
     
@@ -109,7 +242,7 @@ def extract_data_schema(data):
         for col in df.columns:
             # Determine simplified data type
             if pd.api.types.is_numeric_dtype(df[col]):
-                if df[col].dropna().apply(lambda x: float(x).is_integer()).all():
+                if _is_integer_valued(df[col]):
                     col_type = "integer"
                 else:
                     col_type = "float"
@@ -130,12 +263,16 @@ def extract_data_schema(data):
         return {"error": f"Failed to extract schema: {str(e)}"}
         
         
-def extract_detailed_data_schema(data):
+def extract_detailed_data_schema(data, sample_size=None):
     """
     Extract the detailed schema structure and data types from data without exposing actual values.
     
+    Columns are profiled in a single pass by utils.schema_profiler: counts, nulls,
+    min/max/mean, approximate distinct counts and date/time pattern detection.
+    
     Args:
-        data: Input data in various formats (DataFrame, dict, list of dicts, JSON string)
+        data: Input data in various formats (DataFrame, Arrow table, dict, list of dicts, JSON string)
+        sample_size (int, optional): Profile at most this many rows of large inputs
         
     Returns:
         dict: A dictionary describing the schema structure with data types and sample formats
@@ -143,22 +280,15 @@ def extract_detailed_data_schema(data):
     import pandas as pd
     import json
     import ast
-    import numpy as np
-    import datetime
     
-    # Helper function to convert NumPy types to Python native types
-    def convert_numpy_types(obj):
-        if isinstance(obj, (np.integer, np.int64, np.int32, np.int16, np.int8)):
-            return int(obj)
-        elif isinstance(obj, (np.floating, np.float64, np.float32, np.float16)):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, np.bool_):
-            return bool(obj)
-        elif isinstance(obj, (np.datetime64, pd.Timestamp)):
-            return str(obj)
-        return obj
+    # Arrow tables are profiled batch by batch without a full pandas copy
+    if isinstance(data, (pa.Table, pa.RecordBatch)):
+        if data.num_rows == 0:
+            return {"error": "Empty data or unsupported format"}
+        try:
+            return profile_data(data, sample_size=sample_size)
+        except Exception as e:
+            return {"error": f"Failed to extract schema: {str(e)}"}
     
     # Convert input to DataFrame for consistent processing
     df = None
@@ -199,88 +329,7 @@ def extract_detailed_data_schema(data):
         if df is None or df.empty:
             return {"error": "Empty data or unsupported format"}
             
-        # Extract schema information
-        schema = {
-            "total_rows": int(len(df)),
-            "total_columns": int(len(df.columns)),
-            "columns": {}
-        }
-        
-        for col in df.columns:
-            col_info = {
-                "dtype": str(df[col].dtype),
-                "non_null_count": int(df[col].count()),
-                "null_count": int(df[col].isna().sum())
-            }
-            
-            # Calculate null percentage
-            col_info["null_percentage"] = float(round((col_info["null_count"] / len(df)) * 100, 2))
-            
-            # Determine more specific data type and format
-            sample_values = df[col].dropna().head(3).tolist()
-            sample_values = [convert_numpy_types(val) for val in sample_values]
-            
-            if df[col].dtype == 'object':
-                # Check if string, dict, list, etc.
-                if len(sample_values) > 0:
-                    sample_type = type(sample_values[0]).__name__
-                    col_info["inferred_type"] = sample_type
-                    
-                    # For strings, add additional info
-                    if sample_type == 'str':
-                        col_info["max_length"] = int(df[col].str.len().max()) if not pd.isna(df[col].str.len().max()) else 0
-                        col_info["min_length"] = int(df[col].str.len().min()) if not pd.isna(df[col].str.len().min()) else 0
-                        
-                        # Check if it might be a date/time string
-                        date_pattern = float(df[col].str.match(r'^\d{4}-\d{2}-\d{2}').mean() > 0.7)
-                        time_pattern = float(df[col].str.match(r'\d{2}:\d{2}:\d{2}').mean() > 0.7)
-                        
-                        if date_pattern:
-                            col_info["potential_format"] = "date (YYYY-MM-DD)"
-                        elif time_pattern:
-                            col_info["potential_format"] = "time (HH:MM:SS)"
-                            
-                    # For nested structures (dict, list)
-                    elif sample_type in ('dict', 'list'):
-                        # Extract nested structure without values
-                        if sample_type == 'dict' and len(sample_values) > 0:
-                            sample_dict = sample_values[0]
-                            col_info["nested_structure"] = {k: type(v).__name__ for k, v in sample_dict.items()}
-                        elif sample_type == 'list' and len(sample_values) > 0:
-                            sample_list = sample_values[0]
-                            if len(sample_list) > 0 and isinstance(sample_list[0], dict):
-                                col_info["nested_structure"] = {k: type(v).__name__ for k, v in sample_list[0].items()}
-                            else:
-                                col_info["nested_structure"] = f"list of {type(sample_list[0]).__name__}" if sample_list else "empty list"
-            
-            elif pd.api.types.is_numeric_dtype(df[col]):
-                # For numeric columns
-                col_info["min"] = float(df[col].min())
-                col_info["max"] = float(df[col].max())
-                col_info["mean"] = float(df[col].mean())
-                
-                # Check if integer-like
-                if df[col].dropna().apply(lambda x: float(x).is_integer()).all():
-                    col_info["appears_integer"] = True
-                
-                # Check if it might be a categorical/code
-                if len(df[col].unique()) < 20:  # Arbitrary threshold
-                    col_info["unique_values_count"] = int(len(df[col].unique()))
-                    col_info["potential_categorical"] = True
-                    
-            elif pd.api.types.is_datetime64_dtype(df[col]):
-                # For datetime columns
-                col_info["min_date"] = str(df[col].min())
-                col_info["max_date"] = str(df[col].max())
-                col_info["date_range_days"] = int((df[col].max() - df[col].min()).days)
-            
-            # Add unique value count for all columns
-            col_info["unique_values"] = int(len(df[col].unique()))
-            col_info["is_unique"] = bool(col_info["unique_values"] == len(df))
-            
-            schema["columns"][col] = col_info
-            
-        return schema
+        return profile_data(df, sample_size=sample_size)
         
     except Exception as e:
         return {"error": f"Failed to extract schema: {str(e)}"}
@@ -470,22 +519,17 @@ def gather_relevant_information(agent_response: Dict[str, Any], user_input: str,
             function_results = {}
             agent_logs["functions_called"] = []
             
-            for func_call in agent_response["functions"]:
-                function_name = func_call["function_name"]
-                function_list.append(function_name)
-
-                parameters = func_call["parameters"]
-                func = getattr(functions, function_name, None)
-                
-                if not callable(func):
-                    raise AttributeError(f"Function '{function_name}' not found or not callable")
-                
-                result = func(**parameters)
+            # The functions are independent; run them concurrently and keep the requested order
+            calls = _resolve_function_calls(agent_response["functions"], functions, function_list)
+            outcomes = get_parallel_executor().run(calls, GATHER_CALL_TIMEOUT_SECONDS)
+            for (function_name, _, parameters), outcome in zip(calls, outcomes):
+                result = _outcome_value(outcome, agent_logs)
                 print("result: ", result)
                 function_results[function_name] = result
                 agent_logs["functions_called"].append({
                     "function_name": function_name,
-                    "parameters": parameters
+                    "parameters": parameters,
+                    "elapsed_seconds": outcome.elapsed_seconds
                 })
             
             gathered_information = function_results
@@ -495,39 +539,53 @@ def gather_relevant_information(agent_response: Dict[str, Any], user_input: str,
             SQL_Command = agent_response["sql_command"]
             agent_logs["SQL_Command"] = SQL_Command
             # gathered_information = execute_sql_on_parquet(SQL_Command, "data/server_growth_trends.parquet")
-            gathered_information = execute_sql_on_parquet(SQL_Command, "data/00_all_normalized.parquet")
+            # Model-written SQL is streamed in batches and cut off at the row/byte/time limits
+            limited = execute_sql_on_parquet_limited(SQL_Command, "data/00_all_normalized.parquet")
+            gathered_information = limited.data
+            agent_logs["sql_truncated"] = limited.truncated
+            agent_logs["sql_truncation_reason"] = limited.reason
+            agent_logs["sql_elapsed_seconds"] = limited.elapsed_seconds
 
     elif response_type == "mixed_data_gathering":
         with st.spinner("Gathering data from multiple sources..."):
             mixed_results = {"function_results": {}, "sql_results": []}
             agent_logs["mixed_operations"] = {"functions": [], "sql_commands": []}
             
-            # Execute functions if present
-            if "functions" in agent_response:
-                for func_call in agent_response["functions"]:
-                    function_name = func_call["function_name"]
-                    function_list.append(function_name)
-
-                    parameters = func_call["parameters"]
-                    func = getattr(functions, function_name, None)
-                    
-                    if not callable(func):
-                        raise AttributeError(f"Function '{function_name}' not found or not callable")
-                    
-                    result = func(**parameters)
-                    print("result: ", result)
-                    mixed_results["function_results"][function_name] = result
-                    agent_logs["mixed_operations"]["functions"].append({
-                        "function_name": function_name,
-                        "parameters": parameters
-                    })
+            # Functions and SQL commands run as one concurrent batch; results keep the requested order
+            function_calls = _resolve_function_calls(agent_response.get("functions", []), functions, function_list)
+            sql_commands = agent_response.get("sql_commands", [])
+            sql_calls = [
+                (f"sql_commands[{index}]", execute_sql_on_parquet_limited, {
+                    "sql_query": sql_command,
+                    "parquet_file_path": "data/server_growth_trends.parquet",
+                    "time_budget_seconds": GATHER_SQL_TIME_BUDGET_SECONDS,
+                })
+                for index, sql_command in enumerate(sql_commands)
+            ]
+            outcomes = get_parallel_executor().run(function_calls + sql_calls, GATHER_CALL_TIMEOUT_SECONDS)
+            
+            for (function_name, _, parameters), outcome in zip(function_calls, outcomes):
+                result = _outcome_value(outcome, agent_logs)
+                print("result: ", result)
+                mixed_results["function_results"][function_name] = result
+                agent_logs["mixed_operations"]["functions"].append({
+                    "function_name": function_name,
+                    "parameters": parameters,
+                    "elapsed_seconds": outcome.elapsed_seconds
+                })
             
-            # Execute SQL commands if present
-            if "sql_commands" in agent_response:
-                for sql_command in agent_response["sql_commands"]:
-                    result = execute_sql_on_parquet(sql_command, "data/server_growth_trends.parquet")
-                    mixed_results["sql_results"].append(result)
-                    agent_logs["mixed_operations"]["sql_commands"].append(sql_command)
+            for sql_command, outcome in zip(sql_commands, outcomes[len(function_calls):]):
+                limited = _outcome_value(outcome, agent_logs)
+                if outcome.timed_out:
+                    mixed_results["sql_results"].append(pd.DataFrame())
+                    agent_logs["sql_truncated"] = True
+                    agent_logs["sql_truncation_reason"] = "time_budget"
+                else:
+                    mixed_results["sql_results"].append(limited.data.to_pandas())
+                    if limited.truncated:
+                        agent_logs["sql_truncated"] = True
+                        agent_logs["sql_truncation_reason"] = limited.reason
+                agent_logs["mixed_operations"]["sql_commands"].append(sql_command)
             
             gathered_information = mixed_results
 
@@ -536,7 +594,10 @@ def gather_relevant_information(agent_response: Dict[str, Any], user_input: str,
             gathered_information = agent_response
             SQL_Command = gathered_information["sql_command"]
             agent_logs["SQL_Command"] = SQL_Command
-            gathered_information = execute_sql_on_parquet(SQL_Command, "data/server_growth_trends.parquet")
+            limited = execute_sql_on_parquet_limited(SQL_Command, "data/server_growth_trends.parquet")
+            gathered_information = limited.data
+            agent_logs["sql_truncated"] = limited.truncated
+            agent_logs["sql_truncation_reason"] = limited.reason
 
     elif response_type == "no_additional_info":
         with st.spinner("Preparing response..."):
@@ -566,6 +627,10 @@ def gather_relevant_information(agent_response: Dict[str, Any], user_input: str,
     print(f"!!!gathered_information: {gathered_information}")
     # Extract schema after DataFrame conversion
     alias_gathered_information = extract_data_schema(gathered_information)
+    if agent_logs.get("sql_truncated") and isinstance(alias_gathered_information, dict):
+        # Let the response generator tell the user the result is partial
+        alias_gathered_information["truncated"] = True
+        alias_gathered_information["truncation_reason"] = agent_logs.get("sql_truncation_reason")
 
     # gathered_information = convert_to_dataframe(gathered_information)
 
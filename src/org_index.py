@@ -0,0 +1,248 @@
+"""
+Materialised organisational hierarchy with transitive server-ownership rollups.
+
+The org tree from the static data is resolved once into each person's ordered
+list of (direct and indirect) subordinates. Server counts are then rolled up
+the tree so that a manager's ownership summary is a dictionary lookup.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Sections of organizational_structure that hold people, in lookup priority order
+PERSON_SECTIONS = ("team_leads", "individual_contributors")
+# Org details joined onto each server owner
+OWNER_DETAIL_FIELDS = ("title", "team", "department", "email", "phone", "reports_to", "seniority")
+OWNER_SORT_KEYS = ("name", "server_count", "team", "title")
+
+
+class OrgTree:
+    """
+    People and reporting lines, independent of server ownership.
+
+    A person is found in the senior manager entry first, then team leads,
+    then individual contributors. subordinates(name) lists everyone reachable
+    through "manages" in depth-first order (each person once, cycles ignored).
+    """
+
+    def __init__(self, org_structure: Dict[str, Any]):
+        """
+        Args:
+            org_structure (dict): organizational_structure from the static data
+        """
+        self.org_structure = org_structure
+        self.people: Dict[str, Dict[str, Any]] = {}
+        self.person_keys: Dict[str, str] = {}
+        # People whose "manages" list is followed when they are someone's subordinate
+        managed_info: Dict[str, Dict[str, Any]] = {}
+
+        senior = org_structure.get("senior_infrastructure_manager", {}) or {}
+        if senior.get("name"):
+            self.people[senior["name"]] = senior
+            self.person_keys[senior["name"]] = "senior_infrastructure_manager"
+        for section in PERSON_SECTIONS:
+            for key, person in (org_structure.get(section, {}) or {}).items():
+                name = person.get("name")
+                if not name:
+                    continue
+                self.people.setdefault(name, person)
+                self.person_keys.setdefault(name, f"{section}.{key}")
+                managed_info.setdefault(name, person)
+
+        self._subordinates: Dict[str, Tuple[str, ...]] = {}
+        for name, person in self.people.items():
+            self._subordinates[name] = self._closure(name, person.get("manages") or [], managed_info)
+
+    def _closure(self, name: str, manages: List[str], managed_info: Dict[str, Dict[str, Any]]) -> Tuple[str, ...]:
+        """Depth-first list of everyone reachable from a person's "manages" list."""
+        ordered: List[str] = []
+        seen = {name}
+        stack = list(reversed(manages))
+        while stack:
+            subordinate = stack.pop()
+            if subordinate in seen:
+                continue
+            seen.add(subordinate)
+            ordered.append(subordinate)
+            info = managed_info.get(subordinate)
+            if info and info.get("manages"):
+                stack.extend(reversed(info["manages"]))
+        return tuple(ordered)
+
+    def person(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return a person's org entry, or None."""
+        return self.people.get(name)
+
+    def subordinates(self, name: str) -> Tuple[str, ...]:
+        """Everyone a person manages directly or indirectly, depth-first."""
+        return self._subordinates.get(name, ())
+
+
+class OrgIndex:
+    """
+    Org tree joined with server ownership, with per-person rollups precomputed.
+
+    rollup(name) returns the direct and subordinate server counts without
+    walking the tree or the server list. An index is never modified once
+    built: with_servers() builds a new one over new ownership data, reusing
+    the resolved tree and recomputing the rollups.
+    """
+
+    def __init__(self, tree: OrgTree, servers_by_owner: Dict[str, List[str]]):
+        """
+        Args:
+            tree (OrgTree): The resolved org tree
+            servers_by_owner (dict): Owner name -> server names, in inventory order
+        """
+        self.tree = tree
+        self.servers_by_owner = {owner: list(servers) for owner, servers in servers_by_owner.items()}
+        self._owner_table = None
+        self._subordinate_servers: Dict[str, int] = {}
+        for name in tree.people:
+            self._subordinate_servers[name] = sum(
+                len(self.servers_by_owner.get(subordinate, ())) for subordinate in tree.subordinates(name)
+            )
+
+    @classmethod
+    def from_static_data(cls, static_data: Dict[str, Any], servers_by_owner: Dict[str, List[str]]) -> "OrgIndex":
+        """Build the tree and the ownership rollups from the static data."""
+        return cls(OrgTree(static_data.get("organizational_structure", {}) or {}), servers_by_owner)
+
+    def with_servers(self, servers_by_owner: Dict[str, List[str]]) -> "OrgIndex":
+        """Return an index over new ownership data that reuses this index's tree."""
+        return OrgIndex(self.tree, servers_by_owner)
+
+    def person(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return a person's org entry, or None."""
+        return self.tree.person(name)
+
+    def rollup(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a person's ownership counts.
+
+        Returns:
+            dict: direct_servers, subordinate_servers, total_servers and people_managed,
+                  or None if the person is not in the org structure
+        """
+        if name not in self.tree.people:
+            return None
+        direct = len(self.servers_by_owner.get(name, ()))
+        subordinate = self._subordinate_servers.get(name, 0)
+        return {
+            "direct_servers": direct,
+            "subordinate_servers": subordinate,
+            "total_servers": direct + subordinate,
+            "people_managed": len(self.tree.subordinates(name)),
+        }
+
+    def servers_by_subordinate(self, name: str) -> Dict[str, List[str]]:
+        """Servers of each subordinate that owns any, in depth-first order."""
+        return {
+            subordinate: list(self.servers_by_owner[subordinate])
+            for subordinate in self.tree.subordinates(name)
+            if self.servers_by_owner.get(subordinate)
+        }
+
+    def owners(self) -> Iterable[str]:
+        """Names of everyone who owns at least one server."""
+        return self.servers_by_owner.keys()
+
+    def owner_table(self) -> "OwnerTable":
+        """Return the server-owner roll-up table, building it on first use."""
+        if self._owner_table is None:
+            self._owner_table = OwnerTable(self)
+        return self._owner_table
+
+
+class OwnerTable:
+    """
+    One row per server owner, joined once with the org details.
+
+    Each sort order is computed on first use and kept, so listing a page of
+    owners is a slice of a cached order rather than a sort of every owner.
+    Owners appear in the order their first server appears in the inventory;
+    sorts are stable on that order.
+    """
+
+    def __init__(self, org_index: OrgIndex):
+        """
+        Args:
+            org_index (OrgIndex): Ownership data and the people index to join with
+        """
+        self.names: List[str] = list(org_index.owners())
+        self.servers: List[List[str]] = [org_index.servers_by_owner[name] for name in self.names]
+        self.counts: List[int] = [len(servers) for servers in self.servers]
+        self.details: List[Dict[str, Any]] = []
+        for name in self.names:
+            person = org_index.person(name) or {}
+            self.details.append({field: person.get(field, "Unknown") for field in OWNER_DETAIL_FIELDS})
+        self.total_servers = sum(self.counts)
+        self._orders: Dict[Tuple[str, bool], List[int]] = {}
+        self._team_breakdowns: Dict[Tuple[str, bool], Dict[str, Dict[str, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def _order_key(sort_by: str, include_details: bool) -> Tuple[str, bool]:
+        if sort_by not in OWNER_SORT_KEYS:
+            sort_by = "name"
+        if sort_by in ("team", "title") and not include_details:
+            # Without details every owner sorts as unknown, i.e. keeps the base order
+            return "none", False
+        return sort_by, include_details and sort_by in ("team", "title")
+
+    def order(self, sort_by: str = "name", include_details: bool = True) -> List[int]:
+        """Row numbers in the requested order (cached per sort key)."""
+        key = self._order_key(sort_by, include_details)
+        order = self._orders.get(key)
+        if order is None:
+            rows = range(len(self.names))
+            if key[0] == "name":
+                order = sorted(rows, key=self.names.__getitem__)
+            elif key[0] == "server_count":
+                order = sorted(rows, key=self.counts.__getitem__, reverse=True)
+            elif key[0] in ("team", "title"):
+                field = key[0]
+                order = sorted(rows, key=lambda row: self.details[row][field])
+            else:
+                order = list(rows)
+            self._orders[key] = order
+        return order
+
+    def page(self, sort_by: str = "name", include_details: bool = True,
+             limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Build owner dicts for one page of the requested order.
+
+        Args:
+            sort_by (str): "name", "server_count", "team" or "title"
+            include_details (bool): Include the joined org details
+            limit (int, optional): Page size; all remaining owners when None
+            offset (int): Owners to skip
+
+        Returns:
+            list: Owner dicts with name, server_count, servers and optionally the details
+        """
+        order = self.order(sort_by, include_details)
+        offset = max(0, int(offset or 0))
+        rows = order[offset:] if limit is None else order[offset:offset + max(0, int(limit))]
+        owners = []
+        for row in rows:
+            owner = {"name": self.names[row], "server_count": self.counts[row], "servers": list(self.servers[row])}
+            if include_details:
+                owner.update(self.details[row])
+            owners.append(owner)
+        return owners
+
+    def team_breakdown(self, sort_by: str = "name") -> Dict[str, Dict[str, int]]:
+        """Owners and servers per team, with teams in order of first appearance in the sort order."""
+        key = self._order_key(sort_by, True)
+        breakdown = self._team_breakdowns.get(key)
+        if breakdown is None:
+            breakdown = {}
+            for row in self.order(sort_by, True):
+                team = breakdown.setdefault(self.details[row]["team"], {"owners": 0, "servers": 0})
+                team["owners"] += 1
+                team["servers"] += self.counts[row]
+            self._team_breakdowns[key] = breakdown
+        return {team: dict(totals) for team, totals in breakdown.items()}
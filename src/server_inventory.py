@@ -0,0 +1,225 @@
+"""
+Columnar in-memory copy of the static server inventory.
+
+Each server field is held as one NumPy array, so fleet-wide filters are
+evaluated as vectorized predicates and only the rows that are returned are
+turned back into dicts.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Column kinds
+BOOL = "bool"
+NUMBER = "number"
+OBJECT = "object"
+
+
+def _column_kind(values: List[Any]) -> str:
+    """Pick the storage kind for a field from its present values."""
+    if values and all(isinstance(value, bool) for value in values):
+        return BOOL
+    if values and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        return NUMBER
+    return OBJECT
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    """Object array holding values as-is (lists stay single elements)."""
+    column = np.empty(len(values), dtype=object)
+    for position, value in enumerate(values):
+        column[position] = value
+    return column
+
+
+class ServerInventory:
+    """
+    Servers stored column by column.
+
+    Numeric fields are float64 arrays with NaN where a server lacks the value
+    (so comparisons against a missing metric are simply False), boolean fields
+    are bool arrays, and everything else is an object array. A presence mask per
+    field records which servers actually have it, so projections return the
+    same keys the source rows had. Numeric columns also record which values
+    were ints and boolean columns which were null, so projections return the
+    source values unchanged (4 stays 4, null stays None).
+    """
+
+    def __init__(self, servers: List[Dict[str, Any]], memory_features_by_server: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            servers (list): Server rows from the static data
+            memory_features_by_server (dict, optional): Server name -> memory-byte features present
+        """
+        self.size = len(servers)
+        self.fields: List[str] = []
+        self.kinds: Dict[str, str] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._present: Dict[str, np.ndarray] = {}
+        self._truthy: Dict[str, np.ndarray] = {}
+        # Numeric columns: values that were ints in the source
+        self._integral: Dict[str, np.ndarray] = {}
+        # Boolean columns: values that were present but null
+        self._null: Dict[str, np.ndarray] = {}
+        self._groups: Dict[str, Dict[Any, List[int]]] = {}
+
+        for server in servers:
+            for field in server:
+                if field not in self.kinds:
+                    self.kinds[field] = OBJECT
+                    self.fields.append(field)
+        for field in self.fields:
+            present = np.fromiter((field in server for server in servers), dtype=bool, count=self.size)
+            raw = [server.get(field) for server in servers]
+            kind = _column_kind([value for value, has in zip(raw, present) if has and value is not None])
+            if kind == BOOL:
+                column = np.array([bool(value) for value in raw], dtype=bool)
+                self._null[field] = np.fromiter((value is None for value in raw), dtype=bool, count=self.size) & present
+            elif kind == NUMBER:
+                column = np.array([np.nan if value is None else value for value in raw], dtype=np.float64)
+                self._integral[field] = np.fromiter((isinstance(value, int) for value in raw), dtype=bool,
+                                                    count=self.size)
+            else:
+                column = _object_array(raw)
+            self.kinds[field] = kind
+            self._columns[field] = column
+            self._present[field] = present
+
+        # Server name -> row positions (normally exactly one)
+        self._positions_by_name: Dict[Any, List[int]] = {}
+        for position, name in enumerate(self.column("server")):
+            self._positions_by_name.setdefault(name, []).append(position)
+
+        # Derived column: memory-byte features per server
+        features = memory_features_by_server or {}
+        column = _object_array([features.get(name, []) for name in self.column("server")])
+        self._add_column("mem_byte_features_present", column, OBJECT, np.ones(self.size, dtype=bool))
+
+    @classmethod
+    def from_static_data(cls, static_data: Dict[str, Any]) -> "ServerInventory":
+        """Build the inventory from the static server data JSON."""
+        return cls(static_data.get("servers", []), static_data.get("memory_features_by_server", {}))
+
+    def _add_column(self, field: str, column: np.ndarray, kind: str, present: np.ndarray) -> None:
+        """Add a derived column; it is projected only when asked for by name."""
+        self.kinds[field] = kind
+        self._columns[field] = column
+        self._present[field] = present
+
+    def column(self, field: str) -> np.ndarray:
+        """Return a field's values for every server (NaN / None where absent)."""
+        column = self._columns.get(field)
+        return column if column is not None else _object_array([None] * self.size)
+
+    def present(self, field: str) -> np.ndarray:
+        """Return the mask of servers that have a field."""
+        present = self._present.get(field)
+        return present if present is not None else np.zeros(self.size, dtype=bool)
+
+    def truthy(self, field: str) -> np.ndarray:
+        """Return the mask of servers whose value for a field is truthy."""
+        cached = self._truthy.get(field)
+        if cached is None:
+            kind = self.kinds.get(field)
+            column = self.column(field)
+            if kind == BOOL:
+                cached = column & self.present(field)
+            elif kind == NUMBER:
+                cached = (column != 0) & ~np.isnan(column)
+            else:
+                cached = np.fromiter((bool(value) for value in column), dtype=bool, count=self.size)
+            self._truthy[field] = cached
+        return cached
+
+    def less_than(self, field: str, threshold: float) -> np.ndarray:
+        """Mask of servers whose numeric value is below a threshold (missing values never match)."""
+        return self._numeric(field) < threshold
+
+    def greater_than(self, field: str, threshold: float) -> np.ndarray:
+        """Mask of servers whose numeric value is above a threshold (missing values never match)."""
+        return self._numeric(field) > threshold
+
+    def _numeric(self, field: str) -> np.ndarray:
+        if self.kinds.get(field) != NUMBER:
+            return np.full(self.size, np.nan)
+        return self._columns[field]
+
+    def position_of(self, name: str) -> Optional[int]:
+        """Row position of a server by name (the first one if the name repeats), or None."""
+        positions = self._positions_by_name.get(name)
+        return positions[0] if positions else None
+
+    def group_positions(self, field: str) -> Dict[Any, List[int]]:
+        """
+        Row positions per distinct value of a field, in inventory order.
+
+        Servers without the field or with a falsy value are left out. Computed
+        once per field.
+        """
+        groups = self._groups.get(field)
+        if groups is None:
+            groups = {}
+            for position, (value, keep) in enumerate(zip(self.column(field).tolist(), self.truthy(field).tolist())):
+                if keep:
+                    groups.setdefault(value, []).append(position)
+            self._groups[field] = groups
+        return groups
+
+    def group_names(self, field: str) -> Dict[Any, List[str]]:
+        """Server names per distinct value of a field, e.g. servers by owner."""
+        names = self.column("server")
+        return {value: [names[position] for position in positions]
+                for value, positions in self.group_positions(field).items()}
+
+    def in_names(self, names: Iterable[str]) -> np.ndarray:
+        """Mask of servers whose name is in names."""
+        mask = np.zeros(self.size, dtype=bool)
+        positions = [position for name in names for position in self._positions_by_name.get(name, ())]
+        mask[positions] = True
+        return mask
+
+    def all(self) -> np.ndarray:
+        """Mask that selects every server."""
+        return np.ones(self.size, dtype=bool)
+
+    def positions(self, mask: np.ndarray) -> np.ndarray:
+        """Row positions selected by a mask, in inventory order."""
+        return np.flatnonzero(mask)
+
+    def project(self, positions: np.ndarray, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Materialise rows as dicts, one column at a time.
+
+        Args:
+            positions (ndarray): Row positions to return
+            fields (list, optional): Fields to include; defaults to every field of the
+                source rows. A field is only included for servers that have it.
+
+        Returns:
+            list: One dict per position
+        """
+        fields = [field for field in (fields or self.fields) if field in self.kinds]
+        rows: List[Dict[str, Any]] = [{} for _ in range(len(positions))]
+        for field in fields:
+            kind = self.kinds[field]
+            values = self._columns[field][positions]
+            present = self._present[field][positions].tolist()
+            if kind == NUMBER:
+                missing = np.isnan(values).tolist()
+                integral = self._integral[field][positions].tolist()
+                values = [None if gap else int(value) if whole else value
+                          for value, gap, whole in zip(values.tolist(), missing, integral)]
+            elif kind == BOOL:
+                nulls = self._null[field][positions].tolist()
+                values = [None if null else value for value, null in zip(values.tolist(), nulls)]
+            else:
+                values = values.tolist()
+            for row, value, has in zip(rows, values, present):
+                if has:
+                    row[field] = value
+        return rows
+
+    def count(self, mask: np.ndarray) -> int:
+        """Number of servers selected by a mask."""
+        return int(np.count_nonzero(mask))
@@ -0,0 +1,224 @@
+"""
+Hot-reloadable snapshots of the static server data.
+
+The JSON file is parsed into an immutable StaticDataSnapshot together with
+the indexes built from it (columnar inventory, org hierarchy). When the file
+changes, the new version is parsed and indexed on a background thread and
+then swapped in with a single reference assignment, so a call that holds a
+snapshot sees one consistent version from start to finish.
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.org_index import OrgIndex
+from src.server_inventory import ServerInventory
+
+DEFAULT_STATIC_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "static_server_data.json"
+)
+STATIC_DATA_FILENAME = "static_server_data.json"
+# Minimum seconds between two checks of the file's mtime/size
+CHECK_INTERVAL_SECONDS = 1.0
+
+EMPTY_STATIC_DATA = {"servers": [], "feature_coverage": {}, "memory_features_by_server": {}}
+
+
+class StaticDataSnapshot:
+    """One parsed version of the static data and the indexes built from it."""
+
+    def __init__(self, data: Dict[str, Any], version: int, fingerprint: Optional[Tuple[int, int]],
+                 source: str, previous: Optional["StaticDataSnapshot"] = None):
+        """
+        Args:
+            data (dict): The parsed JSON
+            version (int): Monotonic version number of this snapshot
+            fingerprint (tuple, optional): (mtime_ns, size) of the file it was read from
+            source (str): Path of the file
+            previous (StaticDataSnapshot, optional): Snapshot being replaced; its org tree
+                is reused if the organizational structure did not change
+        """
+        self.data = data
+        self.version = version
+        self.fingerprint = fingerprint
+        self.source = source
+        self.loaded_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self.inventory = ServerInventory.from_static_data(data)
+        servers_by_owner = self.inventory.group_names("owner")
+        org_structure = data.get("organizational_structure", {}) or {}
+        if previous is not None and previous.data.get("organizational_structure", {}) == org_structure:
+            self.org_index = previous.org_index.with_servers(servers_by_owner)
+        else:
+            self.org_index = OrgIndex.from_static_data(data, servers_by_owner)
+
+    def provenance(self) -> Dict[str, Any]:
+        """Version fields for the provenance block of function results."""
+        return {
+            "data_version": self.version,
+            "data_loaded_at": self.loaded_at,
+            "data_available": self.fingerprint is not None,
+        }
+
+
+class StaticDataStore:
+    """
+    Serves the active snapshot of one static data file and reloads it when it changes.
+
+    The first load happens on the calling thread. After that, a changed
+    mtime/size (checked at most every CHECK_INTERVAL_SECONDS) starts a
+    background reload while callers keep getting the current snapshot. A file
+    that goes missing or fails to parse leaves the current snapshot in place;
+    only if nothing was ever loaded is an empty snapshot served.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATIC_DATA_PATH, check_interval: float = CHECK_INTERVAL_SECONDS):
+        """
+        Args:
+            path (str): Path of the static data JSON file
+            check_interval (float): Minimum seconds between file checks
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[StaticDataSnapshot] = None
+        self._reloading = False
+        self._last_check = 0.0
+        # Fingerprint of a file version that failed to load; not retried until the file changes again
+        self._failed_fingerprint: Optional[Tuple[int, int]] = None
+        self.last_error: Optional[str] = None
+
+    def _current_fingerprint(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the file, or None if it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _parse(self) -> Dict[str, Any]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _build(self, fingerprint: Optional[Tuple[int, int]], previous: Optional[StaticDataSnapshot]) -> Optional[StaticDataSnapshot]:
+        """Parse the file and build a snapshot; None (with last_error set) if that fails."""
+        version = previous.version + 1 if previous is not None else 1
+        if fingerprint is None:
+            self.last_error = f"Static data file not found: {self.path}"
+            return None
+        try:
+            data = self._parse()
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            self.last_error = f"Error loading static data: {str(e)}"
+            return None
+        self.last_error = None
+        return StaticDataSnapshot(data, version, fingerprint, self.path, previous)
+
+    def snapshot(self) -> StaticDataSnapshot:
+        """
+        Return the active snapshot; start a background reload if the file changed.
+
+        Returns:
+            StaticDataSnapshot: The snapshot to use for the whole of one call
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    fingerprint = self._current_fingerprint()
+                    self._snapshot = self._build(fingerprint, None) or StaticDataSnapshot(
+                        dict(EMPTY_STATIC_DATA), 1, None, self.path)
+                    self._last_check = time.monotonic()
+                return self._snapshot
+
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval and not self._reloading:
+            self._last_check = now
+            fingerprint = self._current_fingerprint()
+            if fingerprint is not None and fingerprint not in (snapshot.fingerprint, self._failed_fingerprint):
+                self._start_reload(fingerprint)
+        return snapshot
+
+    def _start_reload(self, fingerprint: Tuple[int, int]) -> None:
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, args=(fingerprint,), name="static-data-reload", daemon=True).start()
+
+    def _reload(self, fingerprint: Tuple[int, int]) -> None:
+        try:
+            # Parse and index outside the lock; callers keep using the current snapshot meanwhile
+            snapshot = self._build(fingerprint, self._snapshot)
+            with self._lock:
+                if snapshot is None:
+                    self._failed_fingerprint = fingerprint
+                elif self._snapshot is None or snapshot.version > self._snapshot.version:
+                    # Publish the fully indexed snapshot in one step, unless a refresh() got there first
+                    self._snapshot = snapshot
+        finally:
+            self._reloading = False
+
+    def refresh(self) -> StaticDataSnapshot:
+        """Reload the file on the calling thread regardless of its fingerprint."""
+        with self._lock:
+            snapshot = self._build(self._current_fingerprint(), self._snapshot)
+            if snapshot is not None:
+                self._snapshot = snapshot
+            elif self._snapshot is None:
+                self._snapshot = StaticDataSnapshot(dict(EMPTY_STATIC_DATA), 1, None, self.path)
+            return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Version of the active snapshot; increases with every successful reload."""
+        return self.snapshot().version
+
+
+# Global store instances shared by every session in the process, one per data file
+_static_data_stores: Dict[str, StaticDataStore] = {}
+# Run directory (absolute path) -> the store for its data file, fixed once the directory is first seen with one
+_run_dir_stores: Dict[str, StaticDataStore] = {}
+_static_data_stores_lock = threading.Lock()
+
+
+def _store_for_path(path: str) -> StaticDataStore:
+    store = _static_data_stores.get(path)
+    if store is None:
+        with _static_data_stores_lock:
+            store = _static_data_stores.get(path)
+            if store is None:
+                store = StaticDataStore(path)
+                _static_data_stores[path] = store
+    return store
+
+
+def get_static_data_store(run_dir: Optional[str] = None) -> StaticDataStore:
+    """
+    Return the store for a run directory's static data file, or for the default file.
+
+    A run_dir is bound to its own store the first time it is seen containing
+    static_server_data.json, and keeps that store from then on: if the file
+    later goes missing or is briefly absent while being rewritten, the store
+    keeps serving its last good snapshot rather than switching to other data.
+    A run_dir that has never held the file is served the default
+    data/static_server_data.json.
+    """
+    if run_dir:
+        directory = os.path.abspath(run_dir)
+        store = _run_dir_stores.get(directory)
+        if store is None and os.path.isfile(os.path.join(directory, STATIC_DATA_FILENAME)):
+            store = _store_for_path(os.path.join(directory, STATIC_DATA_FILENAME))
+            with _static_data_stores_lock:
+                store = _run_dir_stores.setdefault(directory, store)
+        if store is not None:
+            return store
+    return _store_for_path(DEFAULT_STATIC_DATA_PATH)
+
+
+def get_static_snapshot(run_dir: Optional[str] = None) -> StaticDataSnapshot:
+    """Return the active static data snapshot for a run directory (or the default file)."""
+    return get_static_data_store(run_dir).snapshot()
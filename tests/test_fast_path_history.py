@@ -0,0 +1,47 @@
+"""The agent's prompt must reach the model after turns answered without the agent."""
+
+import pytest
+from pydantic_ai.messages import ModelRequest, ModelResponse, SystemPromptPart, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from Basic_Pydantic_AI_Agent.src.agent import AgentDeps
+from agents.fast_path import FAST_PATH_MODEL_NAME, RESPONSE_CACHE_MODEL_NAME, get_fast_path_router, local_turn
+from agents.registry import build_user_friendly_agent
+from utils.conversation_memory import ConversationMemory
+from utils.system_prompts import convert_to_user_friendly_response_prompt
+
+
+def _prompt_text(messages):
+    """Instructions and system prompt parts of every request sent to the model."""
+    texts = []
+    for message in messages:
+        if isinstance(message, ModelRequest):
+            if message.instructions:
+                texts.append(message.instructions)
+            texts.extend(part.content for part in message.parts if isinstance(part, SystemPromptPart))
+    return "\n".join(texts)
+
+
+@pytest.mark.parametrize("model_name", [FAST_PATH_MODEL_NAME, RESPONSE_CACHE_MODEL_NAME])
+def test_prompt_sent_after_local_turn(model_name):
+    requests = []
+
+    def respond(messages, info: AgentInfo) -> ModelResponse:
+        requests.append(list(messages))
+        return ModelResponse(parts=[TextPart(content="Where would you like to travel from?")])
+
+    agent = build_user_friendly_agent(FunctionModel(respond))
+
+    # First turn of the session is answered locally, as main.py records it
+    decision = get_fast_path_router().route("hello")
+    assert decision.handled
+    history = local_turn("hello", decision.response, model_name)
+    assert not _prompt_text(history)
+
+    # Second turn goes to the agent with the prepared history
+    memory = ConversationMemory()
+    deps = AgentDeps(http_client=None, user_information={"name": "Test User"}, ticket_state={})
+    agent.run_sync("I want to book a ticket", deps=deps, message_history=memory.prepare(history))
+
+    assert requests
+    assert convert_to_user_friendly_response_prompt().strip() in _prompt_text(requests[-1])
@@ -0,0 +1,34 @@
+"""Numbers the parser cannot turn into a filter must keep a message off the fast path."""
+
+import pytest
+
+from agents.fast_path import FastPathRouter
+from utils.schedule_intent import parse_schedule_query
+
+
+@pytest.mark.parametrize("text", [
+    "Katsina to Enugu before 6",
+    "Port Harcourt to Akure after 23",
+    "Katsina to Enugu at 8",
+])
+def test_bare_hour_goes_to_agent(text):
+    decision = FastPathRouter().route(text)
+    assert not decision.handled
+    assert (decision.route, decision.reason) == ("agent", "unparsed_number")
+
+
+@pytest.mark.parametrize("text", [
+    "Katsina to Enugu after 8am",
+    "Katsina to Enugu before 18:30",
+    "Katsina to Enugu with 2 seats",
+])
+def test_numbers_parsed_as_filters_stay_on_fast_path(text):
+    decision = FastPathRouter().route(text)
+    assert decision.handled
+    assert decision.route == "schedule"
+
+
+def test_bare_hour_kept_in_intent_key():
+    after_six = parse_schedule_query("cheapest bus Katsina to Enugu after 6")
+    after_nine = parse_schedule_query("cheapest bus Katsina to Enugu after 9")
+    assert after_six.key() != after_nine.key()
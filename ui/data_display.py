@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
 from typing import Any
 
 def to_items_wide(df_items: pd.DataFrame) -> pd.DataFrame:
@@ -44,6 +45,10 @@ def render_payload(gathered_relevant_information: Any) -> None:
     if isinstance(gathered_relevant_information, pd.DataFrame):
         df = gathered_relevant_information
 
+    elif isinstance(gathered_relevant_information, pa.Table):
+        # SQL results stay in Arrow until they are actually displayed
+        df = gathered_relevant_information.to_pandas()
+
     elif isinstance(gathered_relevant_information, list):
         # assume list of dicts; flatten to columns
         import json  # Import here since we might use it below for string conversion
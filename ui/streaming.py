@@ -0,0 +1,151 @@
+"""Buffered rendering of streamed model output for the Bus 54 Ticketing Assistant."""
+
+import time
+from typing import Any, Dict, Iterable, Optional
+
+# Minimum time between two renders of the growing response
+FLUSH_INTERVAL_SECONDS = 0.05
+# Render once this many characters are pending...
+FLUSH_CHARS = 200
+# ...or once pending text reaches this fraction of what is already on screen
+FLUSH_GROWTH = 0.25
+# Upper bound on the share of wall-clock time spent re-rendering
+MAX_RENDER_SHARE = 0.2
+# Appended to the partial response while it is still streaming
+CURSOR = "▌"
+
+
+class StreamingRenderer:
+    """
+    Coalesces streamed text deltas into a bounded number of placeholder renders.
+
+    Each render re-draws the whole response, so rendering on every delta costs
+    O(n²) over a long answer. Here a render happens only when pending text
+    reaches a budget that grows with the rendered length (so size-triggered
+    renders add up to O(n)), or when the flush interval has passed and the
+    previous renders have used less than MAX_RENDER_SHARE of the elapsed time.
+    Time to first token and throughput are recorded along the way.
+    """
+
+    def __init__(self, placeholder, flush_interval: float = FLUSH_INTERVAL_SECONDS,
+                 flush_chars: int = FLUSH_CHARS, flush_growth: float = FLUSH_GROWTH,
+                 max_render_share: float = MAX_RENDER_SHARE, cursor: str = CURSOR):
+        """
+        Args:
+            placeholder: Streamlit element to render into (e.g. st.empty())
+            flush_interval (float): Minimum seconds between time-triggered renders
+            flush_chars (int): Pending characters that always trigger a render
+            flush_growth (float): Pending text, as a fraction of the rendered text, that triggers a render
+            max_render_share (float): Maximum share of elapsed time spent rendering
+            cursor (str): Suffix shown while streaming
+        """
+        self.placeholder = placeholder
+        self.flush_interval = flush_interval
+        self.flush_chars = flush_chars
+        self.flush_growth = flush_growth
+        self.max_render_share = max_render_share
+        self.cursor = cursor
+
+        self._parts = []
+        self._length = 0
+        self._rendered_length = 0
+        self._started = None
+        self._first_token_at = None
+        self._finished_at = None
+        self._last_render_at = 0.0
+        self._render_seconds = 0.0
+        self.deltas = 0
+        self.renders = 0
+
+    @property
+    def text(self) -> str:
+        """The full text received so far."""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def start(self) -> None:
+        """Start the clock; call right before the request is sent."""
+        self._started = time.perf_counter()
+        self._last_render_at = self._started
+
+    def add(self, delta: str) -> None:
+        """Buffer a delta and render if the time or size budget allows."""
+        if self._started is None:
+            self.start()
+        if not delta:
+            return
+        now = time.perf_counter()
+        if self._first_token_at is None:
+            self._first_token_at = now
+        self._parts.append(delta)
+        self._length += len(delta)
+        self.deltas += 1
+
+        pending = self._length - self._rendered_length
+        size_budget = max(self.flush_chars, int(self._rendered_length * self.flush_growth))
+        elapsed = now - self._started
+        time_due = (now - self._last_render_at >= self.flush_interval
+                    and self._render_seconds <= elapsed * self.max_render_share)
+        if pending >= size_budget or time_due:
+            self._render(self.text + self.cursor)
+
+    def _render(self, content: str) -> None:
+        started = time.perf_counter()
+        self.placeholder.markdown(content)
+        finished = time.perf_counter()
+        self._render_seconds += finished - started
+        self._last_render_at = finished
+        self._rendered_length = self._length
+        self.renders += 1
+
+    def consume(self, deltas: Iterable[str]) -> str:
+        """Render every delta from an iterable and return the full text."""
+        for delta in deltas:
+            self.add(delta)
+        return self.finish()
+
+    def finish(self, show_final: bool = False) -> str:
+        """
+        Stop the clock and return the full text.
+
+        Args:
+            show_final (bool): Render the complete text without the cursor
+
+        Returns:
+            str: The full response text
+        """
+        self._finished_at = time.perf_counter()
+        text = self.text
+        if show_final:
+            self._render(text)
+        return text
+
+    def metrics(self, output_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Return streaming metrics.
+
+        Args:
+            output_tokens (int, optional): Exact output token count from the model's usage;
+                the number of deltas is used as an approximation when not given
+
+        Returns:
+            dict: ttft_seconds, total_seconds, tokens, tokens_per_second, chars, deltas,
+                  renders and render_seconds
+        """
+        if self._started is None:
+            return {}
+        end = self._finished_at or time.perf_counter()
+        tokens = output_tokens if output_tokens else self.deltas
+        ttft = (self._first_token_at - self._started) if self._first_token_at is not None else None
+        generation_seconds = (end - self._first_token_at) if self._first_token_at is not None else 0.0
+        return {
+            "ttft_seconds": round(ttft, 4) if ttft is not None else None,
+            "total_seconds": round(end - self._started, 4),
+            "tokens": tokens,
+            "tokens_per_second": round(tokens / generation_seconds, 2) if generation_seconds > 0 else None,
+            "chars": self._length,
+            "deltas": self.deltas,
+            "renders": self.renders,
+            "render_seconds": round(self._render_seconds, 4),
+        }
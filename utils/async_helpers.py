@@ -1,8 +1,151 @@
 """Async utilities for handling event loops in the Absa Chatbot."""
 
 import asyncio
+import atexit
 import concurrent.futures
-from typing import Callable, Any, Tuple
+import queue
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, Tuple
+
+# Seconds to wait for the loop thread to finish on shutdown
+LOOP_SHUTDOWN_TIMEOUT_SECONDS = 5.0
+
+# Markers passed from the loop thread to a stream() consumer
+_STREAM_DONE = object()
+_STREAM_ERROR = object()
+
+
+class BackgroundEventLoop:
+    """
+    One long-lived asyncio event loop running in a dedicated daemon thread.
+
+    Streamlit reruns the script on its own thread for every interaction;
+    submitting coroutines here instead of calling asyncio.run keeps a single
+    loop alive across turns, so loop-bound resources such as the pooled HTTP
+    client and its keep-alive connections are reused. Coroutines run on the
+    loop thread and must not call Streamlit; results and stream items are
+    handed back to the calling (UI) thread.
+    """
+
+    def __init__(self, name: str = "background-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _run(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, starting its thread on first use."""
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    ready = threading.Event()
+                    self._thread = threading.Thread(target=self._run, args=(ready,), name=self.name, daemon=True)
+                    self._thread.start()
+                    ready.wait()
+        return self._loop
+
+    def submit(self, coroutine: Awaitable) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop.
+
+        Args:
+            coroutine: The coroutine to run
+
+        Returns:
+            concurrent.futures.Future: Future for the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and block until it returns."""
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stream(self, async_iterable: AsyncIterator) -> Iterator:
+        """
+        Iterate an async generator on the loop, yielding its items on the calling thread.
+
+        Items are yielded as soon as they are produced. If the caller stops
+        iterating early (or the script is interrupted), the producer is cancelled.
+
+        Args:
+            async_iterable: The async iterator to consume
+
+        Yields:
+            The items produced by async_iterable
+        """
+        items: "queue.Queue[Tuple[Any, Any]]" = queue.Queue()
+
+        async def pump():
+            try:
+                async for item in async_iterable:
+                    items.put((item, None))
+            except BaseException as error:
+                items.put((_STREAM_ERROR, error))
+                if isinstance(error, asyncio.CancelledError):
+                    raise
+            else:
+                items.put((_STREAM_DONE, None))
+            finally:
+                aclose = getattr(async_iterable, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item, error = items.get()
+                if item is _STREAM_DONE:
+                    return
+                if item is _STREAM_ERROR:
+                    if isinstance(error, asyncio.CancelledError):
+                        raise concurrent.futures.CancelledError() from error
+                    raise error
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread to exit."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is not None and thread is not None and thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(LOOP_SHUTDOWN_TIMEOUT_SECONDS)
+
+
+# Global background loop shared by every session in the process
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Return the process-wide background event loop, creating it on first use."""
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                _background_loop = BackgroundEventLoop()
+                atexit.register(_background_loop.stop)
+    return _background_loop
 
 
 async def run_async_safely(async_func: Callable) -> Any:
@@ -37,7 +180,7 @@ async def run_async_safely(async_func: Callable) -> Any:
 
 def run_async_in_streamlit(async_func: Callable) -> Any:
     """
-    Run an async function in a Streamlit context with proper event loop handling.
+    Run an async function in a Streamlit context on the persistent background loop.
     
     Args:
         async_func: The async function to run
@@ -46,20 +189,6 @@ def run_async_in_streamlit(async_func: Callable) -> Any:
         The result of the async function
     """
     try:
-        # Try to get existing event loop
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is running, use ThreadPoolExecutor
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, async_func())
-                return future.result()
-        else:
-            # Loop is not running, safe to use asyncio.run
-            return asyncio.run(async_func())
-    except RuntimeError:
-        # Event loop is closed or other runtime error, create new one
-        try:
-            asyncio.set_event_loop(asyncio.new_event_loop())
-            return asyncio.run(async_func())
-        except Exception as e:
-            raise Exception(f"Failed to process request: {str(e)}")
+        return get_background_loop().run(async_func())
+    except Exception as e:
+        raise Exception(f"Failed to process request: {str(e)}")
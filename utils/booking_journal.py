@@ -0,0 +1,313 @@
+"""Append-only booking journal for the Bus 54 Ticketing Assistant."""
+
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Default journal directory, resolved relative to the project root
+DEFAULT_JOURNAL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "bookings",
+)
+
+# Roll over to a new segment once the active one reaches this size
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+# fsync after this many unsynced appends or this many seconds, whichever comes first
+FSYNC_EVERY_RECORDS = 16
+FSYNC_INTERVAL_SECONDS = 1.0
+# Compact sealed segments once there are more than this many of them
+COMPACT_AFTER_SEGMENTS = 8
+
+_SEGMENT_PATTERN = re.compile(r"^segment-(\d{8})\.jsonl$")
+
+
+class BookingJournal:
+    """
+    Segmented, append-only log of booking records with in-memory indexes.
+
+    Records are JSON lines appended to the active segment and are indexed by
+    ticket_id and customer_id as they are written, so lookups never touch the
+    disk. Writes are flushed immediately and fsynced in small batches. On
+    start-up the segments are replayed and a torn final line left by a crash
+    is truncated. Sealed segments are periodically compacted into one on a
+    background thread, keeping only the latest record for each ticket.
+    """
+
+    def __init__(self, journal_dir: str = DEFAULT_JOURNAL_DIR,
+                 segment_max_bytes: int = SEGMENT_MAX_BYTES,
+                 fsync_every_records: int = FSYNC_EVERY_RECORDS,
+                 fsync_interval_seconds: float = FSYNC_INTERVAL_SECONDS,
+                 compact_after_segments: int = COMPACT_AFTER_SEGMENTS):
+        """
+        Open the journal, replaying any existing segments.
+
+        Args:
+            journal_dir (str): Directory holding the segment files
+            segment_max_bytes (int): Size at which the active segment is sealed
+            fsync_every_records (int): Unsynced appends that trigger an fsync
+            fsync_interval_seconds (float): Age of the oldest unsynced append that triggers an fsync
+            compact_after_segments (int): Sealed segment count that triggers compaction
+        """
+        self.journal_dir = journal_dir
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_every_records = fsync_every_records
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self.compact_after_segments = compact_after_segments
+
+        self._lock = threading.Lock()
+        self._by_ticket: Dict[str, Dict[str, Any]] = {}
+        self._by_customer: Dict[str, List[str]] = {}
+        self._segments: List[int] = []
+        self._active = None
+        self._active_size = 0
+        self._unsynced = 0
+        self._first_unsynced_at = 0.0
+        self._sync_timer: Optional[threading.Timer] = None
+        # Serialises compactions, which run outside the append lock
+        self._compact_lock = threading.Lock()
+        self._compaction: Optional[threading.Thread] = None
+
+        os.makedirs(self.journal_dir, exist_ok=True)
+        self._replay()
+        self._open_active()
+
+    # ------------------------------------------------------------------
+    # Segment handling
+    # ------------------------------------------------------------------
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.journal_dir, f"segment-{number:08d}.jsonl")
+
+    def _replay(self) -> None:
+        """Rebuild the indexes from the segments on disk."""
+        numbers = []
+        for name in os.listdir(self.journal_dir):
+            match = _SEGMENT_PATTERN.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        numbers.sort()
+
+        for position, number in enumerate(numbers):
+            path = self._segment_path(number)
+            good_bytes = 0
+            with open(path, "rb") as segment:
+                for line in segment:
+                    if not line.endswith(b"\n"):
+                        # Torn write from a crash; only possible at the end of the file
+                        break
+                    good_bytes += len(line)
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._index(record)
+            if position == len(numbers) - 1 and good_bytes != os.path.getsize(path):
+                with open(path, "r+b") as segment:
+                    segment.truncate(good_bytes)
+
+        self._segments = numbers
+
+    def _open_active(self) -> None:
+        """Open the newest segment for appending, creating one if needed."""
+        if not self._segments:
+            self._segments.append(1)
+        path = self._segment_path(self._segments[-1])
+        self._active = open(path, "ab")
+        self._active_size = self._active.tell()
+
+    def _sync(self) -> None:
+        """fsync the active segment if it has unsynced appends."""
+        if self._unsynced and self._active is not None:
+            self._active.flush()
+            os.fsync(self._active.fileno())
+            self._unsynced = 0
+
+    def _roll_over(self) -> bool:
+        """Seal the active segment and start a new one; True if compaction is due."""
+        self._sync()
+        self._active.close()
+        self._segments.append(self._segments[-1] + 1)
+        self._open_active()
+        return len(self._segments) - 1 > self.compact_after_segments
+
+    def _start_compaction(self) -> None:
+        """Compact the sealed segments on a background thread unless one is already running."""
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+            self._compaction = threading.Thread(target=self._compact_sealed, name="booking-journal-compaction",
+                                                daemon=True)
+            self._compaction.start()
+
+    def _compact_sealed(self) -> None:
+        """
+        Merge all sealed segments into one holding the latest record per ticket.
+
+        Sealed segments are never written again, so they are read and merged
+        without holding the append lock; the lock is only taken to read and
+        update the segment list. The result replaces the newest sealed segment
+        and the older ones are removed afterwards, so a crash part-way through
+        leaves older segments that replay before the compacted one and are
+        superseded by it.
+        """
+        with self._compact_lock:
+            with self._lock:
+                sealed = self._segments[:-1]
+            if len(sealed) < 2:
+                return
+
+            latest: Dict[str, bytes] = {}
+            for number in sealed:
+                with open(self._segment_path(number), "rb") as segment:
+                    for line in segment:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        ticket_id = record.get("ticket_id")
+                        if ticket_id:
+                            # Keeps the ticket's original position, with its latest content
+                            latest[ticket_id] = line
+
+            target = self._segment_path(sealed[-1])
+            temp_path = target + ".compact"
+            with open(temp_path, "wb") as compacted:
+                compacted.writelines(latest.values())
+                compacted.flush()
+                os.fsync(compacted.fileno())
+            os.replace(temp_path, target)
+            with self._lock:
+                self._segments = [number for number in self._segments if number not in sealed[:-1]]
+            for number in sealed[:-1]:
+                os.remove(self._segment_path(number))
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        """Add a record to the in-memory indexes; later records replace earlier ones."""
+        ticket_id = record.get("ticket_id")
+        if not ticket_id:
+            return
+        customer_id = record.get("customer_id")
+        if ticket_id not in self._by_ticket and customer_id:
+            self._by_customer.setdefault(customer_id, []).append(ticket_id)
+        self._by_ticket[ticket_id] = record
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def append(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Append a booking record to the journal.
+
+        A record with an existing ticket_id supersedes the earlier one
+        (e.g. a status change).
+
+        Args:
+            record (dict): Booking data; must contain a ticket_id
+
+        Returns:
+            dict: The stored record
+        """
+        if not record.get("ticket_id"):
+            raise ValueError("Booking record requires a ticket_id")
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+
+        with self._lock:
+            self._active.write(line)
+            self._active.flush()
+            self._active_size += len(line)
+            if not self._unsynced:
+                self._first_unsynced_at = time.monotonic()
+            self._unsynced += 1
+            self._index(record)
+
+            if (self._unsynced >= self.fsync_every_records
+                    or time.monotonic() - self._first_unsynced_at >= self.fsync_interval_seconds):
+                self._sync()
+            compaction_due = self._active_size >= self.segment_max_bytes and self._roll_over()
+            if self._unsynced and self._sync_timer is None:
+                # Bound the time a record can stay unsynced when no further appends arrive
+                self._sync_timer = threading.Timer(self.fsync_interval_seconds, self._timed_sync)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+        if compaction_due:
+            self._start_compaction()
+        return record
+
+    def _timed_sync(self) -> None:
+        """Timer callback that fsyncs records left over from the last batch."""
+        with self._lock:
+            self._sync_timer = None
+            self._sync()
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """Return the latest record for a ticket, or None."""
+        record = self._by_ticket.get(ticket_id)
+        return dict(record) if record is not None else None
+
+    def find_by_customer(self, customer_id: str) -> List[Dict[str, Any]]:
+        """
+        Return a customer's bookings in the order they were made.
+
+        Args:
+            customer_id (str): The customer's identifier
+
+        Returns:
+            list: Booking records (copies)
+        """
+        ticket_ids = list(self._by_customer.get(customer_id, ()))
+        return [dict(self._by_ticket[ticket_id]) for ticket_id in ticket_ids]
+
+    def flush(self) -> None:
+        """Force all appended records to stable storage."""
+        with self._lock:
+            self._sync()
+
+    def compact(self) -> None:
+        """Seal the active segment and compact all sealed segments now."""
+        with self._lock:
+            self._roll_over()
+        self._compact_sealed()
+
+    def close(self) -> None:
+        """Wait for a running compaction, then fsync and close the active segment."""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            if self._active is not None:
+                self._sync()
+                self._active.close()
+                self._active = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return journal size counters."""
+        return {
+            "tickets": len(self._by_ticket),
+            "customers": len(self._by_customer),
+            "segments": len(self._segments),
+            "active_segment_bytes": self._active_size,
+            "unsynced_records": self._unsynced,
+        }
+
+
+# Global booking journal instance shared by every session in the process
+_booking_journal = None
+_booking_journal_lock = threading.Lock()
+
+
+def get_booking_journal() -> BookingJournal:
+    """Return the process-wide booking journal, opening it on first use."""
+    global _booking_journal
+    if _booking_journal is None:
+        with _booking_journal_lock:
+            if _booking_journal is None:
+                _booking_journal = BookingJournal()
+                atexit.register(_booking_journal.close)
+    return _booking_journal
@@ -0,0 +1,216 @@
+"""Bounded conversation memory for agent message history."""
+
+import json
+from dataclasses import replace
+from typing import Any, List, Optional
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+# Approximate token budget for the history sent with each run
+DEFAULT_TOKEN_BUDGET = 6_000
+# Most recent turns that are always sent verbatim (budget permitting)
+DEFAULT_KEEP_TURNS = 6
+# Tool returns larger than this are replaced by a stub once their turn is over
+MAX_TOOL_RETURN_CHARS = 2_000
+# Upper bound on the rolling summary of older turns
+MAX_SUMMARY_CHARS = 3_000
+# Characters kept from each user prompt / answer in the summary
+SUMMARY_PROMPT_CHARS = 200
+SUMMARY_ANSWER_CHARS = 300
+# Rough characters per token for budget estimates
+CHARS_PER_TOKEN = 4
+
+SUMMARY_HEADER = "Summary of the earlier conversation (older turns were compacted):"
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    try:
+        return json.dumps(content, default=str)
+    except (TypeError, ValueError):
+        return str(content)
+
+
+def estimate_tokens(messages: List[ModelMessage]) -> int:
+    """Estimate the tokens in a list of messages from their text length."""
+    chars = 0
+    for message in messages:
+        for part in message.parts:
+            if isinstance(part, ToolCallPart):
+                chars += len(part.tool_name) + len(_content_text(part.args))
+            else:
+                chars += len(_content_text(getattr(part, "content", "")))
+    return chars // CHARS_PER_TOKEN
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def split_turns(messages: List[ModelMessage]) -> List[List[ModelMessage]]:
+    """
+    Split a message history into turns, each starting at a user prompt.
+
+    A turn holds the user's request, the model responses and any tool
+    calls/returns up to the next user prompt, so cutting between turns
+    never separates a tool call from its return.
+    """
+    turns: List[List[ModelMessage]] = []
+    for message in messages:
+        starts_turn = isinstance(message, ModelRequest) and any(
+            isinstance(part, UserPromptPart) for part in message.parts
+        )
+        if starts_turn or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+class ConversationMemory:
+    """
+    Prepares the message history sent to the agent within a token budget.
+
+    The full history stays in the session for display; this only shapes what
+    the model sees. The last keep_turns turns are sent verbatim (oldest first
+    dropped if they exceed the budget), older turns are folded into a rolling
+    extractive summary carried as an extra system prompt part, and large tool
+    returns from finished turns are replaced by a short stub. The agent's
+    system prompt parts are always kept.
+    """
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, keep_turns: int = DEFAULT_KEEP_TURNS,
+                 max_tool_return_chars: int = MAX_TOOL_RETURN_CHARS, max_summary_chars: int = MAX_SUMMARY_CHARS):
+        """
+        Args:
+            token_budget (int): Approximate token budget for the prepared history
+            keep_turns (int): Most recent turns to keep verbatim
+            max_tool_return_chars (int): Tool returns above this size are stubbed in finished turns
+            max_summary_chars (int): Maximum length of the rolling summary
+        """
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.max_tool_return_chars = max_tool_return_chars
+        self.max_summary_chars = max_summary_chars
+        self._summary_lines: List[str] = []
+        self._summarized_turns = 0
+        self._history_length = 0
+
+    def reset(self) -> None:
+        """Forget the rolling summary (e.g. after the chat is cleared)."""
+        self._summary_lines = []
+        self._summarized_turns = 0
+        self._history_length = 0
+
+    @property
+    def summary(self) -> str:
+        """The rolling summary of compacted turns, or an empty string."""
+        if not self._summary_lines:
+            return ""
+        return "\n".join([SUMMARY_HEADER] + self._summary_lines)
+
+    def _summarize_turn(self, turn: List[ModelMessage]) -> None:
+        prompt, answer, tools = "", "", []
+        for message in turn:
+            for part in message.parts:
+                if isinstance(part, UserPromptPart) and not prompt:
+                    prompt = _content_text(part.content)
+                elif isinstance(part, TextPart):
+                    answer = part.content
+                elif isinstance(part, ToolCallPart) and part.tool_name not in tools:
+                    tools.append(part.tool_name)
+        line = f"- User: {_shorten(prompt, SUMMARY_PROMPT_CHARS)}"
+        if tools:
+            line += f" | Tools used: {', '.join(tools)}"
+        if answer:
+            line += f" | Assistant: {_shorten(answer, SUMMARY_ANSWER_CHARS)}"
+        self._summary_lines.append(line)
+        # Roll: drop the oldest lines once the summary outgrows its cap
+        while len(self._summary_lines) > 1 and len(self.summary) > self.max_summary_chars:
+            self._summary_lines.pop(0)
+
+    def _compact_tool_returns(self, turn: List[ModelMessage]) -> List[ModelMessage]:
+        compacted = []
+        for message in turn:
+            if isinstance(message, ModelRequest) and any(
+                isinstance(part, ToolReturnPart) and len(_content_text(part.content)) > self.max_tool_return_chars
+                for part in message.parts
+            ):
+                parts = []
+                for part in message.parts:
+                    if isinstance(part, ToolReturnPart):
+                        size = len(_content_text(part.content))
+                        if size > self.max_tool_return_chars:
+                            # Keep the part (and its tool_call_id) so the call still has a return
+                            part = replace(part, content=(
+                                f"[{part.tool_name} returned {size} characters; omitted from history. "
+                                f"Call the tool again if the data is needed.]"
+                            ))
+                    parts.append(part)
+                message = replace(message, parts=parts)
+            compacted.append(message)
+        return compacted
+
+    def prepare(self, history: List[ModelMessage]) -> Optional[List[ModelMessage]]:
+        """
+        Build the bounded message history for the next run.
+
+        Args:
+            history (list): The full, append-only message history
+
+        Returns:
+            list: Messages to pass as message_history, or None for an empty history
+        """
+        if not history:
+            self.reset()
+            return None
+        if len(history) < self._history_length:
+            # History was cleared or replaced; the summary no longer applies
+            self.reset()
+        self._history_length = len(history)
+
+        system_parts = [part for part in history[0].parts if isinstance(part, SystemPromptPart)] \
+            if isinstance(history[0], ModelRequest) else []
+        turns = split_turns(history)
+
+        # Turns outside the verbatim window are folded into the summary, once each
+        keep_from = max(len(turns) - self.keep_turns, 0)
+        while self._summarized_turns < keep_from:
+            self._summarize_turn(turns[self._summarized_turns])
+            self._summarized_turns += 1
+        kept = turns[max(keep_from, self._summarized_turns):]
+
+        # Every turn in history is finished (the current one is not in it yet), so none of them
+        # needs its large tool returns verbatim any more
+        kept = [self._compact_tool_returns(turn) for turn in kept]
+
+        def assemble(kept_turns):
+            header_parts = list(system_parts)
+            if self.summary:
+                header_parts.append(SystemPromptPart(content=self.summary))
+            messages = [message for turn in kept_turns for message in turn]
+            if messages and isinstance(messages[0], ModelRequest):
+                # Put the system parts back in front of the first kept request
+                first_parts = [part for part in messages[0].parts if not isinstance(part, SystemPromptPart)]
+                messages[0] = replace(messages[0], parts=header_parts + first_parts)
+            elif header_parts:
+                messages.insert(0, ModelRequest(parts=header_parts))
+            return messages
+
+        messages = assemble(kept)
+        while len(kept) > 1 and estimate_tokens(messages) > self.token_budget:
+            # Over budget: fold the oldest verbatim turn into the summary too
+            self._summarize_turn(kept.pop(0))
+            self._summarized_turns += 1
+            messages = assemble(kept)
+        return messages
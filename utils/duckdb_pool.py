@@ -0,0 +1,241 @@
+"""Pooled DuckDB connections for SQL over Parquet files."""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+
+# View name the data-gathering agent writes its SQL against
+DEFAULT_VIEW_NAME = "server_growth_trends"
+# Maximum number of cursors that may run queries against one data file at once
+MAX_CURSORS_PER_DATABASE = 8
+# Seconds to wait for a free cursor before giving up
+ACQUIRE_TIMEOUT_SECONDS = 30.0
+
+
+def ensure_read_only(sql_query: str) -> None:
+    """
+    Reject SQL that is not a single read-only query.
+
+    Every pooled cursor shares one database that lives for the whole process,
+    so a CREATE, DROP, SET or ATTACH run by one caller would change what every
+    later query sees (e.g. dropping the data view). Only a single SELECT
+    statement (including WITH ... SELECT, FROM-first and VALUES queries) is allowed.
+
+    Raises:
+        ValueError: If the text holds anything other than one SELECT statement
+        duckdb.ParserException: If the SQL cannot be parsed
+    """
+    statements = duckdb.extract_statements(sql_query)
+    if len(statements) != 1:
+        raise ValueError(f"Expected exactly one SQL statement, got {len(statements)}")
+    if statements[0].type != duckdb.StatementType.SELECT:
+        raise ValueError(f"Only read-only SELECT queries are allowed, got {statements[0].type.name}")
+
+
+class _ParquetDatabase:
+    """One long-lived in-memory DuckDB database with a view over a Parquet file."""
+
+    def __init__(self, parquet_file_path: str, view_name: str, max_cursors: int):
+        self.parquet_file_path = parquet_file_path
+        self.view_name = view_name
+        self.max_cursors = max_cursors
+        self.connection = duckdb.connect(database=":memory:")
+        # Cache Parquet footers/metadata between queries instead of re-reading them each time
+        self.connection.execute("SET enable_object_cache = true")
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_cursors)
+        self.idle: List[Any] = []
+        self.fingerprint: Optional[Tuple[int, int]] = None
+        self.generation = 0
+        self.stats = {
+            "cursors_created": 0,
+            "acquisitions": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "in_use": 0,
+            "peak_in_use": 0,
+            "timeouts": 0,
+            "view_refreshes": 0,
+        }
+        self.refresh_view()
+
+    def _current_fingerprint(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.parquet_file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def refresh_view(self, force: bool = False) -> None:
+        """(Re)create the view if the Parquet file changed since it was registered."""
+        fingerprint = self._current_fingerprint()
+        if not force and self.generation and fingerprint == self.fingerprint:
+            return
+        with self.lock:
+            if not force and self.generation and fingerprint == self.fingerprint:
+                return
+            escaped_path = self.parquet_file_path.replace("'", "''")
+            self.connection.execute(
+                f"CREATE OR REPLACE VIEW {self.view_name} AS SELECT * FROM read_parquet('{escaped_path}')"
+            )
+            self.fingerprint = fingerprint
+            self.generation += 1
+            self.stats["view_refreshes"] += 1
+
+    def acquire(self, timeout: float):
+        """Take a cursor from the pool, blocking while all cursors are busy."""
+        started = time.perf_counter()
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.stats["waits"] += 1
+            if not self.slots.acquire(timeout=timeout):
+                with self.lock:
+                    self.stats["timeouts"] += 1
+                raise TimeoutError(
+                    f"No DuckDB cursor available for '{self.parquet_file_path}' after {timeout:.1f}s"
+                )
+        with self.lock:
+            self.stats["wait_seconds"] += time.perf_counter() - started
+            self.stats["acquisitions"] += 1
+            self.stats["in_use"] += 1
+            self.stats["peak_in_use"] = max(self.stats["peak_in_use"], self.stats["in_use"])
+            if self.idle:
+                return self.idle.pop()
+            self.stats["cursors_created"] += 1
+            # cursor() opens a new connection to the same database, sharing its catalog and caches
+            return self.connection.cursor()
+
+    def release(self, cursor, discard: bool = False) -> None:
+        """Return a cursor to the pool."""
+        with self.lock:
+            self.stats["in_use"] -= 1
+            if discard:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            else:
+                self.idle.append(cursor)
+        self.slots.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self.lock:
+            metrics = dict(self.stats)
+            metrics["idle"] = len(self.idle)
+            metrics["max_cursors"] = self.max_cursors
+            metrics["view_generation"] = self.generation
+        metrics["wait_seconds"] = round(metrics["wait_seconds"], 6)
+        return metrics
+
+    def close(self) -> None:
+        with self.lock:
+            for cursor in self.idle:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            self.idle = []
+            self.connection.close()
+
+
+class DuckDBConnectionManager:
+    """
+    Keeps one long-lived DuckDB database per data file and hands out pooled cursors.
+
+    The view over the Parquet file is registered once per database and only
+    re-created when the file changes on disk, so repeated queries skip the
+    connection and view setup cost. Each cursor is used by one thread at a
+    time and the number of concurrent cursors per file is bounded. Because
+    the database is shared, callers must pass SQL through ensure_read_only()
+    before running it on a borrowed cursor.
+    """
+
+    def __init__(self, max_cursors_per_database: int = MAX_CURSORS_PER_DATABASE,
+                 acquire_timeout: float = ACQUIRE_TIMEOUT_SECONDS):
+        """
+        Initialize the manager.
+
+        Args:
+            max_cursors_per_database (int): Upper bound on concurrent cursors per data file
+            acquire_timeout (float): Seconds to wait for a free cursor
+        """
+        self.max_cursors_per_database = max_cursors_per_database
+        self.acquire_timeout = acquire_timeout
+        self._lock = threading.Lock()
+        self._databases: Dict[Tuple[str, str], _ParquetDatabase] = {}
+
+    def _database(self, parquet_file_path: str, view_name: str) -> _ParquetDatabase:
+        key = (os.path.abspath(parquet_file_path), view_name)
+        database = self._databases.get(key)
+        if database is None:
+            with self._lock:
+                database = self._databases.get(key)
+                if database is None:
+                    database = _ParquetDatabase(parquet_file_path, view_name, self.max_cursors_per_database)
+                    self._databases[key] = database
+        else:
+            database.refresh_view()
+        return database
+
+    @contextmanager
+    def cursor(self, parquet_file_path: str, view_name: str = DEFAULT_VIEW_NAME):
+        """
+        Borrow a cursor on the database for a Parquet file.
+
+        Args:
+            parquet_file_path (str): Path to the Parquet file
+            view_name (str): Name of the view registered over the file
+
+        Yields:
+            duckdb.DuckDBPyConnection: A cursor with the view available
+        """
+        database = self._database(parquet_file_path, view_name)
+        cursor = database.acquire(self.acquire_timeout)
+        discard = False
+        try:
+            yield cursor
+        except duckdb.Error:
+            # Don't hand a cursor in an unknown transaction state to the next caller
+            discard = True
+            raise
+        finally:
+            database.release(cursor, discard=discard)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return pool metrics for every registered data file.
+
+        Returns:
+            dict: Mapping of Parquet path to its pool counters
+        """
+        with self._lock:
+            databases = list(self._databases.items())
+        return {path if view == DEFAULT_VIEW_NAME else f"{path}::{view}": database.metrics()
+                for (path, view), database in databases}
+
+    def close_all(self) -> None:
+        """Close every pooled database and cursor."""
+        with self._lock:
+            databases = list(self._databases.values())
+            self._databases = {}
+        for database in databases:
+            database.close()
+
+
+# Global connection manager instance shared by every session in the process
+_duckdb_manager = None
+_duckdb_manager_lock = threading.Lock()
+
+
+def get_duckdb_manager() -> DuckDBConnectionManager:
+    """Return the process-wide DuckDB connection manager, creating it on first use."""
+    global _duckdb_manager
+    if _duckdb_manager is None:
+        with _duckdb_manager_lock:
+            if _duckdb_manager is None:
+                _duckdb_manager = DuckDBConnectionManager()
+    return _duckdb_manager
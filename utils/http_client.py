@@ -0,0 +1,162 @@
+"""Shared, pooled HTTP client for model and tool calls."""
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+# Connection pool limits
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+# Timeouts; reads are long because model responses stream for a while
+CONNECT_TIMEOUT_SECONDS = 10.0
+READ_TIMEOUT_SECONDS = 120.0
+WRITE_TIMEOUT_SECONDS = 30.0
+POOL_TIMEOUT_SECONDS = 10.0
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HttpClientManager:
+    """
+    Hands out one long-lived httpx.AsyncClient per event loop.
+
+    httpx connections belong to the loop they were opened on, so the client is
+    kept per loop; on the app's persistent loop that means a single client whose
+    keep-alive connections (HTTP/2 when available) are reused across turns and
+    shared by every model provider and tool.
+    """
+
+    def __init__(self,
+                 max_connections: int = MAX_CONNECTIONS,
+                 max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = KEEPALIVE_EXPIRY_SECONDS,
+                 connect_timeout: float = CONNECT_TIMEOUT_SECONDS,
+                 read_timeout: float = READ_TIMEOUT_SECONDS,
+                 write_timeout: float = WRITE_TIMEOUT_SECONDS,
+                 pool_timeout: float = POOL_TIMEOUT_SECONDS,
+                 http2: bool = True):
+        """
+        Initialize the manager.
+
+        Args:
+            max_connections (int): Maximum open connections per client
+            max_keepalive_connections (int): Idle connections kept alive per client
+            keepalive_expiry (float): Seconds an idle connection is kept
+            connect_timeout (float): Seconds to establish a connection
+            read_timeout (float): Seconds to wait for response data
+            write_timeout (float): Seconds to send request data
+            pool_timeout (float): Seconds to wait for a free connection from the pool
+            http2 (bool): Use HTTP/2 when the h2 package is installed
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=write_timeout,
+            pool=pool_timeout,
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._lock = threading.Lock()
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self._stats = {"clients_created": 0, "requests": 0, "responses": 0, "errors": 0}
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self._stats["requests"] += 1
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        with self._lock:
+            self._stats["responses"] += 1
+            if response.status_code >= 400:
+                self._stats["errors"] += 1
+
+    def client(self) -> httpx.AsyncClient:
+        """
+        Return the shared client for the running event loop, creating it on first use.
+
+        Must be called from a coroutine. Callers must not close the client.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    http2=self.http2,
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    event_hooks={"request": [self._on_request], "response": [self._on_response]},
+                )
+                self._clients[loop] = client
+                self._stats["clients_created"] += 1
+        return client
+
+    async def aclose(self) -> None:
+        """Close the client of the running event loop, if any."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return request counters and connection-pool utilisation.
+
+        Returns:
+            dict: Request/response counters, configured limits and, per client,
+                  the number of open, active and idle connections
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            clients = list(self._clients.values())
+        stats["http2"] = self.http2
+        stats["max_connections"] = self.limits.max_connections
+        stats["max_keepalive_connections"] = self.limits.max_keepalive_connections
+        stats["open_clients"] = sum(1 for client in clients if not client.is_closed)
+        stats["pools"] = [_pool_usage(client) for client in clients if not client.is_closed]
+        return stats
+
+
+def _pool_usage(client: httpx.AsyncClient) -> Optional[Dict[str, int]]:
+    """Count a client's open connections (httpcore internals; None if unavailable)."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return None
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {"open": len(connections), "active": len(connections) - idle, "idle": idle}
+
+
+# Global client manager instance shared by every session in the process
+_http_client_manager = None
+_http_client_manager_lock = threading.Lock()
+
+
+def get_http_client_manager() -> HttpClientManager:
+    """Return the process-wide HTTP client manager, creating it on first use."""
+    global _http_client_manager
+    if _http_client_manager is None:
+        with _http_client_manager_lock:
+            if _http_client_manager is None:
+                _http_client_manager = HttpClientManager()
+    return _http_client_manager
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client for the running event loop."""
+    return get_http_client_manager().client()
+
+
+def get_http_client_stats() -> Dict[str, Any]:
+    """Return the shared HTTP client's pool statistics."""
+    return get_http_client_manager().stats()
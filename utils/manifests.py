@@ -116,6 +116,14 @@ def get_all_functions():
                 "fields": {"type": "array", "items": {"type": "string"}}
             }
         },
+        "server_details": {
+            "purpose": "Drilldown for several servers in one call; prefer over repeated server_detail calls.",
+            "parameters": {
+                "run_dir": {"type": "string"},
+                "servers": {"type": "array", "items": {"type": "string"}},
+                "fields": {"type": "array", "items": {"type": "string"}}
+            }
+        },
         "reallocation_candidates": {
             "purpose": "Data-only donor/receiver lists; the model writes the recommendation.",
             "parameters": {
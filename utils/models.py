@@ -1,5 +1,10 @@
+import weakref
+
 from pydantic_ai.models.openai import OpenAIChatModel
 from pydantic_ai.providers.ollama import OllamaProvider
+from pydantic_ai.providers.openai import OpenAIProvider
+
+from utils.http_client import get_http_client
 
 llama3_2_ollama_model = OpenAIChatModel(
     model_name='llama3.2',
@@ -65,4 +70,50 @@ gpt_oss_20b_model = OpenAIChatModel(
     provider=OllamaProvider(base_url='http://10.239.222.81:11434/v1'),
 )
 
-#http://172.31.0.8:9105/v1
\ No newline at end of file
+#http://172.31.0.8:9105/v1
+
+
+def build_model(model, http_client):
+    """
+    Rebuild a model so its provider sends requests through the given HTTP client.
+
+    Handles "openai:<name>" strings and the OpenAIChatModel instances above
+    (OpenAI or Ollama providers); anything else is returned unchanged.
+
+    Args:
+        model: Model name or pydantic-ai model instance
+        http_client (httpx.AsyncClient): The shared client to use
+
+    Returns:
+        The model bound to http_client
+    """
+    if isinstance(model, str):
+        provider_name, _, model_name = model.partition(":")
+        if provider_name == "openai" and model_name:
+            return OpenAIChatModel(model_name=model_name, provider=OpenAIProvider(http_client=http_client))
+        return model
+    if isinstance(model, OpenAIChatModel):
+        if model.system == "ollama":
+            provider = OllamaProvider(base_url=model.base_url, http_client=http_client)
+        else:
+            provider = OpenAIProvider(base_url=model.base_url, http_client=http_client)
+        return OpenAIChatModel(model_name=model.model_name, provider=provider)
+    return model
+
+
+# Models already bound to each shared client, so providers are built once per client
+_pooled_models = weakref.WeakKeyDictionary()
+
+
+def get_pooled_model(model):
+    """
+    Return model bound to the shared HTTP client of the running event loop.
+
+    Must be called from a coroutine.
+    """
+    http_client = get_http_client()
+    models = _pooled_models.setdefault(http_client, {})
+    key = model if isinstance(model, str) else id(model)
+    if key not in models:
+        models[key] = build_model(model, http_client)
+    return models[key]
@@ -0,0 +1,112 @@
+"""Concurrent execution of independent data-gathering calls."""
+
+import concurrent.futures
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Worker threads shared by every gather in the process
+MAX_WORKERS = 8
+# Wall-clock limit for a single call
+DEFAULT_CALL_TIMEOUT_SECONDS = 30.0
+
+
+class CallTimeoutError(TimeoutError):
+    """Raised by CallOutcome.result() for a call that did not finish in time."""
+
+
+@dataclass
+class CallOutcome:
+    """Result of one call submitted to the executor."""
+    name: str
+    value: Any = None
+    error: Optional[BaseException] = None
+    timed_out: bool = False
+    elapsed_seconds: float = 0.0
+
+    def result(self) -> Any:
+        """Return the call's value, re-raising its exception or a CallTimeoutError."""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class ParallelCallExecutor:
+    """
+    Runs independent blocking calls on a shared thread pool.
+
+    Callers submit a batch of calls and get their outcomes back in submission
+    order, so a batch takes roughly as long as its slowest call rather than the
+    sum of all of them. Each call has its own wall-clock limit measured from
+    when the batch started; a call that misses it is reported as timed out and
+    abandoned (a thread cannot be killed, so calls with their own cancellation,
+    such as DuckDB queries with a time budget, should be given a matching one).
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        """
+        Args:
+            max_workers (int): Number of worker threads
+        """
+        self.max_workers = max_workers
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                           thread_name_prefix="gather-call")
+
+    @staticmethod
+    def _timed(func: Callable[..., Any], kwargs: Dict[str, Any]) -> Tuple[Any, float]:
+        started = time.perf_counter()
+        value = func(**kwargs)
+        return value, time.perf_counter() - started
+
+    def run(self, calls: Sequence[Tuple[str, Callable[..., Any], Dict[str, Any]]],
+            timeout_seconds: float = DEFAULT_CALL_TIMEOUT_SECONDS) -> List[CallOutcome]:
+        """
+        Run calls concurrently and wait for all of them.
+
+        Args:
+            calls (list): (name, function, keyword arguments) per call
+            timeout_seconds (float): Per-call wall-clock limit
+
+        Returns:
+            list: One CallOutcome per call, in the order the calls were given
+        """
+        # Single calls go through the pool as well, so the time limit applies to every call
+        started = time.perf_counter()
+        futures = [self._pool.submit(self._timed, func, kwargs) for _, func, kwargs in calls]
+        outcomes = []
+        for (name, _, _), future in zip(calls, futures):
+            remaining = max(0.0, timeout_seconds - (time.perf_counter() - started))
+            try:
+                value, elapsed = future.result(timeout=remaining)
+                outcomes.append(CallOutcome(name, value, elapsed_seconds=round(elapsed, 4)))
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                outcomes.append(CallOutcome(
+                    name,
+                    error=CallTimeoutError(f"{name} did not finish within {timeout_seconds:g} seconds"),
+                    timed_out=True,
+                    elapsed_seconds=round(time.perf_counter() - started, 4),
+                ))
+            except Exception as error:
+                outcomes.append(CallOutcome(name, error=error))
+        return outcomes
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once running calls finish."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Global executor instance shared by every session in the process
+_parallel_executor = None
+_parallel_executor_lock = threading.Lock()
+
+
+def get_parallel_executor() -> ParallelCallExecutor:
+    """Return the process-wide call executor, creating it on first use."""
+    global _parallel_executor
+    if _parallel_executor is None:
+        with _parallel_executor_lock:
+            if _parallel_executor is None:
+                _parallel_executor = ParallelCallExecutor()
+    return _parallel_executor
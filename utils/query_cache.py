@@ -0,0 +1,207 @@
+"""Result cache for SQL queries over Parquet files."""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Upper bound on the memory held by cached results
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Results larger than this fraction of the budget are never cached
+MAX_ENTRY_FRACTION = 0.25
+
+# Single-quoted literals and double-quoted identifiers, kept verbatim by normalize_sql
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_LINE_COMMENT = re.compile(r"--[^\n]*")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION_SPACING = re.compile(r"\s*([(),=<>+\-*/])\s*")
+_READ_ONLY_PREFIXES = ("select", "with", "from", "values", "(")
+# Unquoted words; a trailing "(" marks a function call
+_WORD = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)(\(?)")
+# Keywords DuckDB prints in canonical case in result column names, so their spelling never matters
+_KEYWORDS = frozenset("""
+    all and any as asc between by case cast collate cross desc distinct else end escape except exists
+    false filter first from full glob group having ilike in inner intersect interval is join last lateral
+    left like limit natural not null nulls offset on or order outer over partition qualify recursive right
+    sample select semi anti similar tablesample then true union using values when where window with
+""".split())
+# Functions and clauses whose result differs between runs over the same data
+# (function calls, which normalize_sql writes without a space before the parenthesis, and keywords)
+_NONDETERMINISTIC = re.compile(
+    r"\b(?:random|gen_random_uuid|uuid|setseed|now|today|get_current_time|get_current_timestamp"
+    r"|transaction_timestamp|current_localtime|current_localtimestamp|nextval|currval)\("
+    r"|\b(?:current_date|current_time|current_timestamp|localtime|localtimestamp|tablesample|using sample)\b"
+)
+
+
+def normalize_sql(sql_query: str) -> str:
+    """
+    Normalize SQL text so trivially different spellings share a cache key.
+
+    Comments are removed, whitespace is collapsed, keywords and function
+    names are lower-cased and trailing semicolons are dropped. Identifiers and
+    aliases keep their case, because DuckDB uses their spelling in result
+    column names ("AS HostName" gives a HostName column). Quoted literals and
+    identifiers are kept exactly as written.
+
+    Args:
+        sql_query (str): The SQL text
+
+    Returns:
+        str: Canonical form of the query
+    """
+    parts = _QUOTED.split(sql_query)
+    normalized = []
+    for index, part in enumerate(parts):
+        if index % 2:
+            # Odd positions are the quoted sections captured by the split
+            normalized.append(part)
+            continue
+        part = _BLOCK_COMMENT.sub(" ", part)
+        part = _LINE_COMMENT.sub(" ", part)
+        part = _WHITESPACE.sub(" ", part)
+        part = _PUNCTUATION_SPACING.sub(r"\1", part)
+        part = _WORD.sub(_lower_keyword, part)
+        normalized.append(part)
+    return "".join(normalized).strip().rstrip(";").strip()
+
+
+def _lower_keyword(match: "re.Match") -> str:
+    word, call = match.group(1), match.group(2)
+    if call or word.lower() in _KEYWORDS:
+        return word.lower() + call
+    return word
+
+
+def is_deterministic(normalized_sql: str) -> bool:
+    """
+    True if a normalized query returns the same result every time it runs on the same data.
+
+    Queries calling random(), now(), current_date, uuid() and the like, or
+    sampling rows, are not; quoted literals and identifiers are ignored.
+    """
+    return _NONDETERMINISTIC.search(_QUOTED.sub("''", normalized_sql).lower()) is None
+
+
+def file_fingerprint(path: str) -> Optional[Tuple[str, int, int]]:
+    """Return (absolute path, mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def result_nbytes(result: Any) -> int:
+    """Estimate the memory held by a DataFrame or Arrow table."""
+    nbytes = getattr(result, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(result, "memory_usage", None)
+    if callable(memory_usage):
+        return int(memory_usage(index=True, deep=True).sum())
+    return len(repr(result))
+
+
+class QueryResultCache:
+    """
+    LRU cache of query results bounded by total bytes.
+
+    Entries are keyed by normalized SQL, parameters, result format and the
+    data file's fingerprint, so any change to the file makes old entries
+    unreachable (they age out through LRU eviction).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Maximum total size of cached results
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "uncacheable": 0}
+
+    def make_key(self, sql_query: str, parquet_file_path: str, parameters=None,
+                 result_format: str = "pandas") -> Optional[Tuple]:
+        """
+        Build the cache key for a query, or None if the query must not be cached.
+
+        Only deterministic read-only statements against an existing file are cacheable.
+        """
+        normalized = normalize_sql(sql_query)
+        fingerprint = file_fingerprint(parquet_file_path)
+        if (fingerprint is None or not normalized.startswith(_READ_ONLY_PREFIXES)
+                or not is_deterministic(normalized)):
+            with self._lock:
+                self._stats["uncacheable"] += 1
+            return None
+        params_key = json.dumps(parameters, sort_keys=True, default=str) if parameters else None
+        return (normalized, params_key, result_format, fingerprint)
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Return the cached result for key and mark it recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key: Tuple, result: Any) -> None:
+        """Store a result, evicting least recently used entries to stay within budget."""
+        size = result_nbytes(result)
+        if size > self.max_bytes * MAX_ENTRY_FRACTION:
+            with self._lock:
+                self._stats["uncacheable"] += 1
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+            stats["max_bytes"] = self.max_bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+# Global query cache instance shared by every session in the process
+_query_cache = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryResultCache:
+    """Return the process-wide query result cache, creating it on first use."""
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = QueryResultCache()
+    return _query_cache
@@ -0,0 +1,147 @@
+"""Local cache of agent answers to repeated schedule questions."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from utils.schedule_intent import ScheduleIntent, parse_schedule_query
+from utils.schedule_store import get_schedule_store
+
+# Tools whose results depend only on the schedule; answers from runs that called
+# anything else (bookings, user information, tickets, stored-result handles) are never cached
+CACHEABLE_TOOLS = frozenset({"search_bus_schedule", "get_entire_bus_schedule"})
+# Maximum number of cached answers
+MAX_ENTRIES = 512
+# Cached answers expire after this many seconds even if the schedule is unchanged
+ENTRY_TTL_SECONDS = 6 * 60 * 60
+
+
+class ResponseCache:
+    """
+    Serves earlier answers to schedule questions that mean the same thing.
+
+    A question is keyed by its parsed intent (places, operator, time window,
+    day, seats and any unparsed words), so different phrasings of the same
+    lookup share an entry while "first bus" and "last bus" never do. Entries
+    carry the schedule store's revision and are ignored once the timetable or
+    any seat count changes. The cache is shared by every user, so only
+    read-only schedule lookups answered without any conversation context are
+    ever stored or served.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl_seconds: float = ENTRY_TTL_SECONDS):
+        """
+        Args:
+            max_entries (int): Maximum number of cached answers
+            ttl_seconds (float): Lifetime of an entry
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Tuple[int, int]], Dict[str, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "skipped": 0}
+
+    @staticmethod
+    def cacheable_intent(text: str) -> Optional[ScheduleIntent]:
+        """Return the parsed intent if the question may be cached, else None."""
+        intent = parse_schedule_query(text)
+        return intent if intent.is_schedule_lookup else None
+
+    def lookup(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached answer for a question, or None.
+
+        Args:
+            text (str): The user's message
+
+        Returns:
+            dict: 'response' and the intent 'key' it was stored under
+        """
+        intent = self.cacheable_intent(text)
+        if intent is None:
+            return None
+        key = (intent.key(), get_schedule_store().revision)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry["stored_at"] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return {"response": entry["response"], "key": key[0]}
+
+    def store(self, text: str, response: str, tools_called: Iterable[str] = (),
+              revision: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Cache an answer if the question and the run that produced it are cacheable.
+
+        Only call this for runs that had no earlier conversation: an answer
+        written with a user's history in view must not be served to others.
+
+        Args:
+            text (str): The user's message
+            response (str): The final answer shown to the user
+            tools_called (iterable): Names of the tools the run called
+            revision (tuple, optional): Schedule store revision taken before the run started;
+                the answer is dropped if the schedule changed while it ran
+
+        Returns:
+            bool: True if the answer was stored
+        """
+        intent = self.cacheable_intent(text)
+        tools = set(tools_called)
+        current = get_schedule_store().revision
+        if (intent is None or not response or not tools.issubset(CACHEABLE_TOOLS)
+                or (revision is not None and revision != current)):
+            with self._lock:
+                self._stats["skipped"] += 1
+            return False
+        key = (intent.key(), current)
+        with self._lock:
+            self._entries[key] = {
+                "response": response,
+                "revision": current,
+                "stored_at": time.monotonic(),
+            }
+            self._entries.move_to_end(key)
+            # Entries for older revisions can never be served again; drop them first
+            for stale in [k for k, entry in self._entries.items() if entry["revision"] != current]:
+                del self._entries[stale]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._stats["stores"] += 1
+        return True
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of entries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+# Global response cache instance shared by every session in the process
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, creating it on first use."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
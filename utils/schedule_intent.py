@@ -0,0 +1,239 @@
+"""Rule-based parsing of schedule questions against the timetable's vocabulary."""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from utils.schedule_store import get_schedule_store, normalize_value
+
+# Named parts of the day as inclusive departure windows ("HH:MM"); night wraps past midnight
+TIME_OF_DAY = {
+    "morning": ("05:00", "11:59"),
+    "afternoon": ("12:00", "16:59"),
+    "evening": ("17:00", "20:59"),
+    "night": ("21:00", "04:59"),
+    "tonight": ("18:00", "23:59"),
+}
+DAY_WORDS = {
+    "today", "tomorrow", "tonight", "monday", "tuesday", "wednesday", "thursday",
+    "friday", "saturday", "sunday", "weekend",
+}
+GREETING_WORDS = {
+    "hi", "hello", "hey", "hiya", "howdy", "greetings", "good", "morning", "afternoon",
+    "evening", "day", "there", "thanks", "thank", "you", "cheers",
+}
+# Words that make a request an action or tie it to the current user
+USER_SPECIFIC_WORDS = {
+    "book", "booking", "bookings", "booked", "reserve", "reservation", "reservations",
+    "ticket", "tickets", "cancel", "pay", "payment", "download", "pdf", "my", "mine",
+    "account", "profile", "confirm", "purchase", "buy",
+}
+ORIGIN_MARKERS = {"from", "leaving", "departing", "out"}
+DESTINATION_MARKERS = {"to", "towards", "for", "into", "till", "until"}
+# Words that carry no meaning beyond the parsed slots
+FILLER_WORDS = {
+    "a", "an", "the", "is", "are", "there", "any", "what", "which", "when", "show", "list",
+    "give", "find", "get", "me", "us", "please", "can", "could", "would", "you", "i", "we",
+    "want", "need", "like", "to", "from", "bus", "buses", "coach", "coaches", "departure",
+    "departures", "depart", "departs", "departing", "leave", "leaves", "leaving", "go", "goes",
+    "going", "travel", "travelling", "traveling", "trip", "trips", "route", "routes", "schedule",
+    "schedules", "timetable", "times", "time", "available", "options", "option", "service",
+    "services", "run", "runs", "running", "in", "on", "at", "for", "of", "and", "with", "by",
+    "do", "does", "have", "has", "all", "some", "that", "this", "next", "out", "towards", "into",
+    "seat", "seats", "least", "after", "before", "between", "around", "about", "operated",
+    "operator", "company", "companies",
+}
+
+_TOKEN = re.compile(r"\d{1,2}:\d{2}|\d+|[a-z]+")
+_CLOCK = re.compile(r"^(\d{1,2})(?::(\d{2}))?$")
+
+
+@dataclass
+class ScheduleIntent:
+    """Slots extracted from a user message."""
+    text: str
+    tokens: List[str]
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    city: Optional[str] = None
+    bus_name: Optional[str] = None
+    earliest_departure: Optional[str] = None
+    latest_departure: Optional[str] = None
+    time_phrase: Optional[str] = None
+    day: Optional[str] = None
+    min_seats: Optional[int] = None
+    greeting: bool = False
+    user_specific: bool = False
+    residual: List[str] = field(default_factory=list)
+
+    @property
+    def has_route(self) -> bool:
+        """True if the message names a place or operator."""
+        return bool(self.origin or self.destination or self.city or self.bus_name)
+
+    @property
+    def is_schedule_lookup(self) -> bool:
+        """True for a self-contained, read-only question about departures."""
+        return self.has_route and not self.user_specific and not self.greeting
+
+    def slots(self) -> Tuple:
+        """The parsed slots, for comparing two intents."""
+        return (self.origin, self.destination, self.city, self.bus_name, self.earliest_departure,
+                self.latest_departure, self.day, self.min_seats)
+
+    def key(self) -> str:
+        """Canonical form of the question: its slots plus any words the parser did not consume."""
+        parts = [f"{name}={value}" for name, value in zip(
+            ("from", "to", "city", "bus", "after", "before", "day", "seats"), self.slots()) if value is not None]
+        if self.residual:
+            parts.append("rest=" + " ".join(sorted(set(self.residual))))
+        return "|".join(parts)
+
+
+class ScheduleVocabulary:
+    """City and operator phrases from the timetable, matched longest-first."""
+
+    def __init__(self, cities: List[str], operators: List[str]):
+        self.phrases: Dict[Tuple[str, ...], Tuple[str, str]] = {}
+        for kind, values in (("city", cities), ("bus_name", operators)):
+            for value in values:
+                phrase = tuple(tokenize(value))
+                if phrase:
+                    self.phrases.setdefault(phrase, (kind, value))
+        self.max_words = max((len(phrase) for phrase in self.phrases), default=1)
+
+    def match(self, tokens: List[str], start: int) -> Optional[Tuple[int, str, str]]:
+        """Return (length, kind, value) of the longest phrase starting at tokens[start]."""
+        for length in range(min(self.max_words, len(tokens) - start), 0, -1):
+            found = self.phrases.get(tuple(tokens[start:start + length]))
+            if found is not None:
+                return length, found[0], found[1]
+        return None
+
+
+_vocabulary = None
+_vocabulary_version = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_schedule_vocabulary() -> ScheduleVocabulary:
+    """Return the vocabulary of the current schedule, rebuilding it when the schedule reloads."""
+    global _vocabulary, _vocabulary_version
+    store = get_schedule_store()
+    version = store.version
+    if _vocabulary is None or _vocabulary_version != version:
+        with _vocabulary_lock:
+            if _vocabulary is None or _vocabulary_version != version:
+                cities = sorted(set(store.distinct_values("departure_location")) | set(store.distinct_values("destination")))
+                _vocabulary = ScheduleVocabulary(cities, store.distinct_values("bus_name"))
+                _vocabulary_version = version
+    return _vocabulary
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word, number and clock-time tokens of a text."""
+    return _TOKEN.findall(normalize_value(text))
+
+
+def _clock(token: str, meridiem: Optional[str]) -> Optional[str]:
+    """Convert "8" / "8:30" (+ "am"/"pm") to "HH:MM", or None if it is not a time."""
+    match = _CLOCK.match(token)
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    if meridiem == "pm" and hour < 12:
+        hour += 12
+    elif meridiem == "am" and hour == 12:
+        hour = 0
+    if hour > 23 or minute > 59 or (match.group(2) is None and meridiem is None):
+        return None
+    return f"{hour:02d}:{minute:02d}"
+
+
+def parse_schedule_query(text: str, vocabulary: Optional[ScheduleVocabulary] = None) -> ScheduleIntent:
+    """
+    Extract origin, destination, operator, time window, day and seat filters from a message.
+
+    Places and operators are recognised only if they appear in the timetable.
+    A place after "from" is the origin and after "to" the destination; two
+    unmarked places are read as origin then destination, a single unmarked
+    place is kept as city.
+
+    Args:
+        text (str): The user's message
+        vocabulary (ScheduleVocabulary, optional): Defaults to the current schedule's vocabulary
+
+    Returns:
+        ScheduleIntent: The parsed slots
+    """
+    vocabulary = vocabulary or get_schedule_vocabulary()
+    tokens = tokenize(text)
+    intent = ScheduleIntent(text=text, tokens=tokens)
+    unmarked_cities: List[str] = []
+    residual: List[str] = []
+
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        previous = tokens[position - 1] if position else None
+        following = tokens[position + 1] if position + 1 < len(tokens) else None
+
+        matched = vocabulary.match(tokens, position)
+        if matched is not None:
+            length, kind, value = matched
+            if kind == "bus_name":
+                intent.bus_name = value
+            elif previous in ORIGIN_MARKERS and not intent.origin:
+                intent.origin = value
+            elif previous in DESTINATION_MARKERS and not intent.destination:
+                intent.destination = value
+            else:
+                unmarked_cities.append(value)
+            position += length
+            continue
+
+        if token in TIME_OF_DAY:
+            intent.time_phrase = token
+            intent.earliest_departure, intent.latest_departure = TIME_OF_DAY[token]
+            if token == "tonight":
+                intent.day = intent.day or "today"
+        elif token in DAY_WORDS:
+            intent.day = token
+        elif following == "seats" and token.isdigit() or (following == "seat" and token.isdigit()):
+            intent.min_seats = int(token)
+        elif token in ("am", "pm"):
+            pass
+        else:
+            clock = _clock(token, following if following in ("am", "pm") else None)
+            if clock is not None:
+                if previous in ("after", "from", "since"):
+                    intent.earliest_departure = clock
+                elif previous in ("before", "by", "until", "till"):
+                    intent.latest_departure = clock
+                else:
+                    # "at 8am": a one-hour window starting at the given time
+                    hour = int(clock[:2])
+                    intent.earliest_departure = clock
+                    intent.latest_departure = f"{min(hour + 1, 23):02d}:{clock[3:]}"
+                intent.time_phrase = None
+            elif token in USER_SPECIFIC_WORDS:
+                intent.user_specific = True
+                residual.append(token)
+            elif token not in FILLER_WORDS:
+                # Includes numbers that did not become a filter (e.g. a bare "6"), so they stay in the key
+                residual.append(token)
+        position += 1
+
+    # Unmarked places fill origin first, then destination ("Lagos Abuja", "Lagos to Abuja")
+    for city in unmarked_cities:
+        if not intent.origin and (len(unmarked_cities) > 1 or intent.destination):
+            intent.origin = city
+        elif not intent.destination and intent.origin:
+            intent.destination = city
+        elif not intent.city:
+            intent.city = city
+
+    intent.greeting = bool(tokens) and not intent.has_route and all(token in GREETING_WORDS for token in tokens)
+    intent.residual = [token for token in residual if token not in GREETING_WORDS]
+    return intent
@@ -0,0 +1,425 @@
+"""In-memory bus schedule store for the Bus 54 Ticketing Assistant."""
+
+import bisect
+import csv
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Default location of the timetable, resolved relative to the project root
+DEFAULT_SCHEDULE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "simple_bus_schedule.csv",
+)
+
+# Columns that get an exact-match hash index
+INDEXED_COLUMNS = ("departure_location", "destination", "bus_name")
+
+# Default and maximum page size for search results
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+
+
+def normalize_value(value: Optional[str]) -> str:
+    """Normalize an indexed value for case-insensitive matching."""
+    return (value or "").strip().casefold()
+
+
+def normalize_time(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a clock time to the zero-padded "HH:MM" form used in the CSV.
+
+    Args:
+        value (str): A time such as "8:00", "08:00" or "0800"
+
+    Returns:
+        str: The normalized time, or None if value is empty
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    if ":" in value:
+        hours, minutes = value.split(":", 1)
+    elif value.isdigit() and len(value) in (3, 4):
+        hours, minutes = value[:-2], value[-2:]
+    else:
+        raise ValueError(f"Invalid time '{value}', expected HH:MM")
+    hours, minutes = int(hours), int(minutes[:2])
+    if not (0 <= hours <= 23 and 0 <= minutes <= 59):
+        raise ValueError(f"Invalid time '{value}', expected HH:MM")
+    return f"{hours:02d}:{minutes:02d}"
+
+
+def schedule_key(row: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """
+    Build the key that identifies a single departure in the timetable.
+
+    Args:
+        row: A schedule row (or any dict with the same fields)
+
+    Returns:
+        tuple: (departure_time, departure_location, destination, bus_name)
+    """
+    return (
+        row.get("departure_time"),
+        row.get("departure_location"),
+        row.get("destination"),
+        row.get("bus_name"),
+    )
+
+
+class ScheduleSnapshot:
+    """
+    Immutable view of one loaded version of the timetable and its indexes.
+
+    Readers grab a snapshot once and use it for the whole operation, so a
+    concurrent reload never mixes rows from two versions of the file. The
+    only field updated in place is available_seats (see
+    ScheduleStore.set_available_seats).
+    """
+
+    def __init__(self, rows: List[Dict[str, str]], fieldnames: List[str], version: int,
+                 fingerprint: Optional[Tuple[int, int]] = None):
+        self.rows = rows
+        self.fieldnames = fieldnames
+        self.version = version
+        self.fingerprint = fingerprint
+
+        # Hash indexes: column -> normalized value -> row positions
+        self.indexes: Dict[str, Dict[str, List[int]]] = {column: {} for column in INDEXED_COLUMNS}
+        for position, row in enumerate(rows):
+            for column in INDEXED_COLUMNS:
+                self.indexes[column].setdefault(normalize_value(row.get(column)), []).append(position)
+
+        # Sorted index on departure_time ("HH:MM" strings sort chronologically)
+        self.time_order = sorted(range(len(rows)), key=lambda i: rows[i].get("departure_time") or "")
+        self.times = [rows[i].get("departure_time") or "" for i in self.time_order]
+
+    def positions_for(self, column: str, value: str) -> List[int]:
+        """Return the row positions whose indexed column equals value (case-insensitive)."""
+        if column not in INDEXED_COLUMNS:
+            raise ValueError(f"Column '{column}' is not indexed")
+        return self.indexes[column].get(normalize_value(value), [])
+
+    def positions_between(self, start: Optional[str] = None, end: Optional[str] = None) -> List[int]:
+        """
+        Return row positions whose departure_time falls in [start, end].
+
+        Args:
+            start (str, optional): Earliest departure time, inclusive ("HH:MM")
+            end (str, optional): Latest departure time, inclusive ("HH:MM")
+
+        Returns:
+            list: Row positions ordered by departure time
+        """
+        low = bisect.bisect_left(self.times, start) if start else 0
+        high = bisect.bisect_right(self.times, end) if end else len(self.times)
+        return self.time_order[low:high]
+
+    def rows_at(self, positions) -> List[Dict[str, str]]:
+        """Return copies of the rows at the given positions."""
+        rows = self.rows
+        return [dict(rows[i]) for i in positions]
+
+    def search(self, origin: Optional[str] = None, destination: Optional[str] = None,
+               earliest_departure: Optional[str] = None, latest_departure: Optional[str] = None,
+               bus_name: Optional[str] = None, min_seats: Optional[int] = None,
+               limit: int = DEFAULT_SEARCH_LIMIT, offset: int = 0) -> Dict[str, Any]:
+        """
+        Find departures matching all of the given filters.
+
+        The most selective hash index provides the candidate rows; remaining
+        filters are checked only against those candidates.
+
+        Args:
+            origin (str, optional): Departure location (case-insensitive)
+            destination (str, optional): Destination (case-insensitive)
+            earliest_departure (str, optional): Earliest departure time, inclusive ("HH:MM")
+            latest_departure (str, optional): Latest departure time, inclusive ("HH:MM").
+                If earlier than earliest_departure the window wraps past midnight.
+            bus_name (str, optional): Bus company (case-insensitive)
+            min_seats (int, optional): Minimum number of available seats
+            limit (int): Maximum number of rows to return
+            offset (int): Number of matching rows to skip
+
+        Returns:
+            dict: total match count, the requested page of rows ordered by
+                  departure time, and the applied filters
+        """
+        earliest_departure = normalize_time(earliest_departure)
+        latest_departure = normalize_time(latest_departure)
+        limit = max(0, min(int(limit), MAX_SEARCH_LIMIT))
+        offset = max(0, int(offset))
+
+        equality_filters = [
+            (column, value)
+            for column, value in (("departure_location", origin), ("destination", destination), ("bus_name", bus_name))
+            if value
+        ]
+
+        if equality_filters:
+            candidate_lists = [self.positions_for(column, value) for column, value in equality_filters]
+            smallest = min(candidate_lists, key=len)
+            candidates = smallest
+            for other in candidate_lists:
+                if other is not smallest:
+                    other_set = set(other)
+                    candidates = [i for i in candidates if i in other_set]
+            time_filtered = earliest_departure is not None or latest_departure is not None
+        elif earliest_departure and latest_departure and latest_departure < earliest_departure:
+            # Overnight window, e.g. 22:00 -> 05:00
+            candidates = self.positions_between(earliest_departure, None) + self.positions_between(None, latest_departure)
+            time_filtered = False
+        else:
+            candidates = self.positions_between(earliest_departure, latest_departure)
+            time_filtered = False
+
+        rows = self.rows
+        matches = []
+        for position in candidates:
+            row = rows[position]
+            if time_filtered:
+                departure = row.get("departure_time") or ""
+                if earliest_departure and latest_departure and latest_departure < earliest_departure:
+                    if latest_departure < departure < earliest_departure:
+                        continue
+                else:
+                    if earliest_departure and departure < earliest_departure:
+                        continue
+                    if latest_departure and departure > latest_departure:
+                        continue
+            if min_seats is not None:
+                try:
+                    if int(row.get("available_seats") or 0) < int(min_seats):
+                        continue
+                except ValueError:
+                    continue
+            matches.append(position)
+
+        if equality_filters:
+            matches.sort(key=lambda i: rows[i].get("departure_time") or "")
+
+        return {
+            "status": "success",
+            "total": len(matches),
+            "limit": limit,
+            "offset": offset,
+            "items": self.rows_at(matches[offset:offset + limit]),
+            "filters": {
+                "origin": origin,
+                "destination": destination,
+                "earliest_departure": earliest_departure,
+                "latest_departure": latest_departure,
+                "bus_name": bus_name,
+                "min_seats": min_seats,
+            },
+        }
+
+
+class ScheduleStore:
+    """
+    Process-wide, indexed copy of the bus timetable.
+
+    The CSV is parsed once and kept in memory as a ScheduleSnapshot. Every
+    access checks the file's mtime/size and transparently reloads it if the
+    file has changed on disk.
+    """
+
+    def __init__(self, csv_path: str = DEFAULT_SCHEDULE_PATH):
+        """
+        Initialize the store. The file is loaded lazily on first access.
+
+        Args:
+            csv_path (str): Path to the schedule CSV file
+        """
+        self.csv_path = csv_path
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ScheduleSnapshot] = None
+        self._load_hooks: List[Callable[[ScheduleSnapshot], None]] = []
+        self._seat_revision = 0
+        # Why the latest load (or one of its load hooks) failed; None after a clean load
+        self.last_error: Optional[str] = None
+
+    def add_load_hook(self, hook: Callable[[ScheduleSnapshot], None]) -> None:
+        """
+        Register a callback that runs on every newly loaded snapshot before it is published.
+
+        The hook is also applied to the current snapshot if one is already loaded.
+
+        Args:
+            hook: Callable receiving the ScheduleSnapshot
+        """
+        with self._lock:
+            if hook in self._load_hooks:
+                return
+            self._load_hooks.append(hook)
+            if self._snapshot is not None:
+                hook(self._snapshot)
+
+    def set_available_seats(self, key: Tuple[str, str, str, str], seats: int) -> bool:
+        """
+        Update the live seat count of one departure in the current snapshot.
+
+        Seat counts are the only mutable field of a snapshot; they mirror the
+        seat inventory so searches see bookings without reloading the CSV.
+
+        Args:
+            key: Departure key as returned by schedule_key()
+            seats (int): New number of available seats
+
+        Returns:
+            bool: True if the departure was found
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return False
+        found = False
+        for position in snapshot.positions_for("departure_location", key[1]):
+            row = snapshot.rows[position]
+            if schedule_key(row) == key:
+                row["available_seats"] = str(seats)
+                found = True
+        if found:
+            self._seat_revision += 1
+        return found
+
+    def _current_fingerprint(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the CSV file, or None if it is missing."""
+        try:
+            stat = os.stat(self.csv_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self, fingerprint: Optional[Tuple[int, int]], version: int) -> ScheduleSnapshot:
+        """Parse the CSV file and build a new snapshot; an empty one (with last_error set) if that fails."""
+        rows: List[Dict[str, str]] = []
+        fieldnames: List[str] = []
+        self.last_error = None
+
+        if fingerprint is None:
+            self.last_error = f"Schedule file not found: {self.csv_path}"
+        else:
+            try:
+                with open(self.csv_path, "r", encoding="utf-8") as csvfile:
+                    reader = csv.DictReader(csvfile)
+                    fieldnames = list(reader.fieldnames or [])
+                    rows = [row for row in reader]
+            except (OSError, UnicodeDecodeError, csv.Error) as e:
+                self.last_error = f"Error loading schedule: {str(e)}"
+                rows, fieldnames = [], []
+
+        return ScheduleSnapshot(rows, fieldnames, version, fingerprint)
+
+    def snapshot(self) -> ScheduleSnapshot:
+        """
+        Return the current snapshot, reloading the file first if it changed.
+
+        Returns:
+            ScheduleSnapshot: The active timetable version
+        """
+        fingerprint = self._current_fingerprint()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.fingerprint == fingerprint:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.fingerprint != fingerprint:
+                version = snapshot.version + 1 if snapshot is not None else 1
+                snapshot = self._load(fingerprint, version)
+                self._run_load_hooks(snapshot)
+                self._snapshot = snapshot
+            return snapshot
+
+    def refresh(self) -> ScheduleSnapshot:
+        """Force a reload of the CSV file regardless of its fingerprint."""
+        with self._lock:
+            version = self._snapshot.version + 1 if self._snapshot is not None else 1
+            snapshot = self._load(self._current_fingerprint(), version)
+            self._run_load_hooks(snapshot)
+            self._snapshot = snapshot
+            return snapshot
+
+    def _run_load_hooks(self, snapshot: ScheduleSnapshot) -> None:
+        """Apply the registered load hooks to a freshly parsed snapshot; a failing hook sets last_error."""
+        for hook in self._load_hooks:
+            try:
+                hook(snapshot)
+            except Exception as e:
+                self.last_error = f"Error in schedule load hook: {str(e)}"
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter that increases every time the data is reloaded."""
+        return self.snapshot().version
+
+    @property
+    def revision(self) -> Tuple[int, int]:
+        """
+        (version, seat revision) of the data; changes on every reload and every seat update.
+
+        Use this rather than version to invalidate anything derived from seat counts.
+        """
+        return (self.snapshot().version, self._seat_revision)
+
+    def all_rows(self) -> List[Dict[str, str]]:
+        """
+        Return a copy of every schedule row.
+
+        Returns:
+            list: A list of dictionaries, one per departure
+        """
+        snapshot = self.snapshot()
+        return snapshot.rows_at(range(len(snapshot.rows)))
+
+    def lookup(self, column: str, value: str) -> List[Dict[str, str]]:
+        """
+        Return the rows whose indexed column equals value.
+
+        Args:
+            column (str): One of departure_location, destination or bus_name
+            value (str): Exact value to match
+
+        Returns:
+            list: Matching rows (copies)
+        """
+        snapshot = self.snapshot()
+        return snapshot.rows_at(snapshot.positions_for(column, value))
+
+    def distinct_values(self, column: str) -> List[str]:
+        """
+        Return the sorted distinct values of an indexed column.
+
+        Args:
+            column (str): One of departure_location, destination or bus_name
+
+        Returns:
+            list: Distinct, non-empty values
+        """
+        snapshot = self.snapshot()
+        if column not in INDEXED_COLUMNS:
+            raise ValueError(f"Column '{column}' is not indexed")
+        return sorted({row.get(column) for row in snapshot.rows if row.get(column)})
+
+    def search(self, **filters) -> Dict[str, Any]:
+        """Search the current snapshot. See ScheduleSnapshot.search for the filters."""
+        return self.snapshot().search(**filters)
+
+
+# Global schedule store instance shared by every session in the process
+_schedule_store = None
+_schedule_store_lock = threading.Lock()
+
+
+def get_schedule_store() -> ScheduleStore:
+    """Return the process-wide schedule store, creating it on first use."""
+    global _schedule_store
+    if _schedule_store is None:
+        with _schedule_store_lock:
+            if _schedule_store is None:
+                _schedule_store = ScheduleStore()
+    return _schedule_store
@@ -0,0 +1,268 @@
+"""Single-pass column profiler used to describe retrieved data without exposing values."""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Rows processed per chunk; every statistic is updated from the same chunk
+CHUNK_ROWS = 65_536
+# HyperLogLog precision: 2**12 registers, about 1.6% standard error
+HLL_PRECISION = 12
+# Distinct hashes are tracked exactly up to this many, then only the sketch is used
+EXACT_DISTINCT_LIMIT = 4_096
+# Columns with fewer distinct values than this are flagged as potentially categorical
+CATEGORICAL_THRESHOLD = 20
+# Share of string values that must match a pattern to report it as the column format
+PATTERN_THRESHOLD = 0.7
+
+# One regex for both formats, so each string is matched once
+_DATE_TIME_PATTERN = r"^(?:(?P<date>\d{4}-\d{2}-\d{2})|(?P<time>\d{2}:\d{2}:\d{2}))"
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch over 64-bit hashes, updated with NumPy."""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = np.zeros(self.num_registers, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """Add a uint64 array of hashes to the sketch."""
+        if not len(hashes):
+            return
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        # The next 32 bits decide the rank; they are exactly representable as float64
+        rest = ((hashes << np.uint64(self.precision)) >> np.uint64(32)).astype(np.float64)
+        bit_length = np.frexp(rest)[1]
+        rank = (33 - bit_length).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self) -> int:
+        """Return the estimated number of distinct hashes added."""
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            raw = m * np.log(m / zeros)
+        return int(round(raw))
+
+
+class ColumnProfile:
+    """
+    Running statistics for one column, updated chunk by chunk.
+
+    Each chunk is read once: nulls, counts, min/max/sum, integer check, string
+    lengths, date/time pattern matches and distinct-count hashes are all taken
+    from it before moving on to the next one.
+    """
+
+    def __init__(self, dtype):
+        self.dtype = dtype
+        self.rows = 0
+        self.non_null = 0
+        self.samples: List[Any] = []
+        self.minimum = None
+        self.maximum = None
+        self.total = 0.0
+        self.all_integer = True
+        self.string_count = 0
+        self.min_length = None
+        self.max_length = None
+        self.date_matches = 0
+        self.time_matches = 0
+        self.exact_hashes: Optional[np.ndarray] = np.empty(0, dtype=np.uint64)
+        self.sketch = HyperLogLog()
+
+    @property
+    def kind(self) -> str:
+        if pd.api.types.is_datetime64_any_dtype(self.dtype):
+            return "datetime"
+        if pd.api.types.is_numeric_dtype(self.dtype):
+            return "numeric"
+        if self.dtype == object or pd.api.types.is_string_dtype(self.dtype):
+            return "object"
+        return "other"
+
+    def update(self, chunk: pd.Series) -> None:
+        """Fold one chunk of the column into the statistics."""
+        self.rows += len(chunk)
+        values = chunk[chunk.notna()]
+        if not len(values):
+            return
+        self.non_null += len(values)
+        if len(self.samples) < 3:
+            self.samples.extend(values.iloc[:3 - len(self.samples)].tolist())
+
+        kind = self.kind
+        if kind == "numeric":
+            self._update_numeric(values)
+        elif kind == "datetime":
+            self._update_range(values.min(), values.max())
+        elif kind == "object":
+            self._update_strings(values)
+        self._update_distinct(values)
+
+    def _update_range(self, low, high) -> None:
+        self.minimum = low if self.minimum is None or low < self.minimum else self.minimum
+        self.maximum = high if self.maximum is None or high > self.maximum else self.maximum
+
+    def _update_numeric(self, values: pd.Series) -> None:
+        array = values.to_numpy(dtype="float64")
+        self._update_range(float(array.min()), float(array.max()))
+        self.total += float(array.sum())
+        if self.all_integer and not (pd.api.types.is_integer_dtype(self.dtype)
+                                     or pd.api.types.is_bool_dtype(self.dtype)):
+            # inf % 1 is NaN, so infinities count as non-integer
+            self.all_integer = not np.any(np.mod(array, 1.0) != 0)
+
+    def _update_strings(self, values: pd.Series) -> None:
+        if pd.api.types.infer_dtype(values, skipna=True) == "string":
+            strings = values
+        else:
+            strings = values[values.map(type) == str]
+        if not len(strings):
+            return
+        self.string_count += len(strings)
+        lengths = strings.str.len()
+        low, high = int(lengths.min()), int(lengths.max())
+        self.min_length = low if self.min_length is None else min(self.min_length, low)
+        self.max_length = high if self.max_length is None else max(self.max_length, high)
+        matches = strings.str.extract(_DATE_TIME_PATTERN)
+        self.date_matches += int(matches["date"].notna().sum())
+        self.time_matches += int(matches["time"].notna().sum())
+
+    def _update_distinct(self, values: pd.Series) -> None:
+        array = values.to_numpy()
+        if array.dtype == object:
+            # Unhashable values (dicts, lists) are hashed through their text form
+            array = np.array([v if isinstance(v, (str, bytes)) else repr(v) for v in array], dtype=object)
+        hashes = pd.util.hash_array(array)
+        self.sketch.add_hashes(hashes)
+        if self.exact_hashes is not None:
+            merged = np.union1d(self.exact_hashes, hashes)
+            self.exact_hashes = merged if len(merged) <= EXACT_DISTINCT_LIMIT else None
+
+    def distinct(self) -> Tuple[int, bool]:
+        """Return (distinct count, whether it is approximate)."""
+        if self.exact_hashes is not None:
+            return len(self.exact_hashes), False
+        return self.sketch.estimate(), True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Render the profile in the format returned by extract_detailed_data_schema."""
+        null_count = self.rows - self.non_null
+        info: Dict[str, Any] = {
+            "dtype": str(self.dtype),
+            "non_null_count": int(self.non_null),
+            "null_count": int(null_count),
+            "null_percentage": float(round((null_count / self.rows) * 100, 2)) if self.rows else 0.0,
+        }
+        distinct, approximate = self.distinct()
+        # Null counts as a value, as Series.unique() did
+        unique_values = distinct + (1 if null_count else 0)
+
+        kind = self.kind
+        if kind == "object" and self.samples:
+            sample_type = type(self.samples[0]).__name__
+            info["inferred_type"] = sample_type
+            if sample_type == "str":
+                info["max_length"] = self.max_length or 0
+                info["min_length"] = self.min_length or 0
+                if self.string_count and self.date_matches / self.string_count > PATTERN_THRESHOLD:
+                    info["potential_format"] = "date (YYYY-MM-DD)"
+                elif self.string_count and self.time_matches / self.string_count > PATTERN_THRESHOLD:
+                    info["potential_format"] = "time (HH:MM:SS)"
+            elif sample_type == "dict":
+                info["nested_structure"] = {k: type(v).__name__ for k, v in self.samples[0].items()}
+            elif sample_type == "list":
+                sample_list = self.samples[0]
+                if len(sample_list) > 0 and isinstance(sample_list[0], dict):
+                    info["nested_structure"] = {k: type(v).__name__ for k, v in sample_list[0].items()}
+                else:
+                    info["nested_structure"] = f"list of {type(sample_list[0]).__name__}" if sample_list else "empty list"
+        elif kind == "numeric" and self.non_null:
+            info["min"] = self.minimum
+            info["max"] = self.maximum
+            info["mean"] = self.total / self.non_null
+            if self.all_integer:
+                info["appears_integer"] = True
+            if unique_values < CATEGORICAL_THRESHOLD:
+                info["unique_values_count"] = int(unique_values)
+                info["potential_categorical"] = True
+        elif kind == "datetime" and self.non_null:
+            info["min_date"] = str(self.minimum)
+            info["max_date"] = str(self.maximum)
+            info["date_range_days"] = int((self.maximum - self.minimum).days)
+
+        info["unique_values"] = int(unique_values)
+        info["unique_values_approximate"] = approximate
+        info["is_unique"] = bool(unique_values == self.rows)
+        return info
+
+
+def _sample_step(num_rows: int, sample_size: Optional[int]) -> int:
+    if not sample_size or num_rows <= sample_size:
+        return 1
+    return -(-num_rows // sample_size)
+
+
+def _chunks(data, columns: List[str], step: int) -> Iterator[Dict[str, pd.Series]]:
+    """Yield {column: Series} chunks from a DataFrame or Arrow table."""
+    if isinstance(data, pd.DataFrame):
+        if step > 1:
+            data = data.iloc[::step]
+        for start in range(0, len(data), CHUNK_ROWS):
+            block = data.iloc[start:start + CHUNK_ROWS]
+            yield {col: block[col] for col in columns}
+        return
+
+    if step > 1:
+        data = data.take(pa.array(np.arange(0, data.num_rows, step)))
+    # Convert one record batch at a time instead of the whole table
+    for batch in data.to_batches(max_chunksize=CHUNK_ROWS):
+        yield {name: batch.column(i).to_pandas() for i, name in enumerate(batch.schema.names)}
+
+
+def profile_data(data, sample_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Profile every column of a DataFrame or Arrow table in one pass over the rows.
+
+    Args:
+        data: pd.DataFrame, pa.Table or pa.RecordBatch
+        sample_size (int, optional): Profile at most this many (evenly strided)
+            rows; row-level statistics then describe the sample
+
+    Returns:
+        dict: total_rows, total_columns and a per-column profile under "columns"
+    """
+    if isinstance(data, pd.DataFrame):
+        columns = list(data.columns)
+        dtypes = {col: data[col].dtype for col in columns}
+        total_rows = len(data)
+    else:
+        if isinstance(data, pa.RecordBatch):
+            data = pa.Table.from_batches([data])
+        columns = list(data.schema.names)
+        # Empty slices give the pandas dtype each column converts to
+        dtypes = {col: data.column(col).slice(0, 0).to_pandas().dtype for col in columns}
+        total_rows = data.num_rows
+
+    step = _sample_step(total_rows, sample_size)
+    profiles = {col: ColumnProfile(dtypes[col]) for col in columns}
+    for chunk in _chunks(data, columns, step):
+        for col, series in chunk.items():
+            profiles[col].update(series)
+
+    schema: Dict[str, Any] = {
+        "total_rows": int(total_rows),
+        "total_columns": int(len(columns)),
+        "columns": {col: profile.to_dict() for col, profile in profiles.items()},
+    }
+    if step > 1:
+        schema["sampled_rows"] = int(-(-total_rows // step))
+    return schema
@@ -0,0 +1,306 @@
+"""Transactional seat inventory for the Bus 54 Ticketing Assistant."""
+
+import csv
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from utils.schedule_store import ScheduleSnapshot, get_schedule_store, schedule_key
+
+# Default location of the inventory database, next to the schedule CSV
+DEFAULT_INVENTORY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "seat_inventory.db",
+)
+
+# Seconds a writer waits for a competing transaction before giving up
+BUSY_TIMEOUT_SECONDS = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seats (
+    departure_time TEXT NOT NULL,
+    departure_location TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    bus_name TEXT NOT NULL,
+    arrival_time TEXT,
+    available_seats INTEGER NOT NULL CHECK (available_seats >= 0),
+    PRIMARY KEY (departure_time, departure_location, destination, bus_name)
+);
+CREATE TABLE IF NOT EXISTS inventory_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _parse_seats(value) -> int:
+    """Parse a seat count from the CSV, treating blanks and garbage as 0."""
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+class SeatInventory:
+    """
+    Seat counts per departure, stored in SQLite in WAL mode.
+
+    The schedule CSV is only an import/export format: new departures are
+    imported when the CSV changes, but seat counts of known departures are
+    owned by the database. A booking is a single conditional UPDATE inside an
+    immediate transaction, so it costs O(1) and cannot oversell even when
+    several sessions (or processes) book the same departure at once.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_INVENTORY_PATH):
+        """
+        Initialize the inventory and create the schema if needed.
+
+        Args:
+            db_path (str): Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        con = getattr(self._local, "connection", None)
+        if con is None:
+            con = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_SECONDS * 1000)}")
+            self._local.connection = con
+        return con
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block inside a write transaction that takes the lock up front."""
+        con = self._connection()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            yield con
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        else:
+            con.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    # Import / export
+    # ------------------------------------------------------------------
+    def import_rows(self, rows: List[Dict[str, str]], overwrite_seats: bool = False,
+                    source_fingerprint: Optional[str] = None) -> int:
+        """
+        Import schedule rows into the inventory.
+
+        Args:
+            rows (list): Schedule rows as produced by the schedule store
+            overwrite_seats (bool): Replace seat counts of known departures with
+                the values from rows. By default only new departures are added.
+            source_fingerprint (str, optional): Identifier of the imported file;
+                an import with the same fingerprint as the last one is skipped
+
+        Returns:
+            int: Number of rows written
+        """
+        with self._transaction() as con:
+            if source_fingerprint is not None and not overwrite_seats:
+                last = con.execute(
+                    "SELECT value FROM inventory_meta WHERE key = 'source_fingerprint'"
+                ).fetchone()
+                if last is not None and last[0] == source_fingerprint:
+                    return 0
+
+            conflict_action = (
+                "UPDATE SET arrival_time = excluded.arrival_time, available_seats = excluded.available_seats"
+                if overwrite_seats
+                else "UPDATE SET arrival_time = excluded.arrival_time"
+            )
+            con.executemany(
+                f"""
+                INSERT INTO seats (departure_time, departure_location, destination, bus_name, arrival_time, available_seats)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (departure_time, departure_location, destination, bus_name) DO {conflict_action}
+                """,
+                [
+                    (*schedule_key(row), row.get("arrival_time"), _parse_seats(row.get("available_seats")))
+                    for row in rows
+                ],
+            )
+            if source_fingerprint is not None:
+                con.execute(
+                    "INSERT OR REPLACE INTO inventory_meta (key, value) VALUES ('source_fingerprint', ?)",
+                    (source_fingerprint,),
+                )
+        return len(rows)
+
+    def export_csv(self, csv_path: str) -> int:
+        """
+        Write the schedule with current seat counts to a CSV file.
+
+        The file is written to a temporary path and atomically renamed.
+
+        Args:
+            csv_path (str): Destination CSV path
+
+        Returns:
+            int: Number of rows written
+        """
+        rows = self._connection().execute(
+            """
+            SELECT departure_time, departure_location, destination, arrival_time, bus_name, available_seats
+            FROM seats ORDER BY departure_time, departure_location, destination, bus_name
+            """
+        ).fetchall()
+        fieldnames = ["departure_time", "departure_location", "destination", "arrival_time", "bus_name", "available_seats"]
+        temp_path = f"{csv_path}.tmp"
+        with open(temp_path, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
+        os.replace(temp_path, csv_path)
+        return len(rows)
+
+    def sync_snapshot(self, snapshot: ScheduleSnapshot) -> None:
+        """
+        Schedule-store load hook: import new departures and overlay live seat counts.
+
+        Args:
+            snapshot (ScheduleSnapshot): Freshly loaded timetable
+        """
+        fingerprint = "{}:{}".format(*snapshot.fingerprint) if snapshot.fingerprint else None
+        if snapshot.rows:
+            self.import_rows(snapshot.rows, source_fingerprint=fingerprint)
+        seat_map = self.seat_map()
+        for row in snapshot.rows:
+            seats = seat_map.get(schedule_key(row))
+            if seats is not None:
+                row["available_seats"] = str(seats)
+
+    # ------------------------------------------------------------------
+    # Reads and bookings
+    # ------------------------------------------------------------------
+    def seat_map(self) -> Dict[Tuple[str, str, str, str], int]:
+        """Return the available seats of every departure keyed by schedule_key."""
+        rows = self._connection().execute(
+            "SELECT departure_time, departure_location, destination, bus_name, available_seats FROM seats"
+        ).fetchall()
+        return {tuple(row[:4]): row[4] for row in rows}
+
+    def available_seats(self, departure_time: str, departure_location: str,
+                        destination: str, bus_name: str) -> Optional[int]:
+        """
+        Return the available seats for one departure.
+
+        Returns:
+            int: Seats left, or None if the departure is unknown
+        """
+        row = self._connection().execute(
+            """
+            SELECT available_seats FROM seats
+            WHERE departure_time = ? AND departure_location = ? AND destination = ? AND bus_name = ?
+            """,
+            (departure_time, departure_location, destination, bus_name),
+        ).fetchone()
+        return row[0] if row else None
+
+    def reserve_seats(self, departure_time: str, departure_location: str, destination: str,
+                      bus_name: str, seats: int = 1) -> Dict[str, object]:
+        """
+        Atomically take seats on a departure if enough are left.
+
+        Args:
+            departure_time (str): The time of departure (e.g., "08:00")
+            departure_location (str): The location of departure (e.g., "Lagos")
+            destination (str): The destination location (e.g., "Abuja")
+            bus_name (str): The name of the bus service
+            seats (int): Number of seats to reserve
+
+        Returns:
+            dict: status ("success", "sold_out" or "not_found") and the
+                  remaining seat count
+        """
+        if seats < 1:
+            return {"status": "error", "message": "At least one seat must be reserved"}
+
+        key = (departure_time, departure_location, destination, bus_name)
+        with self._transaction() as con:
+            cursor = con.execute(
+                """
+                UPDATE seats SET available_seats = available_seats - ?
+                WHERE departure_time = ? AND departure_location = ? AND destination = ? AND bus_name = ?
+                  AND available_seats >= ?
+                """,
+                (seats, *key, seats),
+            )
+            row = con.execute(
+                """
+                SELECT available_seats FROM seats
+                WHERE departure_time = ? AND departure_location = ? AND destination = ? AND bus_name = ?
+                """,
+                key,
+            ).fetchone()
+
+        if row is None:
+            return {"status": "not_found", "remaining_seats": None}
+        if cursor.rowcount != 1:
+            return {"status": "sold_out", "remaining_seats": row[0]}
+
+        get_schedule_store().set_available_seats(key, row[0])
+        return {"status": "success", "remaining_seats": row[0]}
+
+    def release_seats(self, departure_time: str, departure_location: str, destination: str,
+                      bus_name: str, seats: int = 1) -> Optional[int]:
+        """
+        Return seats to a departure, e.g. when a booking is cancelled.
+
+        Returns:
+            int: Seats left after the release, or None if the departure is unknown
+        """
+        key = (departure_time, departure_location, destination, bus_name)
+        with self._transaction() as con:
+            con.execute(
+                """
+                UPDATE seats SET available_seats = available_seats + ?
+                WHERE departure_time = ? AND departure_location = ? AND destination = ? AND bus_name = ?
+                """,
+                (seats, *key),
+            )
+            row = con.execute(
+                """
+                SELECT available_seats FROM seats
+                WHERE departure_time = ? AND departure_location = ? AND destination = ? AND bus_name = ?
+                """,
+                key,
+            ).fetchone()
+        if row is None:
+            return None
+        get_schedule_store().set_available_seats(key, row[0])
+        return row[0]
+
+
+# Global seat inventory instance shared by every session in the process
+_seat_inventory = None
+_seat_inventory_lock = threading.Lock()
+
+
+def get_seat_inventory() -> SeatInventory:
+    """
+    Return the process-wide seat inventory, creating it on first use.
+
+    On creation the inventory is attached to the schedule store so every
+    loaded timetable is imported and shows live seat counts.
+    """
+    global _seat_inventory
+    if _seat_inventory is None:
+        with _seat_inventory_lock:
+            if _seat_inventory is None:
+                inventory = SeatInventory()
+                get_schedule_store().add_load_hook(inventory.sync_snapshot)
+                _seat_inventory = inventory
+    return _seat_inventory
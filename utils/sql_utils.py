@@ -1,34 +1,255 @@
 import pandas as pd
 import duckdb
+import pyarrow as pa
+import threading
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Optional
+from utils.duckdb_pool import ensure_read_only, get_duckdb_manager
+from utils.query_cache import get_query_cache
 
-def execute_sql_on_parquet(sql_query, parquet_file_path, parameters=None):
+# Result formats supported by execute_sql_on_parquet
+RESULT_FORMATS = ("pandas", "arrow", "reader")
+# Rows per record batch when streaming results as a RecordBatchReader
+DEFAULT_BATCH_SIZE = 100_000
+
+# Limits for streamed execution of (LLM-written) queries
+STREAM_BATCH_SIZE = 10_000
+DEFAULT_MAX_ROWS = 100_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TIME_BUDGET_SECONDS = 30.0
+
+def execute_sql_on_parquet(sql_query, parquet_file_path, parameters=None, result_format="pandas",
+                           batch_size=DEFAULT_BATCH_SIZE, use_cache=True):
     """
     Execute SQL queries directly on Parquet files.
     
+    Queries run on a pooled cursor of a long-lived DuckDB database that has the
+    server_growth_trends view registered once per data file.
+    
     Args:
         sql_query (str): The SQL query to execute
         parquet_file_path (str): Path to the Parquet file
         parameters (dict, optional): Parameters to be used in the SQL query
+        result_format (str): "pandas" for a DataFrame, "arrow" for a pyarrow.Table, or
+            "reader" for a pyarrow.RecordBatchReader that streams the result without
+            materialising it. The pooled cursor is held until the reader is exhausted.
+        batch_size (int): Rows per record batch for the "reader" format
+        use_cache (bool): Serve repeated queries from the result cache. Streamed
+            ("reader") results are never cached.
         
     Returns:
-        pd.DataFrame: Results of the SQL query as a pandas DataFrame
+        pd.DataFrame | pa.Table | pa.RecordBatchReader: Results of the SQL query
+
+    Raises:
+        ValueError: If sql_query is not a single read-only SELECT statement
     """
-    # Connect to an in-memory DuckDB database
-    con = duckdb.connect(database=':memory:')
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"Unsupported result_format '{result_format}', expected one of {RESULT_FORMATS}")
+    ensure_read_only(sql_query)
+
+    cache_key = None
+    if use_cache and result_format != "reader":
+        cache = get_query_cache()
+        cache_key = cache.make_key(sql_query, parquet_file_path, parameters, result_format)
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                # Arrow tables are immutable; DataFrames are copied so callers can't corrupt the cache
+                return cached if result_format == "arrow" else cached.copy()
+
+    if result_format == "reader":
+        with ExitStack() as stack:
+            con = stack.enter_context(get_duckdb_manager().cursor(parquet_file_path))
+            source = _execute(con, sql_query, parameters).fetch_record_batch(batch_size)
+            # The reader now owns the pooled cursor and returns it once exhausted
+            batches = _release_when_done(source, stack.pop_all())
+        return pa.RecordBatchReader.from_batches(source.schema, batches)
+
+    with get_duckdb_manager().cursor(parquet_file_path) as con:
+        result = _execute(con, sql_query, parameters)
+        if result_format == "arrow":
+            table = result.fetch_arrow_table()
+            if cache_key is not None:
+                get_query_cache().put(cache_key, table)
+            return table
+        # Convert to pandas DataFrame
+        df_result = result.fetchdf()
+        if cache_key is not None:
+            get_query_cache().put(cache_key, df_result.copy())
+        return df_result
+
+
+def _execute(con, sql_query, parameters):
+    """Execute the SQL query with parameters if provided."""
+    if parameters:
+        return con.execute(sql_query, parameters)
+    return con.execute(sql_query)
+
+
+def _release_when_done(reader, stack):
+    """Yield batches from a DuckDB reader and return its pooled cursor afterwards."""
+    # Exiting the stack with the exception lets the pool discard a cursor that failed mid-stream
+    with stack:
+        yield from reader
+
+
+class SqlBatchStream:
+    """
+    Iterate over a query's result in fixed-size Arrow record batches, within limits.
     
-    # Register the Parquet file as a view with the name server_growth_trends
-    con.execute(f"CREATE VIEW server_growth_trends AS SELECT * FROM '{parquet_file_path}'")
+    Iteration stops once max_rows or max_bytes would be exceeded (the last batch
+    is trimmed to fit) or the wall-clock budget runs out. In every case the
+    running DuckDB query is interrupted so it stops consuming resources. After
+    iteration, truncated/reason/rows/bytes/elapsed_seconds describe the outcome.
+    """
     
-    # Execute the SQL query with parameters if provided
-    if parameters:
-        result = con.execute(sql_query, parameters)
-    else:
-        result = con.execute(sql_query)
+    def __init__(self, sql_query, parquet_file_path, parameters=None, batch_size=STREAM_BATCH_SIZE,
+                 max_rows=DEFAULT_MAX_ROWS, max_bytes=DEFAULT_MAX_BYTES,
+                 time_budget_seconds=DEFAULT_TIME_BUDGET_SECONDS):
+        """
+        Args:
+            sql_query (str): The SQL query to execute
+            parquet_file_path (str): Path to the Parquet file
+            parameters (dict, optional): Parameters to be used in the SQL query
+            batch_size (int): Rows per yielded batch
+            max_rows (int): Maximum number of rows to return
+            max_bytes (int): Maximum total size of the returned batches
+            time_budget_seconds (float): Wall-clock budget for executing and fetching
+        """
+        self.sql_query = sql_query
+        self.parquet_file_path = parquet_file_path
+        self.parameters = parameters
+        self.batch_size = batch_size
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.time_budget_seconds = time_budget_seconds
+        self.schema = None
+        self.truncated = False
+        self.reason = None
+        self.rows = 0
+        self.bytes = 0
+        self.elapsed_seconds = 0.0
+    
+    def _stop(self, reason):
+        self.truncated = True
+        self.reason = self.reason or reason
+    
+    def __iter__(self):
+        ensure_read_only(self.sql_query)
+        started = time.perf_counter()
+        with get_duckdb_manager().cursor(self.parquet_file_path) as con:
+            # Cancel the query from a watchdog thread if it outlives the budget
+            watchdog = threading.Timer(self.time_budget_seconds, con.interrupt)
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                reader = _execute(con, self.sql_query, self.parameters).fetch_record_batch(self.batch_size)
+                self.schema = reader.schema
+                
+                for batch in reader:
+                    if self.rows + batch.num_rows > self.max_rows:
+                        batch = batch.slice(0, self.max_rows - self.rows)
+                        self._stop("max_rows")
+                    if batch.num_rows and self.bytes + batch.nbytes > self.max_bytes:
+                        bytes_per_row = batch.nbytes / batch.num_rows
+                        batch = batch.slice(0, max(0, int((self.max_bytes - self.bytes) // bytes_per_row)))
+                        self._stop("max_bytes")
+                    if batch.num_rows:
+                        self.rows += batch.num_rows
+                        self.bytes += batch.nbytes
+                        yield batch
+                    if not self.truncated and time.perf_counter() - started > self.time_budget_seconds:
+                        self._stop("time_budget")
+                    if self.truncated:
+                        con.interrupt()
+                        break
+            except duckdb.InterruptException:
+                # Raised when the watchdog fired mid-query
+                self._stop("time_budget")
+            except GeneratorExit:
+                # The consumer stopped early; don't leave the query running
+                con.interrupt()
+                raise
+            finally:
+                watchdog.cancel()
+                self.elapsed_seconds = time.perf_counter() - started
+
+
+@dataclass
+class LimitedQueryResult:
+    """Result of execute_sql_on_parquet_limited."""
+    data: pa.Table
+    truncated: bool
+    reason: Optional[str]
+    rows: int
+    bytes: int
+    elapsed_seconds: float
+    from_cache: bool = False
+
+
+def execute_sql_on_parquet_limited(sql_query, parquet_file_path, parameters=None, batch_size=STREAM_BATCH_SIZE,
+                                   max_rows=DEFAULT_MAX_ROWS, max_bytes=DEFAULT_MAX_BYTES,
+                                   time_budget_seconds=DEFAULT_TIME_BUDGET_SECONDS, use_cache=True):
+    """
+    Execute a query with row, byte and wall-clock limits, returning an Arrow table.
+    
+    Use this for SQL written by the model: a runaway SELECT * is cut off and
+    cancelled instead of pulling the whole file into the process.
+    
+    Args:
+        sql_query (str): The SQL query to execute
+        parquet_file_path (str): Path to the Parquet file
+        parameters (dict, optional): Parameters to be used in the SQL query
+        batch_size (int): Rows fetched per batch
+        max_rows (int): Maximum number of rows to return
+        max_bytes (int): Maximum size of the returned data
+        time_budget_seconds (float): Wall-clock budget for the query
+        use_cache (bool): Serve/store complete results through the result cache
+        
+    Returns:
+        LimitedQueryResult: The (possibly truncated) table plus a truncation flag and reason
+    """
+    cache_key = None
+    if use_cache:
+        cache = get_query_cache()
+        cache_key = cache.make_key(sql_query, parquet_file_path, parameters, "arrow")
+        cached = cache.get(cache_key) if cache_key is not None else None
+        if cached is not None and cached.num_rows <= max_rows and cached.nbytes <= max_bytes:
+            return LimitedQueryResult(cached, False, None, cached.num_rows, cached.nbytes, 0.0, from_cache=True)
+    
+    stream = SqlBatchStream(sql_query, parquet_file_path, parameters, batch_size,
+                            max_rows, max_bytes, time_budget_seconds)
+    batches = list(stream)
+    table = pa.Table.from_batches(batches, schema=stream.schema) if stream.schema is not None else pa.table({})
     
-    # Convert to pandas DataFrame
-    df_result = result.fetchdf()
+    # Only complete results are safe to reuse
+    if cache_key is not None and not stream.truncated:
+        get_query_cache().put(cache_key, table)
     
-    return df_result
+    return LimitedQueryResult(table, stream.truncated, stream.reason, stream.rows, stream.bytes,
+                              round(stream.elapsed_seconds, 4))
+
+
+def get_sql_cache_stats():
+    """
+    Get hit/miss counters and size of the SQL result cache.
+    
+    Returns:
+        dict: Cache statistics (hits, misses, evictions, entries, bytes, hit_rate, ...)
+    """
+    return get_query_cache().stats()
+
+
+def get_sql_pool_metrics():
+    """
+    Get connection pool metrics for every Parquet file queried so far.
+    
+    Returns:
+        dict: Mapping of Parquet path to pool counters (cursors created, in use, idle, waits, ...)
+    """
+    return get_duckdb_manager().metrics()
 # query = "SELECT hostname, current_cpu_usage FROM parquet_data WHERE current_cpu_usage > ?"
 # params = [80]
 # results = execute_sql_on_parquet(query, "data/server_growth_trends.parquet", params)
@@ -32,6 +32,8 @@ def convert_to_user_friendly_response_prompt() -> str:
     
     IMPORTANT: 
     - Only use tools when necessary to answer the specific question
+    - Use search_bus_schedule with filters (origin, destination, time window, bus company, seats) to look up departures; only call get_entire_bus_schedule if the user explicitly asks for the complete timetable
+    - Large tool results come back as a 'preview' with a 'handle'; use query_tool_result with that handle to filter, sort, page or count the remaining rows instead of calling the original tool again
     - Respond in natural language with proper formatting
     - Each query is independent unless explicitly connected to previous questions
     - You can retrieve booked tickets using the get_booked_tickets function
@@ -0,0 +1,242 @@
+"""Server-side store for large tool results, referenced by handle."""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Results with more rows than this are stored and returned as preview + handle
+PREVIEW_ROWS = 10
+# Default and maximum page size for query()
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+# Stored results kept at most this many / this long
+MAX_RESULTS = 256
+RESULT_TTL_SECONDS = 60 * 60
+
+AGGREGATES = ("count", "sum", "min", "max", "avg")
+
+
+def _matches(value: Any, expected: Any) -> bool:
+    """Case-insensitive equality; a list of expected values matches any of them."""
+    if isinstance(expected, (list, tuple, set)):
+        return any(_matches(value, item) for item in expected)
+    if isinstance(value, str) or isinstance(expected, str):
+        return str(value).strip().casefold() == str(expected).strip().casefold()
+    return value == expected
+
+
+def _result_name(aggregate: str, aggregate_column: Optional[str]) -> str:
+    """Column name of an aggregate in grouped results, e.g. "count" or "sum_available_seats"."""
+    return aggregate if aggregate == "count" else f"{aggregate}_{aggregate_column}"
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ToolResultStore:
+    """
+    Keeps large tool results on the server and hands the model a preview plus a handle.
+
+    The model pages, filters, sorts or aggregates a stored result through the
+    handle instead of receiving (and re-sending on every later turn) the whole
+    payload. Results are evicted least-recently-used and after a TTL. A result
+    can be tied to an owner so only that user's runs can read it.
+    """
+
+    def __init__(self, max_results: int = MAX_RESULTS, ttl_seconds: float = RESULT_TTL_SECONDS,
+                 preview_rows: int = PREVIEW_ROWS):
+        """
+        Args:
+            max_results (int): Maximum number of stored results
+            ttl_seconds (float): Seconds a result stays readable after it was stored
+            preview_rows (int): Rows included in the preview; smaller results are returned whole
+        """
+        self.max_results = max_results
+        self.ttl_seconds = ttl_seconds
+        self.preview_rows = preview_rows
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry["stored_at"] > self.ttl_seconds
+
+    def _expire(self, now: float) -> None:
+        # Reads move entries to the end, so the LRU order is not storage order; check them all
+        for handle in [handle for handle, entry in self._results.items() if self._expired(entry, now)]:
+            del self._results[handle]
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+
+    def wrap(self, tool_name: str, rows: List[Dict[str, Any]], owner: Optional[str] = None):
+        """
+        Return small results unchanged; store large ones and return a preview with a handle.
+
+        Args:
+            tool_name (str): Tool that produced the rows
+            rows (list): The result rows (dicts)
+            owner (str, optional): User the result belongs to
+
+        Returns:
+            list | dict: The rows themselves, or a preview payload with 'handle'
+        """
+        if len(rows) <= self.preview_rows:
+            return rows
+        handle = f"res_{uuid.uuid4().hex[:12]}"
+        columns = sorted({key for row in rows for key in row})
+        now = time.monotonic()
+        with self._lock:
+            self._results[handle] = {
+                "tool": tool_name,
+                "rows": list(rows),
+                "columns": columns,
+                "owner": owner,
+                "stored_at": now,
+            }
+            self._expire(now)
+        return {
+            "handle": handle,
+            "tool": tool_name,
+            "total_rows": len(rows),
+            "columns": columns,
+            "preview": rows[:self.preview_rows],
+            "note": (f"Only the first {self.preview_rows} of {len(rows)} rows are shown. "
+                     f"Use query_tool_result with handle '{handle}' to filter, sort, page or aggregate the rest."),
+        }
+
+    def _entry(self, handle: str, owner: Optional[str]) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._results.get(handle)
+            if entry is not None and self._expired(entry, now):
+                del self._results[handle]
+                entry = None
+            if entry is None:
+                raise KeyError(f"Unknown or expired result handle '{handle}'")
+            if entry["owner"] is not None and entry["owner"] != owner:
+                raise KeyError(f"Unknown or expired result handle '{handle}'")
+            self._results.move_to_end(handle)
+            return entry
+
+    def query(self, handle: str, owner: Optional[str] = None, filters: Optional[Dict[str, Any]] = None,
+              columns: Optional[List[str]] = None, sort_by: Optional[str] = None, descending: bool = False,
+              group_by: Optional[str] = None, aggregate: Optional[str] = None,
+              aggregate_column: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+              offset: int = 0) -> Dict[str, Any]:
+        """
+        Read a stored result.
+
+        Args:
+            handle (str): Handle returned with the preview
+            owner (str, optional): User making the request
+            filters (dict, optional): Column -> value (or list of values) that rows must equal
+            columns (list, optional): Columns to return
+            sort_by (str, optional): Column to sort by
+            descending (bool): Sort in descending order
+            group_by (str, optional): Column to group by; returns one row per group
+            aggregate (str, optional): One of count, sum, min, max, avg (default count when grouping)
+            aggregate_column (str, optional): Column the aggregate applies to (not needed for count)
+            limit (int): Page size (max 200)
+            offset (int): Rows to skip
+
+        Returns:
+            dict: 'total' matching rows (or groups) and the requested page under 'items'
+        """
+        entry = self._entry(handle, owner)
+        known = set(entry["columns"])
+        for name in [*(filters or {}), *(columns or []), group_by, aggregate_column]:
+            if name is not None and name not in known:
+                raise ValueError(f"Unknown column '{name}'; available columns: {', '.join(entry['columns'])}")
+        if aggregate is not None and aggregate not in AGGREGATES:
+            raise ValueError(f"Unsupported aggregate '{aggregate}', expected one of {AGGREGATES}")
+        if aggregate not in (None, "count") and aggregate_column is None:
+            raise ValueError(f"aggregate '{aggregate}' needs an aggregate_column")
+        grouped = group_by is not None or aggregate is not None
+        sortable = set(columns or known) if not grouped else {group_by, _result_name(aggregate or "count", aggregate_column)}
+        if sort_by is not None and sort_by not in sortable:
+            raise ValueError(f"Cannot sort by '{sort_by}'; expected one of {', '.join(sorted(str(c) for c in sortable if c))}")
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        offset = max(0, int(offset))
+
+        rows = entry["rows"]
+        if filters:
+            rows = [row for row in rows if all(_matches(row.get(col), value) for col, value in filters.items())]
+
+        if grouped:
+            rows = self._aggregate(rows, group_by, aggregate or "count", aggregate_column)
+        elif columns:
+            rows = [{col: row.get(col) for col in columns} for row in rows]
+
+        key = sort_by or group_by
+        if key is not None:
+            # None sorts last in either direction; mixed types fall back to text order
+            present = [row for row in rows if row.get(key) is not None]
+            missing = [row for row in rows if row.get(key) is None]
+            try:
+                present.sort(key=lambda row: row[key], reverse=descending)
+            except TypeError:
+                present.sort(key=lambda row: str(row[key]), reverse=descending)
+            rows = present + missing
+
+        return {
+            "handle": handle,
+            "total": len(rows),
+            "limit": limit,
+            "offset": offset,
+            "items": rows[offset:offset + limit],
+        }
+
+    @staticmethod
+    def _aggregate(rows, group_by, aggregate, aggregate_column):
+        groups: "OrderedDict[Any, List[Dict[str, Any]]]" = OrderedDict()
+        for row in rows:
+            groups.setdefault(row.get(group_by) if group_by else None, []).append(row)
+        result_name = _result_name(aggregate, aggregate_column)
+        aggregated = []
+        for key, members in groups.items():
+            if aggregate == "count":
+                value = len(members)
+            else:
+                numbers = [n for n in (_number(row.get(aggregate_column)) for row in members) if n is not None]
+                if not numbers:
+                    value = None
+                elif aggregate == "sum":
+                    value = sum(numbers)
+                elif aggregate == "min":
+                    value = min(numbers)
+                elif aggregate == "max":
+                    value = max(numbers)
+                else:
+                    value = round(sum(numbers) / len(numbers), 4)
+            item = {group_by: key} if group_by else {}
+            item[result_name] = value
+            aggregated.append(item)
+        return aggregated
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of stored results and rows."""
+        with self._lock:
+            return {
+                "results": len(self._results),
+                "rows": sum(len(entry["rows"]) for entry in self._results.values()),
+            }
+
+
+# Global tool result store shared by every session in the process
+_tool_result_store = None
+_tool_result_store_lock = threading.Lock()
+
+
+def get_tool_result_store() -> ToolResultStore:
+    """Return the process-wide tool result store, creating it on first use."""
+    global _tool_result_store
+    if _tool_result_store is None:
+        with _tool_result_store_lock:
+            if _tool_result_store is None:
+                _tool_result_store = ToolResultStore()
+    return _tool_result_store